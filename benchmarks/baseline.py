@@ -0,0 +1,133 @@
+"""Базовые замеры бенчмарков и проверка регрессий (U-критерий Манна-Уитни)."""
+
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+
+def mann_whitney_greater(
+    current: Sequence[float], baseline: Sequence[float]
+) -> Tuple[float, float]:
+    """Односторонний U-критерий: current стохастически больше baseline
+
+    Нормальная аппроксимация с поправкой на связки и на непрерывность;
+    годится начиная примерно с 8 замеров в каждой выборке.
+
+    Returns:
+        (U для current, p-value)
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    pooled = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(pooled)
+    ties_term = 0.0
+    index = 0
+    while index < len(pooled):
+        end = index
+        while end + 1 < len(pooled) and pooled[end + 1][0] == pooled[index][0]:
+            end += 1
+        # Связкам достается средний ранг
+        rank = (index + end) / 2 + 1
+        for position in range(index, end + 1):
+            ranks[position] = rank
+        tied = end - index + 1
+        ties_term += tied**3 - tied
+        index = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, pooled) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Сравнение одного бенчмарка с базой"""
+
+    name: str
+    baseline_median: float
+    current_median: float
+    p_value: float
+    regression: bool
+
+    @property
+    def ratio(self) -> float:
+        return self.current_median / self.baseline_median if self.baseline_median else 1.0
+
+    def describe(self) -> str:
+        verdict = "РЕГРЕССИЯ" if self.regression else "ок"
+        return (
+            f"{self.name:<28}{self.baseline_median:>10.1f}{self.current_median:>10.1f}"
+            f"{self.ratio:>8.2f}x{self.p_value:>10.4f}  {verdict}"
+        )
+
+
+def compare(
+    baseline: Dict[str, List[float]],
+    current: Dict[str, List[float]],
+    alpha: float = 0.01,
+    min_slowdown: float = 0.10,
+) -> List[Comparison]:
+    """Сравнить замеры с базой
+
+    Регрессия - статистически значимое замедление (p < alpha), которое к тому
+    же больше ``min_slowdown`` по медиане: на сотнях замеров значимым
+    становится и незаметное замедление на 1%.
+    """
+    results = []
+    for name, samples in current.items():
+        if name not in baseline or not samples:
+            continue
+        base = baseline[name]
+        _, p_value = mann_whitney_greater(samples, base)
+        base_median = statistics.median(base)
+        current_median = statistics.median(samples)
+        slower = current_median > base_median * (1 + min_slowdown)
+        results.append(
+            Comparison(name, base_median, current_median, p_value, p_value < alpha and slower)
+        )
+    return results
+
+
+def environment() -> dict:
+    """Где сняты замеры: сравнивать базу с другой машины бессмысленно"""
+    return {
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_baseline(path: Path) -> Optional[dict]:
+    """База бенчмарков или None, если ее еще нет"""
+    if not path.exists():
+        return None
+    baseline: dict = json.loads(path.read_text(encoding="utf-8"))
+    return baseline
+
+
+def save_baseline(path: Path, samples: Dict[str, List[float]], meta: dict) -> None:
+    """Записать замеры (мс) как новую базу"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "environment": environment(),
+        "meta": meta,
+        "samples": {
+            name: [round(value, 3) for value in values] for name, values in samples.items()
+        },
+    }
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=1), encoding="utf-8")
@@ -0,0 +1,118 @@
+"""Микробенчмарк накладных расходов логирования на одно действие page object.
+
+Запуск: ``python -m benchmarks.logging_overhead [--actions 5000] [--round-trip-ms 0.5]``
+
+Браузер не нужен: ``BasePage`` работает с заглушками страницы и локатора,
+обращение к браузеру имитируется паузой ``--round-trip-ms`` (во время нее
+поток теста, как и в реальном прогоне, отпускает GIL). Измеряется
+процессорное время потока теста (``time.thread_time``), из него вычитается
+время того же действия с отключенными логами - остаются только накладные
+расходы логирования в потоке теста, без работы фонового потока. Каждый режим измеряется в
+отдельном процессе, потому что structlog кэширует логгеры при первом вызове.
+"""
+
+import argparse
+import io
+import logging
+import subprocess
+import sys
+import time
+from pages.base_page import BasePage
+from utils.logging_setup import configure_logging, flush_logging, stop_logging
+
+CONFIGS = [
+    ("без логов (референс)", "sync", "default", "full"),
+    ("sync / default / full (как раньше)", "sync", "default", "full"),
+    ("sync / console / full", "sync", "console", "full"),
+    ("sync / default / summary", "sync", "default", "summary"),
+    ("queue / console / full", "queue", "console", "full"),
+    ("queue / console / summary", "queue", "console", "summary"),
+    ("queue / json / sample:10", "queue", "json", "sample:10"),
+]
+
+
+class _FakePage:
+    url = "https://stepik.org/catalog"
+
+    def __init__(self, round_trip: float) -> None:
+        self.round_trip = round_trip
+
+    def evaluate(self, script, arg=None):
+        time.sleep(self.round_trip)
+        return {"settled": True, "elapsed": 0}
+
+
+class _FakeLocator:
+    def __init__(self, round_trip: float) -> None:
+        self.round_trip = round_trip
+
+    def click(self, timeout=None):
+        time.sleep(self.round_trip)
+
+    def fill(self, text, timeout=None):
+        time.sleep(self.round_trip)
+
+
+def _measure(actions: int, round_trip: float) -> float:
+    """Среднее процессорное время потока теста на одно действие, мкс"""
+    page = BasePage(_FakePage(round_trip))  # type: ignore[arg-type]
+    locator = _FakeLocator(round_trip)
+    started = time.thread_time()
+    for _ in range(actions):
+        page.click(locator, "Кнопка", settle="dom-quiet")  # type: ignore[arg-type]
+        page.fill(locator, "python", "Поле поиска")  # type: ignore[arg-type]
+    return (time.thread_time() - started) / (actions * 2) * 1e6
+
+
+def _run_single(index: int, actions: int, round_trip: float) -> float:
+    title, mode, renderer, action_logs = CONFIGS[index]
+
+    # Как в pytest с log_cli: обработчик с форматом на корневом логгере
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(logging.WARNING if index == 0 else logging.INFO)
+
+    configure_logging(mode=mode, renderer=renderer, actions=action_logs)
+    _measure(100, round_trip)  # прогрев
+    per_action = _measure(actions, round_trip)
+    flush_logging()
+    stop_logging()
+    return per_action
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=5000)
+    parser.add_argument("--round-trip-ms", type=float, default=0.5)
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    round_trip = args.round_trip_ms / 1000
+
+    if args.single is not None:
+        print(_run_single(args.single, args.actions, round_trip))
+        return
+
+    results = []
+    for index in range(len(CONFIGS)):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.logging_overhead", "--single", str(index)]
+            + ["--actions", str(args.actions), "--round-trip-ms", str(args.round_trip_ms)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(float(output.strip().splitlines()[-1]))
+
+    reference = results[0]
+    legacy = results[1] - reference
+    print(f"{'режим':<40}{'CPU мкс/действие':>18}{'накладные, мкс':>16}{'vs как раньше':>15}")
+    for (title, *_), per_action in zip(CONFIGS, results):
+        overhead = per_action - reference
+        ratio = f"{overhead / legacy:.2f}x" if legacy > 0 else "-"
+        print(f"{title:<40}{per_action:>18.1f}{overhead:>16.1f}{ratio:>15}")
+
+
+if __name__ == "__main__":
+    main()
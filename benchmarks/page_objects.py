@@ -0,0 +1,245 @@
+"""Бенчмарк операций page objects против локального стенда.
+
+Запуск::
+
+    python -m benchmarks.page_objects --iterations 30               # сравнить с базой
+    python -m benchmarks.page_objects --iterations 30 --save-baseline
+
+Каждая операция (``navigate``, ``click``, ``fill``, ``LoginPage.login``,
+``CatalogPage.search_courses``, ``SearchPage.apply_free_filter``,
+``open_first_course``), а также запуск браузера и подготовка контекста как в
+фикстуре ``context`` выполняются много раз против ``utils.stand_in``.
+Подготовка к операции (переход на нужную страницу, новый контекст) в замер
+не входит. Замеры сравниваются с базой ``benchmarks/baselines/page_objects.json``
+U-критерием Манна-Уитни; при значимом замедлении процесс завершается с кодом 1.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from playwright.sync_api import Browser, BrowserContext, Page, Playwright, sync_playwright
+from benchmarks.baseline import BASELINE_DIR, compare, environment, load_baseline, save_baseline
+from pages.base_page import BasePage
+from pages.catalog_page import CatalogPage
+from pages.login_page import LoginPage
+from pages.search_page import SearchPage
+from pages.settle import SETTLE_CONFIG
+from pages.timeouts import configure_timeouts
+from utils.metrics import ACTION_METRICS, histogram
+from utils.network_blocking import ResourceBlocker, ResourceSizes, get_profile
+from utils.stand_in import STAND_IN_CREDENTIALS, StandIn, parse_faults
+
+DEFAULT_BASELINE = BASELINE_DIR / "page_objects.json"
+WARMUP = 2
+
+
+class _Runner:
+    """Замеры одной операции: прогрев, подготовка вне замера, сама операция"""
+
+    def __init__(self, browser: Browser, base_url: str, block_profile: str, iterations: int):
+        self.browser = browser
+        self.base_url = base_url
+        self.blocker = ResourceBlocker(get_profile(block_profile), ResourceSizes())
+        self.iterations = iterations
+
+    def new_page(self) -> Tuple[BrowserContext, Page]:
+        """Контекст и страница так же, как в фикстурах context/page"""
+        context = self.browser.new_context()
+        self.blocker.install(context)
+        page = context.new_page()
+        page.set_default_timeout(30000)
+        page.set_default_navigation_timeout(30000)
+        return context, page
+
+    def measure(
+        self, operation: Callable, prepare: Optional[Callable] = None, fresh_context: bool = False
+    ) -> List[float]:
+        """Длительности operation(page) в мс; prepare(page) выполняется до замера"""
+        samples: List[float] = []
+        shared = None if fresh_context else self.new_page()
+        try:
+            for index in range(WARMUP + self.iterations):
+                context, page = shared or self.new_page()
+                try:
+                    if prepare is not None:
+                        prepare(page)
+                    started = time.perf_counter()
+                    operation(page)
+                    elapsed = (time.perf_counter() - started) * 1000
+                finally:
+                    if shared is None:
+                        context.close()
+                if index >= WARMUP:
+                    samples.append(elapsed)
+        finally:
+            if shared is not None:
+                shared[0].close()
+        return samples
+
+    def search_url(self, free: bool = False) -> str:
+        return f"{self.base_url}/catalog/search?q=python" + ("&free=true" if free else "")
+
+
+def bench_browser_launch(playwright: Playwright, iterations: int) -> List[float]:
+    """Запуск и закрытие Chromium (как фикстура browser)"""
+    samples = []
+    for index in range(1 + iterations):
+        started = time.perf_counter()
+        playwright.chromium.launch().close()
+        if index:
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def bench_fixture_setup(runner: _Runner) -> List[float]:
+    """Новый контекст с блокировкой ресурсов и страница (фикстуры context/page)"""
+    samples = []
+    for index in range(WARMUP + runner.iterations):
+        started = time.perf_counter()
+        context, _ = runner.new_page()
+        if index >= WARMUP:
+            samples.append((time.perf_counter() - started) * 1000)
+        context.close()
+    return samples
+
+
+def _operations(runner: _Runner) -> Dict[str, Callable[[], List[float]]]:
+    base_url = runner.base_url
+    login, password = STAND_IN_CREDENTIALS["login"], STAND_IN_CREDENTIALS["password"]
+
+    def open_catalog(page) -> None:
+        CatalogPage(page, base_url=base_url).open()
+
+    def open_search(page) -> None:
+        page.goto(runner.search_url(), wait_until="domcontentloaded")
+
+    def open_free_search(page) -> None:
+        page.goto(runner.search_url(free=True), wait_until="domcontentloaded")
+
+    def navigate(page) -> None:
+        BasePage(page, base_url=base_url).navigate(f"{base_url}/catalog")
+
+    def fill(page) -> None:
+        catalog = CatalogPage(page, base_url=base_url)
+        catalog.fill(catalog.search_input, "python", "Поисковая строка")
+
+    def click(page) -> None:
+        search = SearchPage(page, base_url=base_url)
+        search.click(search.free_filter_button, "Фильтр 'Бесплатно'")
+
+    def open_first_course(page) -> None:
+        SearchPage(page, base_url=base_url).open_first_course().close()
+
+    return {
+        "fixture_setup": lambda: bench_fixture_setup(runner),
+        "navigate": lambda: runner.measure(navigate),
+        "fill": lambda: runner.measure(fill, prepare=open_catalog),
+        "click": lambda: runner.measure(click, prepare=open_search),
+        "login": lambda: runner.measure(
+            lambda page: LoginPage(page, base_url=base_url).login(login, password),
+            fresh_context=True,
+        ),
+        "search_courses": lambda: runner.measure(
+            lambda page: CatalogPage(page, base_url=base_url).search_courses("python"),
+            prepare=open_catalog,
+        ),
+        "apply_free_filter": lambda: runner.measure(
+            lambda page: SearchPage(page, base_url=base_url).apply_free_filter(),
+            prepare=open_search,
+        ),
+        "open_first_course": lambda: runner.measure(open_first_course, prepare=open_free_search),
+    }
+
+
+def run(args) -> Dict[str, List[float]]:
+    """Прогнать выбранные бенчмарки и вернуть замеры в мс"""
+    faults = parse_faults(args.fault)
+    results: Dict[str, List[float]] = {}
+    with StandIn(faults=faults, seed=0) as stand_in, sync_playwright() as playwright:
+        if not args.only or "browser_launch" in args.only:
+            results["browser_launch"] = bench_browser_launch(playwright, args.launch_iterations)
+        browser = playwright.chromium.launch()
+        try:
+            runner = _Runner(browser, stand_in.url, args.block_profile, args.iterations)
+            for name, operation in _operations(runner).items():
+                if args.only and name not in args.only:
+                    continue
+                print(f"... {name}", file=sys.stderr)
+                results[name] = operation()
+        finally:
+            browser.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--launch-iterations", type=int, default=5)
+    parser.add_argument("--only", action="append", default=[], help="Только этот бенчмарк")
+    parser.add_argument("--block-profile", default="full")
+    parser.add_argument(
+        "--fault",
+        action="append",
+        default=[],
+        help="Искажение маршрута стенда: <glob пути>:latency=мс,jitter=мс,error=доля",
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Записать замеры как базу")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Уровень значимости")
+    parser.add_argument(
+        "--min-slowdown", type=float, default=0.10, help="Минимальное замедление медианы (доля)"
+    )
+    parser.add_argument("--out", type=Path, help="Куда записать замеры в JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    # Метрики действий копятся по тестам pytest; здесь тестов нет
+    ACTION_METRICS.enabled = False
+    # Таймауты по умолчанию: выученные по ходу бенчмарка меняли бы условия замеров,
+    # а задержки стенда с помехами - историю таймаутов тестов
+    configure_timeouts(mode="fixed", enabled=False)
+
+    results = run(args)
+
+    print(f"{'бенчмарк':<28}{'n':>5}{'p50 мс':>10}{'p95 мс':>10}{'max мс':>10}")
+    for name, samples in results.items():
+        hist = histogram(samples)
+        print(
+            f"{name:<28}{hist['count']:>5}"
+            f"{hist['p50']:>10.1f}{hist['p95']:>10.1f}{hist['max']:>10.1f}"
+        )
+
+    meta = {"iterations": args.iterations, "settle": SETTLE_CONFIG.strategy, "faults": args.fault}
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(
+            json.dumps({"meta": meta, "samples": results}, indent=1), encoding="utf-8"
+        )
+    if args.save_baseline:
+        save_baseline(args.baseline, results, meta)
+        print(f"База записана: {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"Базы {args.baseline} нет: запустите с --save-baseline")
+        return
+    if baseline.get("environment") != environment():
+        print(f"Внимание: база снята в другом окружении: {baseline.get('environment')}")
+
+    comparisons = compare(baseline["samples"], results, args.alpha, args.min_slowdown)
+    print(f"\n{'бенчмарк':<28}{'база':>10}{'сейчас':>10}{'отн.':>9}{'p':>10}")
+    for comparison in comparisons:
+        print(comparison.describe())
+    regressions = [c.name for c in comparisons if c.regression]
+    if regressions:
+        print(f"\nЗначимое замедление: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
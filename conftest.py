@@ -1,55 +1,530 @@
+import allure
+import allure_commons
+import json
 import pytest
+import pytest_asyncio
 import structlog
 import os
-import allure
-from allure_commons.types import AttachmentType
-from typing import Generator
+import time
+from pathlib import Path
+from typing import AsyncGenerator, Awaitable, Callable, Dict, Generator, List, Optional
 from dotenv import load_dotenv
 from playwright.sync_api import Page, Browser, Playwright, sync_playwright, BrowserContext
+from playwright.async_api import (
+    Browser as AsyncBrowser,
+    BrowserContext as AsyncBrowserContext,
+    Page as AsyncPage,
+    Playwright as AsyncPlaywright,
+    async_playwright,
+)
+from pages.aio.network import NetworkMonitor as AsyncNetworkMonitor
+from pages.elements import ELEMENT_STATS
+from pages.locators import SITE, configure_site
+from pages.login_page import LoginPage
+from pages.network import NetworkMonitor
+from pages.settle import SETTLE_CONFIG, configure_settle
+from pages.timeouts import DEFAULT_HISTORY_PATH, TIMEOUT_MODES, TIMEOUTS, configure_timeouts
+from utils.artifacts import (
+    DEFAULT_ARTIFACT_DIR,
+    ArtifactWriter,
+    get_artifact_writer,
+    set_artifact_writer,
+)
+from utils.asset_cache import DEFAULT_MAX_MB, AssetCache
+from utils.auth_state import AuthStateCache, DEFAULT_CACHE_DIR
+from utils.checkpoints import DEFAULT_CHECKPOINT_DIR, Checkpoints
+from utils.context_pool import ContextPool
+from utils.credential_pool import CredentialPool, Lease, load_accounts
+from utils.durations import DEFAULT_DURATIONS_PATH, DurationStore
+from utils.logging_setup import configure_logging, flush_logging, stop_logging
+from utils.metrics import (
+    ACTION_METRICS,
+    BUDGET_MODES,
+    DEFAULT_METRICS_PATH,
+    ActionBudgets,
+    summarize,
+)
+from utils.har import DEFAULT_HAR_DIR, DEFAULT_IGNORED_PARAMS, HarReplayer, har_path
+from utils.network_blocking import (
+    PROFILES,
+    BlockProfile,
+    ResourceBlocker,
+    ResourceSizes,
+    get_profile,
+)
+from utils.recording import RECORDING_MODES, AttemptRecorder, RecordingPlan, estimated_savings_ms
+from utils.scheduling import DurationPlugin
+from utils.session_stats import SESSION_STATS
+from utils.shared_browser import BrowserHandle, SharedChromium
+from utils.timeline import TIMELINE, AllureStepSpans
+from utils.stand_in import STAND_IN_CREDENTIALS, StandIn, parse_faults
 
 load_dotenv()
 
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
-    ],
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    cache_logger_on_first_use=True,
-)
 logger = structlog.get_logger(__name__)
 
+ACTION_BUDGETS = pytest.StashKey[ActionBudgets]()
+STAND_IN = pytest.StashKey[StandIn]()
+PHASE_REPORTS = pytest.StashKey[dict]()
+SHARED_CHROMIUM = pytest.StashKey[SharedChromium]()
+BROWSER_HANDLE = pytest.StashKey[BrowserHandle]()
+CREDENTIAL_POOL = pytest.StashKey[CredentialPool]()
+WORKER_LEASE = pytest.StashKey[Lease]()
+AUTH_STATES = pytest.StashKey[Dict[str, str]]()
+SESSION_STARTED = pytest.StashKey[float]()
+STEP_SPANS = pytest.StashKey[AllureStepSpans]()
+
+
+def pytest_addoption(parser):
+    """Опции командной строки для E2E-тестов"""
+    group = parser.getgroup("e2e", "Stepik E2E")
+    group.addoption(
+        "--no-auth-cache",
+        action="store_true",
+        default=False,
+        help="Не использовать кэш авторизации: каждый тест логинится сам",
+    )
+    group.addoption(
+        "--auth-cache-ttl",
+        type=float,
+        default=3600,
+        help="Время жизни кэша авторизации в секундах (по умолчанию 3600)",
+    )
+    group.addoption(
+        "--auth-cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help="Каталог для кэша storage_state",
+    )
+    group.addoption(
+        "--accounts-file",
+        default=None,
+        help="Файл пула учетных записей (строки login:password); иначе STEPIK_ACCOUNTS_FILE, "
+        ".e2e-accounts или STEPIK_ACCOUNTS",
+    )
+    group.addoption(
+        "--credential-lease",
+        default="worker",
+        choices=["worker", "test"],
+        help="На какой срок арендуется учетная запись из пула: на воркер или на тест",
+    )
+    group.addoption(
+        "--login-interval",
+        type=float,
+        default=5.0,
+        help="Минимальная пауза между входами под одной учетной записью, секунды",
+    )
+    group.addoption(
+        "--log-mode",
+        default="sync",
+        choices=["sync", "queue"],
+        help="queue - рендеринг логов в фоновом потоке вместо потока теста",
+    )
+    group.addoption(
+        "--log-renderer",
+        default="default",
+        choices=["default", "console", "json"],
+        help="Рендерер structlog: default (как раньше), console или json (для CI)",
+    )
+    group.addoption(
+        "--log-actions",
+        default="full",
+        help="Логи действий page objects: full, summary (одна строка) или sample:N",
+    )
+    group.addoption(
+        "--settle",
+        default=SETTLE_CONFIG.strategy,
+        help="Стратегия ожидания после клика: none, dom-quiet, url-change, response:<glob>",
+    )
+    group.addoption(
+        "--settle-quiet-ms",
+        type=int,
+        default=SETTLE_CONFIG.quiet_ms,
+        help="Окно тишины DOM в мс для стратегии dom-quiet",
+    )
+    group.addoption(
+        "--settle-cap-ms",
+        type=int,
+        default=SETTLE_CONFIG.cap_ms,
+        help="Максимальное ожидание стабилизации после клика в мс",
+    )
+    group.addoption(
+        "--timeouts",
+        default=TIMEOUTS.mode,
+        choices=TIMEOUT_MODES,
+        help="Таймауты ожиданий: adaptive (по истории задержек) или fixed (значения по умолчанию)",
+    )
+    group.addoption(
+        "--timeout-safety",
+        type=float,
+        default=TIMEOUTS.safety,
+        help="Во сколько раз выученный таймаут больше p95 успешных ожиданий",
+    )
+    group.addoption(
+        "--timeout-history",
+        default=str(DEFAULT_HISTORY_PATH),
+        help="Файл истории задержек ожиданий для адаптивных таймаутов",
+    )
+    group.addoption(
+        "--asset-cache",
+        action="store_true",
+        default=False,
+        help="Отдавать статику (скрипты, стили, шрифты, картинки) из постоянного кэша на диске",
+    )
+    group.addoption(
+        "--asset-cache-mb",
+        type=int,
+        default=DEFAULT_MAX_MB,
+        help="Максимальный размер кэша статики в МБ (давно не использованное вытесняется)",
+    )
+    group.addoption(
+        "--block-profile",
+        default="full",
+        choices=sorted(PROFILES),
+        help="Профиль блокировки ресурсов для контекстов (маркер block_resources важнее)",
+    )
+    group.addoption(
+        "--context-pool",
+        type=int,
+        default=0,
+        help="Сколько теплых контекстов держать в пуле на воркер (0 - без пула)",
+    )
+    group.addoption(
+        "--context-pool-max-reuse",
+        type=int,
+        default=20,
+        help="Сколько тестов может отработать один контекст из пула",
+    )
+    group.addoption(
+        "--artifact-dir",
+        default=str(DEFAULT_ARTIFACT_DIR),
+        help="Каталог для скриншотов-артефактов",
+    )
+    group.addoption(
+        "--artifact-format",
+        default="jpeg",
+        choices=["png", "jpeg", "webp"],
+        help="Формат скриншотов-артефактов (webp требует Pillow)",
+    )
+    group.addoption(
+        "--artifact-quality",
+        type=int,
+        default=80,
+        help="Качество JPEG/WebP для скриншотов-артефактов",
+    )
+    group.addoption(
+        "--artifact-max-height",
+        type=int,
+        default=4000,
+        help="Максимальная высота скриншота в пикселях (длинные страницы обрезаются)",
+    )
+    group.addoption(
+        "--recording",
+        default="retry",
+        choices=RECORDING_MODES,
+        help="Trace и видео: retry - только в перезапуске упавшего теста, always, off "
+        "(маркер record важнее)",
+    )
+    group.addoption(
+        "--no-resume",
+        action="store_true",
+        default=False,
+        help="Перезапуск проходит сценарий целиком, без контрольных точек шагов",
+    )
+    group.addoption(
+        "--har-mode",
+        default="off",
+        choices=["off", "record", "replay"],
+        help="record - записать сетевой трафик теста в HAR, replay - воспроизвести без сети",
+    )
+    group.addoption(
+        "--har-dir",
+        default=str(DEFAULT_HAR_DIR),
+        help="Каталог с HAR-файлами (по одному на тест)",
+    )
+    group.addoption(
+        "--har-not-found",
+        default="abort",
+        choices=["abort", "fallback"],
+        help="Что делать в replay с запросом, которого нет в HAR: abort или fallback (в сеть)",
+    )
+    group.addoption(
+        "--har-ignore-param",
+        action="append",
+        default=[],
+        help="Дополнительный параметр запроса, игнорируемый при сопоставлении с HAR",
+    )
+    group.addoption(
+        "--budget-mode",
+        default=None,
+        choices=BUDGET_MODES,
+        help="Бюджеты действий из [tool.e2e.budgets]: off, warn (по умолчанию) или fail",
+    )
+    group.addoption(
+        "--metrics-file",
+        default=str(DEFAULT_METRICS_PATH),
+        help="JSON со сводкой длительностей действий (p50/p95/max) по сессии и тестам",
+    )
+    group.addoption(
+        "--timeline",
+        default=None,
+        help="Записать таймлайн прогона (Chrome trace events, Perfetto) в этот JSON",
+    )
+    group.addoption(
+        "--no-duration-schedule",
+        action="store_true",
+        default=False,
+        help="Раздавать тесты xdist штатно, без упорядочивания по длительности",
+    )
+    group.addoption(
+        "--durations-file",
+        default=str(DEFAULT_DURATIONS_PATH),
+        help="Файл с длительностями тестов из прошлых прогонов (для планирования xdist)",
+    )
+    group.addoption(
+        "--shared-browser",
+        action="store_true",
+        default=False,
+        help="С xdist: один Chromium на контроллере, воркеры подключаются к нему по CDP",
+    )
+    group.addoption(
+        "--stand-in",
+        action="store_true",
+        default=False,
+        help="Гонять тесты против локального стенда Stepik (свой на каждый процесс pytest)",
+    )
+    group.addoption(
+        "--stand-in-fault",
+        action="append",
+        default=[],
+        help="Искажение маршрута стенда: <glob пути>:latency=мс,jitter=мс,error=доля,status=код",
+    )
+    group.addoption(
+        "--stand-in-seed",
+        type=int,
+        default=None,
+        help="Зерно генератора задержек и ошибок стенда",
+    )
+
 
 def pytest_configure(config):
     """Конфигурация Allure для pytest."""
+    configure_logging(
+        mode=config.getoption("log_mode"),
+        renderer=config.getoption("log_renderer"),
+        actions=config.getoption("log_actions"),
+    )
+
     # Регистрируем метки
     config.addinivalue_line("markers", "ui: UI тесты")
     config.addinivalue_line("markers", "smoke: Smoke тесты")
 
+    # --base-url из pytest-playwright: прогон против стенда вместо боевого Stepik
+    base_url = config.getoption("base_url", None)
+    if config.getoption("stand_in"):
+        stand_in = _start_stand_in(config)
+        config.stash[STAND_IN] = stand_in
+        if base_url:
+            logger.warning("--base-url игнорируется: включен --stand-in", base_url=base_url)
+        base_url = stand_in.url
+    if base_url:
+        configure_site(base_url)
+
+    try:
+        configure_settle(
+            strategy=config.getoption("settle"),
+            quiet_ms=config.getoption("settle_quiet_ms"),
+            cap_ms=config.getoption("settle_cap_ms"),
+        )
+    except ValueError as e:
+        raise pytest.UsageError(f"--settle: {e}") from e
+    # История задержек своя у каждого сайта: стенд не занижает таймауты боевого Stepik.
+    # Ответы из HAR приходят без сети, их задержки в историю не пишем
+    configure_timeouts(
+        mode=config.getoption("timeouts"),
+        safety=config.getoption("timeout_safety"),
+        history_path=Path(config.getoption("timeout_history")),
+        scope=SITE.base_url,
+        enabled=config.getoption("har_mode") != "replay",
+    )
+
+    set_artifact_writer(
+        ArtifactWriter(
+            out_dir=Path(config.getoption("artifact_dir")),
+            fmt=config.getoption("artifact_format"),
+            quality=config.getoption("artifact_quality"),
+            max_height=config.getoption("artifact_max_height"),
+        )
+    )
+
+    config.stash[ACTION_BUDGETS] = ActionBudgets.load(
+        config.rootpath / "pyproject.toml", config.getoption("budget_mode")
+    )
+
+    # Отчеты всех тестов видит контроллер xdist (или единственный процесс без xdist)
+    if not hasattr(config, "workerinput"):
+        store = DurationStore(Path(config.getoption("durations_file")))
+        schedule = not config.getoption("no_duration_schedule")
+        config.pluginmanager.register(DurationPlugin(store, schedule), "e2e_durations")
+
+    # Пул учетных записей не нужен стенду и воспроизведению HAR: там подходят любые данные
+    if not config.getoption("stand_in") and config.getoption("har_mode") != "replay":
+        accounts_file = config.getoption("accounts_file")
+        accounts = load_accounts(Path(accounts_file) if accounts_file else None)
+        if accounts:
+            config.stash[CREDENTIAL_POOL] = CredentialPool(
+                accounts, min_login_interval=config.getoption("login_interval")
+            )
+    config.stash[AUTH_STATES] = {}
+
+    if config.getoption("shared_browser") and _is_xdist_controller(config):
+        _start_shared_chromium(config)
+
+    if config.getoption("timeline"):
+        _enable_timeline(config)
+
+
+def _enable_timeline(config) -> None:
+    """Включить таймлайн процесса: контроллер - pid 0, воркер gwN - pid N+1"""
+    workerid = getattr(config, "workerinput", {}).get("workerid")
+    if workerid is None:
+        TIMELINE.enable("pytest")
+    else:
+        TIMELINE.enable(f"worker {workerid}", pid=int(workerid.lstrip("gw")) + 1)
+    spans = AllureStepSpans(TIMELINE)
+    allure_commons.plugin_manager.register(spans)
+    config.stash[STEP_SPANS] = spans
+
+
+def _is_xdist_controller(config) -> bool:
+    """Процесс раздает тесты воркерам xdist (а не выполняет их сам)"""
+    return not hasattr(config, "workerinput") and bool(config.getoption("numprocesses", None))
+
+
+def _start_shared_chromium(config) -> None:
+    """Запустить общий Chromium на контроллере; при неудаче воркеры запустят свои"""
+    with sync_playwright() as playwright:
+        executable = playwright.chromium.executable_path
+    try:
+        config.stash[SHARED_CHROMIUM] = SharedChromium(executable).start()
+    except (OSError, RuntimeError) as e:
+        logger.warning("Общий Chromium не запущен, у воркеров будут свои браузеры", error=str(e))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Передать воркеру xdist адрес общего Chromium"""
+    shared = node.config.stash.get(SHARED_CHROMIUM, None)
+    if shared is not None:
+        node.workerinput["shared_browser_endpoint"] = shared.endpoint
+
+
+def _start_stand_in(config) -> StandIn:
+    """Запустить локальный стенд с искажениями маршрутов из командной строки"""
+    try:
+        faults = parse_faults(config.getoption("stand_in_fault"))
+    except ValueError as e:
+        raise pytest.UsageError(f"--stand-in-fault: {e}") from e
+    return StandIn(faults=faults, seed=config.getoption("stand_in_seed")).start()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    with TIMELINE.span(item.nodeid, "test", attempt=getattr(item, "execution_count", 1)):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True, trylast=True)
+def pytest_runtest_setup(item):
+    """Подготовка артефактов и метрик теста; логи фазы сбрасываются до ее завершения"""
+    # Артефакты теста пишутся в его каталог с номером попытки перезапуска
+    writer = get_artifact_writer()
+    if writer is not None:
+        writer.start_test(item.nodeid, getattr(item, "execution_count", 1))
+    ACTION_METRICS.start_test()
+    ELEMENT_STATS.take()
+    with TIMELINE.span("setup", "phase"):
+        yield
+    flush_logging()
+
+
+@pytest.hookimpl(hookwrapper=True, trylast=True)
+def pytest_runtest_call(item):
+    with TIMELINE.span("call", "phase"):
+        yield
+    flush_logging()
+
+
+@pytest.hookimpl(hookwrapper=True, trylast=True)
+def pytest_runtest_teardown(item):
+    with TIMELINE.span("teardown", "phase"):
+        yield
+    # Снимки теста к этому моменту записаны в фоне; тест в Allure еще открыт
+    writer = get_artifact_writer()
+    if writer is not None:
+        writer.attach_pending()
+    flush_logging()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    with TIMELINE.span(f"fixture {fixturedef.argname}", "fixture", scope=fixturedef.scope):
+        yield
+
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Собираем информацию о тесте для Allure."""
     outcome = yield
     report = outcome.get_result()
+    item.stash.setdefault(PHASE_REPORTS, {})[report.when] = report
+
+    if report.when == "call":
+        _report_action_metrics(item, report)
+        _report_element_cache(item)
 
     # Прикрепляем дополнительные данные при падении теста
     if report.when == "call" and report.failed:
         # Получаем page из фикстуры, если есть
         page = item.funcargs.get("page")
-        if page:
-            # Скриншот при падении
-            screenshot = page.screenshot(full_page=True)
-            allure.attach(
-                screenshot, name="screenshot_on_failure", attachment_type=AttachmentType.PNG
-            )
+        writer = get_artifact_writer()
+        if page and writer is not None:
+            # Скриншот при падении: кодирование и запись в Allure идут в фоне
+            try:
+                writer.capture(page, "screenshot_on_failure")
+            except Exception as e:
+                logger.error("Не удалось снять скриншот при падении", error=str(e))
+
+
+def _report_element_cache(item) -> None:
+    """Сколько запросов count() в браузер тест сэкономил на кэше элементов"""
+    stats = ELEMENT_STATS.take()
+    if not stats["hits"] and not stats["misses"]:
+        return
+    item.user_properties.append(("browser_round_trips_saved", stats["hits"]))
+    SESSION_STATS.add("element_cache", round_trips_saved=stats["hits"], queried=stats["misses"])
+    logger.info("Кэш элементов", test=item.nodeid, round_trips_saved=stats["hits"])
+
+
+def _report_action_metrics(item, report) -> None:
+    """Гистограммы действий теста во вложение Allure и проверка бюджетов"""
+    samples = ACTION_METRICS.finish_test(item.nodeid)
+    if not samples:
+        return
+    allure.attach(
+        json.dumps(summarize(samples), ensure_ascii=False, indent=2),
+        name="action_metrics",
+        attachment_type=allure.attachment_type.JSON,
+    )
+
+    budgets = item.config.stash[ACTION_BUDGETS]
+    violations = budgets.violations(samples)
+    if not violations:
+        return
+    item.user_properties.append(("budget_violations", violations))
+    logger.warning("Превышены бюджеты действий", test=item.nodeid, violations=violations)
+    if budgets.mode == "fail" and report.passed:
+        report.outcome = "failed"
+        report.longrepr = "Превышены бюджеты действий:\n" + "\n".join(violations)
 
 
 @pytest.fixture(scope="session")
@@ -70,51 +545,661 @@ def playwright_instance() -> Generator[Playwright, None, None]:
 
 
 @pytest.fixture(scope="session")
-def browser(playwright_instance: Playwright) -> Generator[Browser, None, None]:
-    """Запуск браузера один раз на всю сессию тестов"""
-    logger.info("Запуск браузера Chromium")
-    browser = playwright_instance.chromium.launch()
-    yield browser
+def browser_handle(
+    pytestconfig, playwright_instance: Playwright
+) -> Generator[BrowserHandle, None, None]:
+    """Браузер воркера: подключение к общему Chromium (--shared-browser) или свой запуск"""
+    workerinput = getattr(pytestconfig, "workerinput", {})
+    handle = BrowserHandle(playwright_instance, workerinput.get("shared_browser_endpoint"))
+    handle.start()
+    pytestconfig.stash[BROWSER_HANDLE] = handle
+    yield handle
     logger.info("Закрытые браузера")
-    browser.close()
+    handle.close()
+
+
+@pytest.fixture(scope="session")
+def browser(browser_handle: BrowserHandle) -> Browser:
+    """Браузер воркера на момент первого запроса фикстуры
+
+    После обрыва соединения с общим Chromium этот объект устаревает: код,
+    создающий контексты по ходу сессии, берет браузер из ``browser_handle.ensure()``.
+    """
+    return browser_handle.ensure()
+
+
+@pytest.fixture(scope="session")
+def resource_sizes() -> Generator[ResourceSizes, None, None]:
+    """Известные размеры ресурсов для оценки трафика, сэкономленного блокировкой"""
+    sizes = ResourceSizes()
+    yield sizes
+    sizes.save()
+
+
+@pytest.fixture(scope="session")
+def asset_cache(pytestconfig) -> Generator[Optional[AssetCache], None, None]:
+    """Постоянный кэш статики воркера (включается опцией --asset-cache)"""
+    if not pytestconfig.getoption("asset_cache"):
+        yield None
+        return
+    cache = AssetCache(max_bytes=pytestconfig.getoption("asset_cache_mb") << 20)
+    yield cache
+    cache.report()
+
+
+def _block_profile(request) -> BlockProfile:
+    """Профиль блокировки теста: маркер block_resources, иначе --block-profile"""
+    marker = request.node.get_closest_marker("block_resources")
+    name = marker.args[0] if marker else request.config.getoption("block_profile")
+    return get_profile(name)
+
+
+def _report_blocked(request, blocker: ResourceBlocker) -> None:
+    """Вывести статистику блокировки запросов теста и добавить ее в сводку сессии"""
+    if not blocker.profile.blocks_anything:
+        return
+    summary = blocker.summary()
+    logger.info("Заблокированы сетевые запросы", profile=blocker.profile.name, **summary)
+    request.node.user_properties.append(("blocked_requests", summary["requests"]))
+    request.node.user_properties.append(("blocked_bytes_saved", summary["bytes_saved"]))
+    SESSION_STATS.add(f"blocked[{blocker.profile.name}]", **summary)
+
+
+def _recorder(request) -> AttemptRecorder:
+    """Запись trace/видео попытки теста по --recording и маркеру record"""
+    plan = RecordingPlan.for_attempt(
+        request.config.getoption("recording"),
+        getattr(request.node, "execution_count", 1),
+        request.node.get_closest_marker("record"),
+    )
+    writer = get_artifact_writer()
+    out_dir = (
+        writer.test_dir if writer is not None else Path(request.config.getoption("artifact_dir"))
+    )
+    prefix = writer.attempt_prefix if writer is not None else "try1"
+    return AttemptRecorder(plan, out_dir, prefix)
+
+
+def _test_failed(item) -> bool:
+    """Упала ли подготовка или тело текущей попытки"""
+    return any(report.failed for report in item.stash.get(PHASE_REPORTS, {}).values())
+
+
+def _report_recording(request, recorder: AttemptRecorder) -> None:
+    """Прикрепить сохраненные trace/видео к Allure и добавить попытку в сводку"""
+    for path in recorder.kept:
+        allure.attach.file(str(path), name=path.name, extension=path.suffix.lstrip("."))
+    recorder.report()
+
+
+def _worker_lease(config) -> Optional[Lease]:
+    """Учетная запись из пула, арендованная на весь воркер (или None без пула)"""
+    pool = config.stash.get(CREDENTIAL_POOL, None)
+    if pool is None or config.getoption("credential_lease") != "worker":
+        return None
+    if WORKER_LEASE not in config.stash:
+        owner = getattr(config, "workerinput", {}).get("workerid", "main")
+        config.stash[WORKER_LEASE] = pool.lease(owner)
+    lease: Lease = config.stash[WORKER_LEASE]
+    return lease
+
+
+def _load_credentials(config) -> Optional[dict]:
+    """Учетные данные из окружения или None, если они не заданы"""
+    if config.getoption("stand_in"):
+        # Стенд принимает любые учетные данные
+        return dict(STAND_IN_CREDENTIALS)
+    lease = _worker_lease(config)
+    if lease is not None:
+        return lease.credentials
+    login = os.getenv("STEPIK_LOGIN")
+    password = os.getenv("STEPIK_PASSWORD")
+    if not login or not password:
+        return None
+    return {"login": login, "password": password}
+
+
+@pytest.fixture(scope="session")
+def auth_storage_state(pytestconfig, browser: Browser) -> Optional[str]:
+    """Путь к storage_state авторизованного пользователя (один вход на воркер)
+
+    Сессия берется из дискового кэша, если он не старше TTL и проходит
+    проверку. Иначе выполняется полный вход и кэш перезаписывается.
+    """
+    creds = _load_credentials(pytestconfig)
+    if creds is None:
+        logger.warning("Кэш авторизации недоступен: не заданы учетные данные")
+        return None
+    return _ensure_auth_state(pytestconfig, browser, creds, _worker_lease(pytestconfig))
+
+
+def _ensure_auth_state(config, browser: Browser, creds: dict, lease: Optional[Lease]) -> str:
+    """storage_state учетной записи: из кэша или после входа (проверяется раз на воркер)"""
+    known: Dict[str, str] = config.stash[AUTH_STATES]
+    if creds["login"] in known:
+        return known[creds["login"]]
+
+    def login(page: Page) -> None:
+        if lease is None:
+            LoginPage(page).login(creds["login"], creds["password"])
+            return
+        # Вход под арендованной записью: не чаще --login-interval и с учетом неудач
+        with lease.logging_in():
+            LoginPage(page).login(creds["login"], creds["password"])
+
+    cache = AuthStateCache(
+        creds["login"],
+        cache_dir=Path(config.getoption("auth_cache_dir")),
+        ttl=config.getoption("auth_cache_ttl"),
+    )
+    path = cache.ensure(
+        browser, login=login, check=lambda page: LoginPage(page).is_session_active()
+    )
+    known[creds["login"]] = str(path)
+    return str(path)
+
+
+@pytest.fixture
+def credential_lease(request, pytestconfig) -> Generator[Optional[Lease], None, None]:
+    """Учетная запись из пула, арендованная на тест (--credential-lease=test)"""
+    pool = pytestconfig.stash.get(CREDENTIAL_POOL, None)
+    if pool is None or pytestconfig.getoption("credential_lease") != "test":
+        yield None
+        return
+    lease = pool.lease(owner=request.node.nodeid)
+    yield lease
+    lease.release()
 
 
 @pytest.fixture
-def context(browser: Browser) -> Generator[BrowserContext, None, None]:
-    """Контекст браузера (одна сессия)"""
-    logger.info("Создание контекста браузера")
-    context = browser.new_context()
+def context(
+    request,
+    browser_handle: BrowserHandle,
+    resource_sizes: ResourceSizes,
+    asset_cache: Optional[AssetCache],
+) -> Generator[BrowserContext, None, None]:
+    """Контекст браузера (одна сессия)
+
+    По умолчанию контекст открывается уже авторизованным из кэша storage_state.
+    Отключается опцией --no-auth-cache или маркером no_auth_cache.
+    Ненужные тесту ресурсы режутся по профилю блокировки (--block-profile).
+    В режиме --har-mode=record трафик пишется в HAR, в replay - отдается из него.
+    """
+    har_mode = request.config.getoption("har_mode")
+    har_file = har_path(Path(request.config.getoption("har_dir")), request.node.nodeid)
+
+    # Запись и воспроизведение HAR всегда проходят сценарий входа целиком
+    use_auth_cache = har_mode == "off" and not (
+        request.config.getoption("no_auth_cache")
+        or request.node.get_closest_marker("no_auth_cache")
+    )
+    lease = request.getfixturevalue("credential_lease")
+    storage_state = None
+    if use_auth_cache and lease is not None:
+        storage_state = _ensure_auth_state(
+            request.config, browser_handle.ensure(), lease.credentials, lease
+        )
+    elif use_auth_cache:
+        storage_state = request.getfixturevalue("auth_storage_state")
+
+    # Пул хранит контексты одного вида, поэтому HAR и тесты без кэша авторизации идут мимо него
+    # Видео пишется с момента создания контекста, поэтому такой контекст не берется из пула,
+    # как и контекст учетной записи, арендованной на тест
+    recorder = _recorder(request)
+    pool = None
+    if (
+        har_mode == "off"
+        and lease is None
+        and not recorder.plan.video
+        and not request.node.get_closest_marker("no_auth_cache")
+    ):
+        pool = _context_pool(request)
+
+    context_kwargs: dict = {**recorder.context_kwargs(), **_har_record_kwargs(request, har_file)}
+    replayer = _har_replayer(request, har_file)
+
+    if pool is not None:
+        context = pool.acquire().context
+    else:
+        logger.info(
+            "Создание контекста браузера",
+            authenticated=storage_state is not None,
+            har_mode=har_mode,
+        )
+        # Соединение с общим Chromium могло оборваться: ensure() переподключится
+        browser = browser_handle.ensure()
+        context = browser.new_context(storage_state=storage_state, **context_kwargs)
+    if replayer is not None:
+        replayer.install(context)
+    # Кэш статики подключается раньше блокировки: обработчик, добавленный позже, срабатывает первым,
+    # поэтому заблокированные ресурсы до кэша не доходят. С HAR сеть уже подменена - кэш не нужен
+    cache = asset_cache if har_mode == "off" else None
+    if cache is not None:
+        cache.install(context)
+    blocker = ResourceBlocker(_block_profile(request), resource_sizes)
+    blocker.install(context)
+    recorder.start(context)
     yield context
-    logger.info("Закрытие контекста")
-    context.close()
+    keep = _test_failed(request.node)
+    recorder.stop(context, keep)
+    if pool is not None:
+        if cache is not None:
+            cache.uninstall(context)
+        blocker.uninstall(context)
+        pool.release(context)
+    else:
+        logger.info("Закрытие контекста")
+        context.close()
+    recorder.finish(keep)
+    _report_recording(request, recorder)
+    _report_blocked(request, blocker)
+    if replayer is not None:
+        _report_replay([replayer])
+
+
+def _har_record_kwargs(request, har_file: Path) -> dict:
+    """Аргументы new_context для записи HAR (--har-mode=record)"""
+    if request.config.getoption("har_mode") != "record":
+        return {}
+    har_file.parent.mkdir(parents=True, exist_ok=True)
+    return {"record_har_path": str(har_file), "record_har_content": "embed"}
+
+
+def _har_replayer(request, har_file: Path) -> Optional[HarReplayer]:
+    """Воспроизведение записанного HAR (--har-mode=replay); тест без записи пропускается"""
+    if request.config.getoption("har_mode") != "replay":
+        return None
+    if not har_file.exists():
+        pytest.skip(f"Нет записи HAR {har_file}: запустите тест с --har-mode=record")
+    ignored_params = DEFAULT_IGNORED_PARAMS | set(request.config.getoption("har_ignore_param"))
+    return HarReplayer.load(
+        har_file,
+        not_found=request.config.getoption("har_not_found"),
+        ignored_params=ignored_params,
+    )
+
+
+def _report_replay(replayers: List[HarReplayer]) -> None:
+    hits = sum(replayer.hits for replayer in replayers)
+    misses = sum(len(replayer.misses) for replayer in replayers)
+    logger.info("Воспроизведение HAR завершено", hits=hits, misses=misses)
+    SESSION_STATS.add("har[replay]", hits=hits, misses=misses)
+
+
+def _async_storage_state(request) -> Optional[str]:
+    """storage_state async-контекста; запись и воспроизведение HAR проходят вход целиком"""
+    if request.config.getoption("har_mode") != "off":
+        return None
+    if request.node.get_closest_marker("no_auth_cache"):
+        return None
+    return _fresh_auth_state(request.config)
+
+
+@pytest.fixture(scope="session")
+def context_pool(request, browser_handle: BrowserHandle) -> Generator[ContextPool, None, None]:
+    """Пул теплых контекстов воркера (включается опцией --context-pool=N)"""
+    config = request.config
+    storage_state = (
+        None if config.getoption("no_auth_cache") else request.getfixturevalue("auth_storage_state")
+    )
+    pool = ContextPool(
+        factory=lambda: browser_handle.ensure().new_context(storage_state=storage_state),
+        size=config.getoption("context_pool"),
+        max_reuse=config.getoption("context_pool_max_reuse"),
+        storage_state=storage_state,
+        page_timeout=lambda: TIMEOUTS.timeout("page.action"),
+        navigation_timeout=lambda: TIMEOUTS.timeout("page.navigation"),
+    )
+    pool.prewarm()
+    yield pool
+    logger.info("Закрытие пула контекстов")
+    pool.close()
+
+
+def _context_pool(request) -> Optional[ContextPool]:
+    """Пул контекстов, если он включен"""
+    if request.config.getoption("context_pool") <= 0:
+        return None
+    pool: ContextPool = request.getfixturevalue("context_pool")
+    return pool
 
 
 @pytest.fixture
-def page(context) -> Generator[Page, None, None]:
+def page(request, context) -> Generator[Page, None, None]:
     """Фикстура страницы - одна сессия на все тесты"""
+    pool = _context_pool(request)
+    pooled_page = pool.page_for(context) if pool is not None else None
+    if pooled_page is not None:
+        # Таймауты страницы из пула выставлены при ее выдаче (acquire)
+        NetworkMonitor.for_page(pooled_page).clear()
+        yield pooled_page
+        return
+
     logger.info("Создание новой страницы")
     page = context.new_page()
 
-    page.set_default_timeout(30000)
-    page.set_default_navigation_timeout(30000)
+    page.set_default_timeout(TIMEOUTS.timeout("page.action"))
+    page.set_default_navigation_timeout(TIMEOUTS.timeout("page.navigation"))
+    # Монитор подключаем сразу, чтобы учесть запросы до первого действия page object
+    NetworkMonitor.for_page(page)
 
     yield page
     logger.info("Закрытие страницы")
 
 
+def _fresh_auth_state(config) -> Optional[str]:
+    """storage_state из кэша, если он не старше TTL (без проверки в браузере)"""
+    creds = _load_credentials(config)
+    if creds is None or config.getoption("no_auth_cache"):
+        return None
+    cache = AuthStateCache(
+        creds["login"],
+        cache_dir=Path(config.getoption("auth_cache_dir")),
+        ttl=config.getoption("auth_cache_ttl"),
+    )
+    return str(cache.path) if cache.is_fresh() else None
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_playwright_instance() -> AsyncGenerator[AsyncPlaywright, None]:
+    """Асинхронный Playwright на всю сессию (общий event loop)"""
+    logger.info("Запуск асинхронного Playwright")
+    async with async_playwright() as playwright:
+        yield playwright
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_browser(
+    async_playwright_instance: AsyncPlaywright,
+) -> AsyncGenerator[AsyncBrowser, None]:
+    """Один браузер Chromium для всех асинхронных сценариев сессии"""
+    logger.info("Запуск браузера Chromium (async)")
+    browser = await async_playwright_instance.chromium.launch()
+    yield browser
+    logger.info("Закрытие браузера (async)")
+    await browser.close()
+
+
+@pytest_asyncio.fixture
+async def async_context(
+    request,
+    async_browser: AsyncBrowser,
+    resource_sizes: ResourceSizes,
+    asset_cache: Optional[AssetCache],
+) -> AsyncGenerator[AsyncBrowserContext, None]:
+    """Асинхронный контекст браузера, авторизованный из кэша, если он свежий
+
+    --har-mode работает так же, как у sync-фикстуры context.
+    """
+    har_mode = request.config.getoption("har_mode")
+    har_file = har_path(Path(request.config.getoption("har_dir")), request.node.nodeid)
+    storage_state = _async_storage_state(request)
+    replayer = _har_replayer(request, har_file)
+    recorder = _recorder(request)
+    logger.info(
+        "Создание контекста браузера (async)",
+        authenticated=storage_state is not None,
+        har_mode=har_mode,
+    )
+    context = await async_browser.new_context(
+        storage_state=storage_state,
+        **recorder.context_kwargs(),
+        **_har_record_kwargs(request, har_file),
+    )
+    if replayer is not None:
+        await replayer.install_async(context)
+    if asset_cache is not None and har_mode == "off":
+        await asset_cache.install_async(context)
+    blocker = ResourceBlocker(_block_profile(request), resource_sizes)
+    await blocker.install_async(context)
+    await recorder.start_async(context)
+    yield context
+    keep = _test_failed(request.node)
+    await recorder.stop_async(context, keep)
+    logger.info("Закрытие контекста (async)")
+    await context.close()
+    await recorder.finish_async(keep)
+    _report_recording(request, recorder)
+    _report_blocked(request, blocker)
+    if replayer is not None:
+        _report_replay([replayer])
+
+
+@pytest_asyncio.fixture
+async def async_page(async_context: AsyncBrowserContext) -> AsyncPage:
+    """Асинхронная страница в контексте теста"""
+    page = await async_context.new_page()
+    page.set_default_timeout(TIMEOUTS.timeout("page.action"))
+    page.set_default_navigation_timeout(TIMEOUTS.timeout("page.navigation"))
+    AsyncNetworkMonitor.for_page(page)
+    return page
+
+
+@pytest_asyncio.fixture
+async def new_async_page(
+    request,
+    async_browser: AsyncBrowser,
+    resource_sizes: ResourceSizes,
+    asset_cache: Optional[AssetCache],
+) -> AsyncGenerator[Callable[[], Awaitable[AsyncPage]], None]:
+    """Фабрика изолированных страниц: у каждой свой контекст в общем браузере
+
+    Удобна для конкурентных сценариев через asyncio.gather. Все созданные
+    контексты закрываются после теста. С --har-mode у каждого контекста свой
+    HAR по номеру создания (``<тест>-<k>.har``). Trace и видео попытки
+    (--recording, маркер record) пишутся для всех контекстов.
+    """
+    har_mode = request.config.getoption("har_mode")
+    har_dir = Path(request.config.getoption("har_dir"))
+    contexts: list[AsyncBrowserContext] = []
+    replayers: List[HarReplayer] = []
+    blocker = ResourceBlocker(_block_profile(request), resource_sizes)
+    storage_state = _async_storage_state(request)
+    recorder = _recorder(request)
+
+    async def factory() -> AsyncPage:
+        har_file = har_path(har_dir, f"{request.node.nodeid}-{len(contexts) + 1}")
+        replayer = _har_replayer(request, har_file)
+        context = await async_browser.new_context(
+            storage_state=storage_state,
+            **recorder.context_kwargs(),
+            **_har_record_kwargs(request, har_file),
+        )
+        contexts.append(context)
+        if replayer is not None:
+            replayers.append(replayer)
+            await replayer.install_async(context)
+        if asset_cache is not None and har_mode == "off":
+            await asset_cache.install_async(context)
+        await blocker.install_async(context)
+        await recorder.start_async(context)
+        page = await context.new_page()
+        page.set_default_timeout(TIMEOUTS.timeout("page.action"))
+        page.set_default_navigation_timeout(TIMEOUTS.timeout("page.navigation"))
+        return page
+
+    yield factory
+    keep = _test_failed(request.node)
+    logger.info("Закрытие контекстов (async)", count=len(contexts))
+    for context in contexts:
+        await recorder.stop_async(context, keep)
+        await context.close()
+    await recorder.finish_async(keep)
+    _report_recording(request, recorder)
+    _report_blocked(request, blocker)
+    if replayers:
+        _report_replay(replayers)
+
+
+@pytest.fixture(scope="session")
+def stand_in(pytestconfig) -> Generator[StandIn, None, None]:
+    """Локальный стенд Stepik: запущенный по --stand-in или свой на сессию
+
+    Свой стенд не меняет адрес сайта для page objects: тест передает
+    ``stand_in.url`` в страницы явно (``base_url=...``).
+    """
+    running = pytestconfig.stash.get(STAND_IN, None)
+    if running is not None:
+        yield running
+        return
+    with _start_stand_in(pytestconfig) as server:
+        yield server
+
+
 @pytest.fixture
-def credentials():
-    """Фикстура с тестовыми учетными данными из .env"""
-    login = os.getenv("STEPIK_LOGIN")
-    password = os.getenv("STEPIK_PASSWORD")
+def checkpoints(request, page: Page) -> Generator[Checkpoints, None, None]:
+    """Контрольные точки шагов: перезапуск продолжает тест с последнего пройденного шага
 
-    if not login or not password:
+    Отключается опцией --no-resume или маркером no_resume.
+    """
+    resume = not (
+        request.config.getoption("no_resume") or request.node.get_closest_marker("no_resume")
+    )
+    attempt = getattr(request.node, "execution_count", 1)
+    tracker = Checkpoints(request.node.nodeid, page, DEFAULT_CHECKPOINT_DIR, resume and attempt > 1)
+    yield tracker
+    tracker.finish(passed=not _test_failed(request.node))
+
+
+@pytest.fixture
+def credentials(pytestconfig, credential_lease: Optional[Lease]):
+    """Фикстура с тестовыми учетными данными из .env или из пула учетных записей"""
+    if credential_lease is not None:
+        return credential_lease.credentials
+    creds = _load_credentials(pytestconfig)
+
+    if creds is None and pytestconfig.getoption("har_mode") == "replay":
+        # Ответ сервера авторизации берется из HAR, настоящий пароль не нужен
+        return {"login": "har-replay@example.com", "password": "har-replay"}
+    if creds is None:
         logger.error("Не найдены учетные данные в .env файле")
         raise ValueError("Добавьте STEPIK_LOGIN и STEPIK_PASSWORD в .env файл")
-    logger.info("Учетные данные загружены", login=login[:3] + "***")
-    return {"login": login, "password": password}
+    logger.info("Учетные данные загружены", login=creds["login"][:3] + "***")
+    return creds
+
+
+def pytest_sessionstart(session):
+    session.config.stash[SESSION_STARTED] = time.monotonic()
+    TIMELINE.begin("session", "session", "session")
 
 
-def pytest_sessionfinish(exitstatus):
+def pytest_sessionfinish(session, exitstatus):
     """Хук для логгирования завершения тестовой сессии"""
+    lease = session.config.stash.get(WORKER_LEASE, None)
+    if lease is not None:
+        lease.release()
+
+    writer = get_artifact_writer()
+    if writer is not None:
+        writer.close()
+        set_artifact_writer(None)
+
+    handle = session.config.stash.get(BROWSER_HANDLE, None)
+    if handle is not None:
+        SESSION_STATS.add("browser", **handle.stats())
+    shared = session.config.stash.get(SHARED_CHROMIUM, None)
+    if shared is not None:
+        SESSION_STATS.add(
+            "browser", shared_startup_ms=shared.startup_ms, shared_rss_mb=shared.rss_mb()
+        )
+
+    stand_in = session.config.stash.get(STAND_IN, None)
+    if stand_in is not None:
+        stats = stand_in.stats()
+        SESSION_STATS.add(
+            "stand_in",
+            requests=sum(stats["requests"].values()),
+            injected_errors=sum(stats["errors"].values()),
+        )
+
+    # На воркере xdist передаем счетчики контроллеру, JSON метрик и таймлайн пишет контроллер
+    TIMELINE.end("session", exitstatus=int(exitstatus))
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["session_stats"] = SESSION_STATS.as_dict()
+        workeroutput["action_metrics"] = ACTION_METRICS.as_dict()
+        workeroutput["timeout_samples"] = TIMEOUTS.as_dict()
+        if TIMELINE.enabled:
+            workeroutput["timeline"] = TIMELINE.events()
+    else:
+        if ACTION_METRICS:
+            ACTION_METRICS.write_json(Path(session.config.getoption("metrics_file")))
+        TIMEOUTS.save(Path(session.config.getoption("timeout_history")))
+        if session.config.getoption("asset_cache"):
+            # Размер кэша ограничивает контроллер, когда воркеры уже закончили
+            AssetCache(max_bytes=session.config.getoption("asset_cache_mb") << 20).evict()
+        if TIMELINE.enabled:
+            TIMELINE.write(Path(session.config.getoption("timeline")))
     logger.info("Тестовая сессия завершена", exitstatus=exitstatus)
+
+
+def pytest_unconfigure(config):
+    """Остановить общий Chromium и локальный стенд, дописать и остановить фоновое логирование"""
+    spans = config.stash.get(STEP_SPANS, None)
+    if spans is not None:
+        allure_commons.plugin_manager.unregister(spans)
+    shared = config.stash.get(SHARED_CHROMIUM, None)
+    if shared is not None:
+        shared.stop()
+    stand_in = config.stash.get(STAND_IN, None)
+    if stand_in is not None:
+        stand_in.stop()
+    stop_logging()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Собираем счетчики и метрики действий с завершившегося воркера xdist"""
+    workeroutput = getattr(node, "workeroutput", {})
+    SESSION_STATS.merge(workeroutput.get("session_stats", {}))
+    ACTION_METRICS.merge(workeroutput.get("action_metrics", {}))
+    TIMEOUTS.merge(workeroutput.get("timeout_samples", {}))
+    TIMELINE.merge(workeroutput.get("timeline", []))
+
+
+def _report_credential_utilisation(terminalreporter) -> None:
+    """Загрузка пула учетных записей: доля времени сессии, когда записи были арендованы"""
+    config = terminalreporter.config
+    pool = config.stash.get(CREDENTIAL_POOL, None)
+    leases = SESSION_STATS.as_dict().get("credentials")
+    if pool is None or not leases or SESSION_STARTED not in config.stash:
+        return
+    elapsed = time.monotonic() - config.stash[SESSION_STARTED]
+    utilisation = leases.get("held_s", 0.0) / (elapsed * len(pool.accounts)) if elapsed else 0.0
+    wait_ms = leases.get("lease_wait_ms", 0.0) / max(1, leases.get("leases", 0))
+    terminalreporter.write_line(
+        f"credentials: записей {len(pool.accounts)}, загрузка {utilisation:.0%}, "
+        f"среднее ожидание аренды {wait_ms:.0f} мс"
+    )
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Сводка счетчиков производительности и самых медленных действий в конце прогона"""
+    if SESSION_STATS:
+        terminalreporter.section("E2E: статистика производительности")
+        for section, values in SESSION_STATS.as_dict().items():
+            counters = ", ".join(f"{key}={value:.0f}" for key, value in values.items())
+            terminalreporter.write_line(f"{section}: {counters}")
+        saved_ms = estimated_savings_ms(SESSION_STATS.as_dict().get("recording"))
+        if saved_ms:
+            terminalreporter.write_line(
+                f"recording: попытки без trace/видео сэкономили не менее {saved_ms / 1000:.1f} с"
+            )
+        assets = SESSION_STATS.as_dict().get("asset_cache")
+        if assets:
+            served = assets.get("hits", 0) + assets.get("revalidated", 0)
+            terminalreporter.write_line(
+                f"asset_cache: из кэша {served / assets['requests']:.0%} запросов статики, "
+                f"не скачано {assets.get('bytes_saved', 0) / 2**20:.1f} МБ"
+            )
+        _report_credential_utilisation(terminalreporter)
+
+    if ACTION_METRICS:
+        terminalreporter.section("E2E: длительность действий (мс, топ-10 по p95)")
+        histograms = ACTION_METRICS.session_summary()
+        slowest = sorted(histograms.items(), key=lambda item: item[1]["p95"], reverse=True)
+        for key, hist in slowest[:10]:
+            terminalreporter.write_line(
+                f"{key}: n={hist['count']}, p50={hist['p50']:.0f}, "
+                f"p95={hist['p95']:.0f}, max={hist['max']:.0f}"
+            )
@@ -0,0 +1,14 @@
+"""Асинхронные page objects поверх ``playwright.async_api``.
+
+Повторяют API классов из ``pages``, но все действия - корутины. Это позволяет
+запускать десятки независимых сценариев в одном event loop и одном браузере.
+Шаги Allure здесь не используются: конкурентные корутины делят один поток,
+и шаги разных сценариев перемешались бы в отчете.
+"""
+
+from .base_page import BasePage
+from .login_page import LoginPage
+from .catalog_page import CatalogPage
+from .search_page import SearchPage
+
+__all__ = ["BasePage", "LoginPage", "CatalogPage", "SearchPage"]
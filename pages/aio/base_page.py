@@ -0,0 +1,254 @@
+import os
+import time
+from playwright.async_api import Error as PlaywrightError, Page, Locator, Response
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from typing import Mapping, Optional, Union
+from utils.artifacts import PAGE_GEOMETRY_SCRIPT, get_artifact_writer
+from ..core import PageCore
+from .network import NetworkMonitor
+from ..probe import PROBE_SCRIPT, Condition, ProbeResult
+from ..settle import DOM_QUIET_SCRIPT, SETTLE_CONFIG, SettleStrategy, record_settle
+from ..timeouts import TIMEOUTS
+
+
+class BasePage(PageCore):
+    """Базовый класс для всех асинхронных страниц с логгированием"""
+
+    page: Page
+
+    @property
+    def network(self) -> NetworkMonitor:
+        """Монитор запросов страницы (подключается при первом обращении)"""
+        return NetworkMonitor.for_page(self.page)
+
+    async def _wait_for_all_requests(self) -> None:
+        """
+        Ожидать завершения загрузки DOM (избегаем networkidle для CI)
+        """
+        self.log.debug("Ожидание загрузки DOM.")
+        await self.page.wait_for_load_state("domcontentloaded")
+
+    async def navigate(self, url: str) -> Optional[Response]:
+        """
+        Переход по URL с логированием
+
+        :param url: Полный URL для перехода
+        :return: Response object или None
+        """
+        self.log.info("Навигация по URL", url=url)
+        with (
+            self._measure("navigate", self._url_path(url)),
+            self._timeout(self._navigation_timeout) as timeout,
+        ):
+            return await self.page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+
+    async def click(
+        self, locator: Locator, element_description: str, settle: Optional[str] = None
+    ) -> None:
+        """Клик по элементу с логированием
+
+        Args:
+            locator : Локатор playwright
+            element_description (str): Человекочитаемое описание элемента для логов
+            settle (str, optional): Стратегия ожидания после клика: "none", "dom-quiet",
+                "url-change" или "response:<glob>". Defaults to SETTLE_CONFIG.strategy
+        """
+        strategy = SettleStrategy.parse(settle or SETTLE_CONFIG.strategy)
+        self.log.info(
+            "Клик по элементу: %s", element_description, settle=str(strategy), action_phase="start"
+        )
+
+        with self._measure("click", element_description):
+            if strategy.kind == "response" and strategy.pattern is not None:
+                async with self.page.expect_response(strategy.pattern, timeout=self.timeout):
+                    with self._timeout() as timeout:
+                        await locator.click(timeout=timeout)
+                    started = time.perf_counter()
+            else:
+                url_before = self.page.url
+                with self._timeout() as timeout:
+                    await locator.click(timeout=timeout)
+                started = time.perf_counter()
+                await self._settle(strategy, url_before)
+
+        waited_ms = record_settle(strategy, started)
+        self.log.info(
+            "Успешный клик: %s",
+            element_description,
+            current_url=self.page.url,
+            settle_ms=round(waited_ms),
+            action_phase="done",
+        )
+
+    async def _settle(self, strategy: SettleStrategy, url_before: str) -> None:
+        """
+        Дождаться стабилизации страницы после действия
+
+        :param strategy: Стратегия ожидания ("response" обрабатывается в click)
+        :param url_before: URL до действия (для стратегии "url-change")
+        """
+        if strategy.kind == "dom-quiet":
+            try:
+                result = await self.page.evaluate(
+                    DOM_QUIET_SCRIPT, [SETTLE_CONFIG.quiet_ms, SETTLE_CONFIG.cap_ms]
+                )
+            except Exception as e:
+                self.log.debug("DOM-ожидание прервано навигацией", error=str(e))
+                await self.page.wait_for_load_state("domcontentloaded", timeout=self.timeout)
+                return
+            if not result["settled"]:
+                self.log.debug("DOM не успокоился за отведенное время", cap_ms=SETTLE_CONFIG.cap_ms)
+
+        elif strategy.kind == "url-change":
+            try:
+                await self.page.wait_for_url(
+                    lambda url: url != url_before,
+                    timeout=SETTLE_CONFIG.cap_ms,
+                    wait_until="commit",
+                )
+            except PlaywrightTimeoutError:
+                self.log.debug("URL не изменился после клика", url=url_before)
+
+    async def fill(self, locator: Locator, text: str, element_description: str) -> None:
+        """Заполнение поля с логированием
+
+        Args:
+            locator: Локатор Playwright
+            text: Текст для ввода
+            element_description: Описание поля
+        """
+        self.log.info(
+            "Заполняю поле: %s", element_description, text=self._mask(text), action_phase="start"
+        )
+        with self._measure("fill", element_description):
+            with self._timeout() as timeout:
+                await locator.fill(text, timeout=timeout)
+        self.log.info("Поле заполнено: %s", element_description, action_phase="done")
+
+    async def wait_for_url(self, url_pattern: str, timeout: Union[float, str, None] = None) -> None:
+        """
+        Ожидание перехода на URL по паттерну
+
+        :param url_pattern: Паттерн URL для ожидания (может быть частью URL)
+        :param timeout: Таймаут в мс или ключ политики TIMEOUTS
+            (если None, используется self.timeout)
+        """
+        self.log.info("Ожидание URL", pattern=url_pattern, action_phase="start")
+
+        try:
+            with self._measure("wait_for_url", url_pattern), self._timeout(timeout) as timeout:
+                await self.page.wait_for_url(url_pattern, timeout=timeout)
+            self.log.info(
+                "URL обнаружен",
+                pattern=url_pattern,
+                current_url=self.page.url,
+                action_phase="done",
+            )
+        except Exception as e:
+            self.log.error(
+                "URL не обнаружен", pattern=url_pattern, current_url=self.page.url, error=str(e)
+            )
+            raise
+
+    async def count(self, name: str) -> int:
+        """
+        Число элементов по имени из реестра (кэшируется до следующего действия)
+
+        :param name: Имя элемента, например "course_cards"
+        """
+        cached = self._cached_count(name)
+        if cached is not None:
+            return cached
+        return self._store_count(name, await getattr(self, name).count())
+
+    async def exists(self, name: str) -> bool:
+        """Есть ли на странице хотя бы один элемент с таким именем"""
+        return await self.count(name) > 0
+
+    async def probe(self, conditions: Mapping[str, Union[str, Condition]]) -> ProbeResult:
+        """Проверить состояние нескольких элементов одним запросом в браузер
+
+        Args:
+            conditions: Имя элемента из реестра страницы -> условие:
+                "attached", "visible", "text" (непустой текст) или "count>=N"
+        """
+        data = await self.page.evaluate(PROBE_SCRIPT, self._probe_arg(conditions, 0, 0))
+        result = ProbeResult.from_js(data)
+        self.log.debug("Проверка элементов", ok=result.ok, failed=result.failed)
+        return result
+
+    async def wait_all(
+        self,
+        conditions: Mapping[str, Union[str, Condition]],
+        timeout: Union[float, str, None] = None,
+        interval: float = 100,
+    ) -> ProbeResult:
+        """Дождаться выполнения всех условий (опрос идет внутри страницы)
+
+        Все условия проверяются вместе на каждом такте опроса, поэтому ожидание
+        стоит один запрос в браузер (плюс по одному на каждую полную навигацию).
+        По таймауту исключение не бросается: результат содержит последнее состояние.
+
+        Args:
+            conditions: Условия, как в probe()
+            timeout: Сколько ждать, мс, или ключ политики TIMEOUTS
+                (если None, используется self.timeout)
+            interval: Период опроса, мс
+        """
+        key = timeout if isinstance(timeout, str) else None
+        deadline = time.perf_counter() + self._timeout_ms(timeout) / 1000
+        with self._measure("wait_all", ", ".join(conditions)):
+            while True:
+                remaining = max(0.0, (deadline - time.perf_counter()) * 1000)
+                arg = self._probe_arg(conditions, remaining, interval)
+                try:
+                    data = await self.page.evaluate(PROBE_SCRIPT, arg)
+                    break
+                except PlaywrightError as e:
+                    if remaining <= 0:
+                        raise
+                    # Полная навигация уничтожила контекст - ждем новый документ
+                    self.log.debug("Опрос элементов прерван навигацией", error=str(e))
+                    await self.page.wait_for_load_state("domcontentloaded", timeout=remaining)
+
+        result = ProbeResult.from_js(data)
+        if key is not None and result.ok:
+            TIMEOUTS.observe(key, result.elapsed_ms, self.base_url)
+        self.log.info(
+            "Ожидание элементов завершено",
+            ok=result.ok,
+            failed=result.failed,
+            polls=result.polls,
+            elapsed_ms=round(result.elapsed_ms),
+        )
+        return result
+
+    async def is_element_visible(self, locator: Locator, element_description: str) -> bool:
+        """
+        Проверка видимости элемента
+
+        Args:
+            locator: Локатор Playwright
+            element_description: Описание элемента
+        """
+        try:
+            is_visible = await locator.is_visible(timeout=5000)
+            self.log.debug("Видимость элемента '%s'", element_description, is_visible=is_visible)
+            return is_visible
+        except Exception as e:
+            self.log.debug("Элемент '%s' не найден", element_description, error=str(e))
+            return False
+
+    async def take_screenshot(self, name: str) -> None:
+        """Скриншот страницы: в pytest - через фоновый писатель артефактов теста"""
+        writer = get_artifact_writer()
+        if writer is not None:
+            width, height = await self.page.evaluate(PAGE_GEOMETRY_SCRIPT)
+            raw = await self.page.screenshot(**writer.screenshot_options(width, height))
+            path = writer.submit(raw, name)
+            self.log.info("Скриншот поставлен в очередь записи", path=str(path))
+            return
+
+        screenshot_path = f"screenshots/{name}.png"
+        os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
+        await self.page.screenshot(path=screenshot_path)
@@ -0,0 +1,60 @@
+from playwright.async_api import Locator
+from typing import Optional
+from .base_page import BasePage
+from ..core import CatalogElements
+
+
+class CatalogPage(CatalogElements, BasePage):
+    """Асинхронный Page Object для главной страницы каталога Stepik (/catalog)"""
+
+    async def get_search_button(self) -> Optional[Locator]:
+        """Кнопка поиска (если есть)"""
+        if await self.exists("search_buttons"):
+            button: Locator = self.search_buttons.first
+            return button
+        return None
+
+    async def open(self) -> "CatalogPage":
+        """Открыть главную страницу каталога"""
+        await self.navigate(self.catalog_url)
+        with self._timeout("catalog.search_input") as timeout:
+            await self.search_input.wait_for(state="visible", timeout=timeout)
+        return self
+
+    async def is_loaded(self) -> bool:
+        """Проверка, что главная страница загрузилась"""
+        self.log.info("Проверка загрузки главной страницы")
+
+        is_search_visible = (
+            await self.wait_all({"search_input": "visible"}, timeout="catalog.loaded")
+        ).ok
+        is_catalog_url = "/catalog" in self.get_current_url()
+
+        self.log.info(
+            "Проверка загрузки главной страницы завершена",
+            search_visible=is_search_visible,
+            is_catalog=is_catalog_url,
+        )
+        return is_search_visible and is_catalog_url
+
+    async def search_courses(self, query: str):
+        """Поиск курсов по запросу
+
+        Args:
+            query: Поисковой запрос (например, "python")
+        Returns:
+            Страница результатов поиска
+        """
+        self.log.info("Поиск курсов", query=query)
+
+        await self.fill(self.search_input, query, "Поисковая строка")
+        await self.search_input.press("Enter")
+
+        await self.wait_for_url("**/catalog/search*", timeout="catalog.results_url")
+        await self.wait_for_url(f"**q={query}*", timeout="catalog.query_url")
+
+        self.log.info("Поиск выполнен", query=query, current_url=self.get_current_url())
+
+        from .search_page import SearchPage
+
+        return SearchPage(self.page, self.explicit_timeout, self.base_url)
@@ -0,0 +1,122 @@
+from typing import Union
+from .base_page import BasePage
+from ..core import LoginElements
+from ..locators import LoginLocators
+
+AVATAR_SELECTOR = LoginLocators.AVATAR.value
+
+
+class LoginPage(LoginElements, BasePage):
+    """Асинхронный Page Object для страницы авторизации Stepik (/login)"""
+
+    async def open(self) -> "LoginPage":
+        """Открыть страницу авторизации"""
+        self.log.info("Открытие страницы авторизации")
+        await self.navigate(self.login_url)
+
+        with self._timeout("login.form") as timeout:
+            await self.email_field.wait_for(state="visible", timeout=timeout)
+        self.log.info("Страница авторизации загружена")
+        return self
+
+    async def enter_email(self, email: str) -> "LoginPage":
+        """Ввести email в поле логина"""
+        await self.fill(self.email_field, email, "Поле E-mail")
+        return self
+
+    async def enter_password(self, password: str) -> "LoginPage":
+        """Ввести пароль"""
+        await self.fill(self.password_field, password, "Поле пароль")
+        return self
+
+    async def submit_login(self) -> None:
+        # Ответ сервера и редирект ждет вызывающий код (login)
+        await self.click(self.submit_button, "Кнопка войти", settle="none")
+
+    async def login(self, email: str, password: str) -> None:
+        """Полный процесс авторизации."""
+        self.log.info("Начало процесса авторизации", email=email[:3] + "***")
+
+        await self.open()
+        await self.enter_email(email)
+        await self.enter_password(password)
+
+        since = self.network.mark()
+        await self.submit_login()
+
+        with self._timeout("login.auth_response") as timeout:
+            auth = await self.network.wait_for_response("*/auth/*", since=since, timeout=timeout)
+        self.log.info(
+            "Получен ответ авторизации",
+            status=auth.status,
+            duration_ms=round(auth.duration_ms or 0),
+        )
+
+        try:
+            with self._timeout("login.redirect") as timeout:
+                await self.page.wait_for_url("**/catalog*", timeout=timeout)
+        except Exception:
+            self.log.info("Не дождались редайректа")
+
+        current_url = self.get_current_url()
+        self.log.info("URL после авторизации: %s", current_url)
+
+        if self.is_authorized_url(current_url):
+            self.log.info("Авторизация успешна")
+            return
+
+        if "auth=login" in current_url:
+            self.log.error("Авторизация не удалось: остались на странице логина")
+            raise Exception("Login failed: session not created")
+
+        self.log.info("Авторизация завершена", final_url=current_url)
+
+    async def has_session_cookies(self) -> bool:
+        """Есть ли в контексте cookies Stepik (без обращения к странице)"""
+        return len(await self.page.context.cookies(self.catalog_url)) > 0
+
+    async def is_session_active(self, timeout: Union[float, str] = "login.session_check") -> bool:
+        """
+        Открыть каталог и проверить, что пользователь уже авторизован.
+
+        :param timeout: Сколько ждать иконку профиля, мс, или ключ политики TIMEOUTS
+        """
+        await self.navigate(self.catalog_url)
+        try:
+            with self._timeout(timeout) as timeout_ms:
+                await self.page.wait_for_selector(
+                    AVATAR_SELECTOR, state="attached", timeout=timeout_ms
+                )
+        except Exception:
+            self.log.info("Активная сессия не обнаружена")
+            return False
+        self.log.info("Обнаружена активная сессия")
+        return True
+
+    async def ensure_logged_in(self, email: str, password: str) -> None:
+        """Авторизоваться, только если контекст не содержит действительной сессии."""
+        if await self.has_session_cookies() and await self.is_session_active():
+            self.log.info("Сессия восстановлена из кэша, вход не требуется")
+            return
+
+        await self.login(email, password)
+
+    async def is_login_successful(self) -> bool:
+        """
+        Проверка успешной авторизации по иконке профиля с явным ожиданием.
+        """
+        self.log.info("Проверка успешной авторизации")
+
+        try:
+            result = await self.wait_all({"avatar": "visible"}, timeout="login.avatar")
+            if result.states["avatar"].count > 0:
+                self.log.info("Иконка профиля видима: %s", result.ok)
+                return result.ok
+            self.log.error("Иконка профиля не появилась в DOM")
+
+        except Exception as e:
+            self.log.error("Ошибка при проверке авторизации: %s", e)
+
+        current_url = self.get_current_url()
+        self.log.info("Резервная проверка. Текущий URL: %s", current_url)
+        return self.is_authorized_url(current_url)
@@ -0,0 +1,56 @@
+import asyncio
+import time
+from typing import Optional, Sequence
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from ..network import API_PATTERNS, DEFAULT_QUIET_MS, POLL_MS, NetworkTracker, RequestTiming
+
+
+class NetworkMonitor(NetworkTracker):
+    """Монитор запросов асинхронной страницы (события приходят в цикле asyncio)"""
+
+    async def wait_for_idle(
+        self,
+        include: Sequence[str] = API_PATTERNS,
+        quiet_ms: float = DEFAULT_QUIET_MS,
+        timeout: float = 15000,
+    ) -> float:
+        """Ждать, пока quiet_ms подряд нет запросов в полете, подходящих под include
+
+        Returns:
+            Сколько ждали, мс
+
+        Raises:
+            PlaywrightTimeoutError: Запросы не закончились за timeout
+        """
+        started = time.monotonic()
+        deadline = started + timeout / 1000
+        quiet_since: Optional[float] = None
+        while True:
+            now = time.monotonic()
+            if self.pending(include):
+                quiet_since = None
+            elif quiet_since is None:
+                quiet_since = now
+            elif (now - quiet_since) * 1000 >= quiet_ms:
+                return (now - started) * 1000
+            if now >= deadline:
+                urls = [t.url for t in self.pending(include)]
+                raise PlaywrightTimeoutError(f"Запросы не завершились за {timeout:.0f} мс: {urls}")
+            await asyncio.sleep(POLL_MS / 1000)
+
+    async def wait_for_response(
+        self, pattern: str, since: int = 0, timeout: float = 15000
+    ) -> RequestTiming:
+        """Ждать завершения запроса, подходящего под pattern (начавшегося после отметки since)
+
+        Raises:
+            PlaywrightTimeoutError: Подходящий запрос не завершился за timeout
+        """
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            timing = self._finished_match(pattern, since)
+            if timing is not None:
+                return timing
+            if time.monotonic() >= deadline:
+                raise PlaywrightTimeoutError(f"Нет ответа {pattern} за {timeout:.0f} мс")
+            await asyncio.sleep(POLL_MS / 1000)
@@ -0,0 +1,211 @@
+import asyncio
+import time
+from playwright.async_api import Error as PlaywrightError, Locator, Page
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Set, Union
+from .base_page import BasePage
+from ..core import SearchElements
+from ..courses import EXTRACT_COURSES_SCRIPT, CourseCard, CourseCheck, write_jsonl_async
+from ..locators import SearchLocators
+from ..timeouts import TIMEOUTS
+
+COURSE_CARD_SELECTOR = SearchLocators.COURSE_CARD.value
+
+
+class SearchPage(SearchElements, BasePage):
+    """Асинхронный Page object для страницы результатов поиска Stepik (/catalog/search)"""
+
+    async def get_first_course_card(self) -> Optional[Locator]:
+        """Первая карточка курса (универсально)"""
+        if await self.exists("course_cards"):
+            card: Locator = self.course_cards.first
+            return card
+        return None
+
+    async def iter_courses(
+        self, max_items: Optional[int] = None, batch_size: int = 50, load_timeout: float = 5000
+    ) -> AsyncIterator[CourseCard]:
+        """Лениво выдавать карточки курсов, подгружая результаты по мере чтения
+
+        Каждая партия - один запрос в браузер: скрипт читает до batch_size
+        карточек, а если новых нет - нажимает "Показать еще" или, если пагинации
+        нет, прокручивает ленту. Следующая страница пагинации открывается сразу,
+        как только текущая исчерпана.
+
+        Args:
+            max_items: Остановиться после стольких карточек (None - пока есть результаты)
+            batch_size: Сколько карточек читать за один запрос
+            load_timeout: Сколько ждать подгрузки новых карточек, мс
+        """
+        seen: Set[str] = set()
+        start = 0
+        while max_items is None or len(seen) < max_items:
+            arg = {
+                "selector": COURSE_CARD_SELECTOR,
+                "start": start,
+                "batchSize": batch_size,
+                "waitMs": load_timeout,
+            }
+            with self._measure("extract_courses"):
+                batch = await self.page.evaluate(EXTRACT_COURSES_SCRIPT, arg)
+
+            if batch["cards"]:
+                start += len(batch["cards"])
+                for data in batch["cards"]:
+                    # Карточки могут повторяться на соседних страницах пагинации
+                    if data["url"] in seen:
+                        continue
+                    seen.add(data["url"])
+                    yield CourseCard.from_js(len(seen), data)
+                    if max_items is not None and len(seen) >= max_items:
+                        return
+            elif batch["next_url"]:
+                self.log.info("Переход на следующую страницу результатов", url=batch["next_url"])
+                await self.navigate(batch["next_url"])
+                start = 0
+            else:
+                self.log.info("Результаты поиска закончились", total=len(seen))
+                return
+
+    async def export_courses(self, path: Path, max_items: Optional[int] = None) -> int:
+        """Выгрузить карточки курсов в JSONL потоком и вернуть их число"""
+        written = await write_jsonl_async(self.iter_courses(max_items=max_items), path)
+        self.log.info("Карточки курсов выгружены", path=str(path), count=written)
+        return written
+
+    async def is_loaded(self) -> bool:
+        """Проверка загрузки страницы результатов поиска."""
+        self.log.info("Проверка загрузки страницы результатов")
+
+        current_url = self.get_current_url()
+        is_search_url = "/catalog/search" in current_url
+
+        result = await self.wait_all({"free_filter_button": "visible"}, timeout="search.loaded")
+        is_filter_visible = result.ok
+
+        all_passed = is_search_url and is_filter_visible
+        self.log.info(
+            "Проверка загрузки завершена",
+            is_search_url=is_search_url,
+            is_filter_visible=is_filter_visible,
+            all_passed=all_passed,
+        )
+        return all_passed
+
+    async def apply_free_filter(self) -> "SearchPage":
+        """Применить фильтр 'Бесплатно' и дождаться загрузки контента."""
+        self.log.info("Применение фильтра 'Бесплатно'")
+
+        await self.click(self.free_filter_button, "Фильтр 'Бесплатно'", settle="none")
+        await self._wait_for_filter_applied()
+        await self._wait_for_courses_to_load()
+
+        self.log.info("Фильтр 'Бесплатно' применен", current_url=self.get_current_url())
+        return self
+
+    async def _wait_for_filter_applied(self) -> None:
+        """Ожидание применения фильтра."""
+        self.log.debug("Ожидание применения фильтра")
+
+        with self._measure("wait_for_filter_applied"):
+            await self.wait_for_url("**free=true**", timeout="search.filter_url")
+            with self._timeout("search.filter_api") as timeout:
+                waited = await self.network.wait_for_idle(timeout=timeout)
+
+        self.log.debug("Фильтр успешно применен", api_wait_ms=round(waited))
+
+    async def _wait_for_courses_to_load(self, timeout: Union[float, str] = "search.cards") -> None:
+        """Ожидание загрузки карточек курсов после фильтрации."""
+        self.log.info("Ожидание загрузки карточек курсов...")
+
+        with self._measure("wait_for_courses_to_load"):
+            try:
+                with self._timeout(timeout) as timeout_ms:
+                    await self.page.wait_for_selector(
+                        COURSE_CARD_SELECTOR, state="attached", timeout=timeout_ms
+                    )
+                with self._timeout("search.cards_visible") as timeout_ms:
+                    await self.page.wait_for_selector(
+                        COURSE_CARD_SELECTOR, state="visible", timeout=timeout_ms
+                    )
+
+            except Exception as e:
+                self.log.error("Ошибка при ожидании карточек курсов: %s", e)
+                await self.take_screenshot("courses_not_loaded")
+                raise
+
+        cards_count = await self.count("course_cards")
+        self.log.info("Карточки курсов загружены. Найдено: %s", cards_count)
+
+    async def open_first_course(self) -> Page:
+        """Открыть первую карточку курса в новой вкладке и вернуть страницу."""
+        self.log.info("Открытие первого курса")
+
+        if not await self.exists("course_cards"):
+            self.log.error("Нет доступных курсов для открытия")
+            raise ValueError("На странице нет карточек курсов")
+
+        first_card = self.course_cards.first
+        with self._timeout("search.first_card") as timeout:
+            await first_card.wait_for(state="visible", timeout=timeout)
+
+        url_before = self.get_current_url()
+        self.log.info("URL до клика: %s", url_before)
+
+        async with self.page.context.expect_page() as new_page_info:
+            await self.click(first_card, "Первая карточка курса", settle="none")
+
+        new_page = await new_page_info.value
+        with self._timeout("search.course_tab") as timeout:
+            await new_page.wait_for_load_state("domcontentloaded", timeout=timeout)
+
+        self.log.info("Курс открыт в новой вкладке: %s", new_page.url)
+        return new_page
+
+    async def open_courses(
+        self, n: int, max_parallel: int = 4, timeout: Union[float, str] = "search.course_page"
+    ) -> List[CourseCheck]:
+        """Открыть первые n курсов во вкладках параллельно и проверить их заголовки
+
+        Не больше max_parallel вкладок одновременно; каждая закрывается сразу
+        после проверки. Результаты - в порядке выдачи. timeout - мс или ключ
+        политики TIMEOUTS (успешные проверки пополняют его историю).
+        """
+        cards = [card async for card in self.iter_courses(max_items=n)]
+        if not cards:
+            raise ValueError("На странице нет карточек курсов")
+        self.log.info("Параллельная проверка курсов", count=len(cards), max_parallel=max_parallel)
+        semaphore = asyncio.Semaphore(max(1, max_parallel))
+        timeout_ms = self._timeout_ms(timeout)
+
+        async def check(card: CourseCard) -> CourseCheck:
+            async with semaphore:
+                tab = await self.page.context.new_page()
+                try:
+                    response = await tab.goto(card.url, wait_until="commit", timeout=timeout_ms)
+                    status = response.status if response is not None else 0
+                    if status >= 400:
+                        return CourseCheck(card, ok=False, status=status, error=f"HTTP {status}")
+                    started = time.monotonic()
+                    header = tab.locator("h1").first
+                    await header.wait_for(state="visible", timeout=timeout_ms)
+                    text = (await header.inner_text()).strip()
+                except PlaywrightError as e:
+                    return CourseCheck(card, ok=False, error=str(e))
+                finally:
+                    await tab.close()
+                elapsed_ms = (time.monotonic() - started) * 1000
+                ok = bool(text) and 0 < status < 400
+                error = "" if ok else "Пустой заголовок или ошибка"
+                return CourseCheck(card, ok, status, text, elapsed_ms, error)
+
+        with self._measure("open_courses"):
+            results = await asyncio.gather(*(check(card) for card in cards))
+
+        if isinstance(timeout, str):
+            for result in results:
+                if result.ok:
+                    TIMEOUTS.observe(timeout, result.elapsed_ms, self.base_url)
+        failed = [result.card.url for result in results if not result.ok]
+        self.log.info("Курсы проверены", checked=len(results), failed=failed)
+        return list(results)
@@ -1,25 +1,25 @@
-import structlog
 import os
-from playwright.sync_api import Page, Locator, Response
-from typing import Optional
+import time
+from playwright.sync_api import Error as PlaywrightError, Page, Locator, Response
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from typing import Mapping, Optional, Union
+from utils.artifacts import get_artifact_writer
+from .core import PageCore
+from .network import NetworkMonitor
+from .probe import PROBE_SCRIPT, Condition, ProbeResult
+from .settle import DOM_QUIET_SCRIPT, SETTLE_CONFIG, SettleStrategy, record_settle
+from .timeouts import TIMEOUTS
 
-logger = structlog.get_logger(__name__)
 
-
-class BasePage:
+class BasePage(PageCore):
     """Базовый класс для всех страниц с логгированием"""
 
-    def __init__(self, page: Page, timeout: float = 30000) -> None:
-        """Инициализация страницы
+    page: Page
 
-        Args:
-            page (Page): Экземпляр страницы Playwright
-            timeout (float, optional): Таймаут ожидания по умолчанию. Defaults to 30000
-        """
-        self.page = page
-        self.timeout = timeout
-        self.log = logger.bind(page_url=self.page.url)
-        self.log.info("Инициализирована страница", timeout=timeout)
+    @property
+    def network(self) -> NetworkMonitor:
+        """Монитор запросов страницы (подключается при первом обращении)"""
+        return NetworkMonitor.for_page(self.page)
 
     def _wait_for_all_requests(self) -> None:
         """
@@ -37,22 +37,82 @@ class BasePage:
         """
         self.log.info("Навигация по URL", url=url)
         # ИСПРАВЛЕНО: domcontentloaded вместо networkidle для CI
-        response = self.page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
+        with (
+            self._measure("navigate", self._url_path(url)),
+            self._timeout(self._navigation_timeout) as timeout,
+        ):
+            response = self.page.goto(url, wait_until="domcontentloaded", timeout=timeout)
         return response
 
-    def click(self, locator: Locator, element_description: str) -> None:
+    def click(
+        self, locator: Locator, element_description: str, settle: Optional[str] = None
+    ) -> None:
         """Клик по элементу с логированием
 
         Args:
             locator : Локатор playwright
             element_description (str): Человекочитаемое описание элемента для логов
+            settle (str, optional): Стратегия ожидания после клика: "none", "dom-quiet",
+                "url-change" или "response:<glob>". Defaults to SETTLE_CONFIG.strategy
         """
-        self.log.info(f"Клик по элементу: {element_description}")
-        locator.click(timeout=self.timeout)
-        # ИСПРАВЛЕНО: Не ждем networkidle после клика (SPA не перезагружает страницу полностью)
-        # Просто даем небольшую паузу для стабильности в CI (500мс)
-        self.page.wait_for_timeout(500)
-        self.log.info(f"Успешный клик: {element_description}", current_url=self.page.url)
+        strategy = SettleStrategy.parse(settle or SETTLE_CONFIG.strategy)
+        self.log.info(
+            "Клик по элементу: %s", element_description, settle=str(strategy), action_phase="start"
+        )
+
+        # Не ждем networkidle после клика (SPA не перезагружает страницу полностью),
+        # вместо фиксированной паузы ждем событие, означающее что страница обновилась
+        with self._measure("click", element_description):
+            if strategy.kind == "response" and strategy.pattern is not None:
+                with self.page.expect_response(strategy.pattern, timeout=self.timeout):
+                    with self._timeout() as timeout:
+                        locator.click(timeout=timeout)
+                    started = time.perf_counter()
+            else:
+                url_before = self.page.url
+                with self._timeout() as timeout:
+                    locator.click(timeout=timeout)
+                started = time.perf_counter()
+                self._settle(strategy, url_before)
+
+        waited_ms = record_settle(strategy, started)
+        self.log.info(
+            "Успешный клик: %s",
+            element_description,
+            current_url=self.page.url,
+            settle_ms=round(waited_ms),
+            action_phase="done",
+        )
+
+    def _settle(self, strategy: SettleStrategy, url_before: str) -> None:
+        """
+        Дождаться стабилизации страницы после действия
+
+        :param strategy: Стратегия ожидания ("response" обрабатывается в click)
+        :param url_before: URL до действия (для стратегии "url-change")
+        """
+        if strategy.kind == "dom-quiet":
+            try:
+                result = self.page.evaluate(
+                    DOM_QUIET_SCRIPT, [SETTLE_CONFIG.quiet_ms, SETTLE_CONFIG.cap_ms]
+                )
+            except Exception as e:
+                # Клик запустил полную навигацию - контекст выполнения уничтожен
+                self.log.debug("DOM-ожидание прервано навигацией", error=str(e))
+                self.page.wait_for_load_state("domcontentloaded", timeout=self.timeout)
+                return
+            if not result["settled"]:
+                self.log.debug("DOM не успокоился за отведенное время", cap_ms=SETTLE_CONFIG.cap_ms)
+
+        elif strategy.kind == "url-change":
+            try:
+                self.page.wait_for_url(
+                    lambda url: url != url_before,
+                    timeout=SETTLE_CONFIG.cap_ms,
+                    wait_until="commit",
+                )
+            except PlaywrightTimeoutError:
+                self.log.debug("URL не изменился после клика", url=url_before)
 
     def fill(self, locator: Locator, text: str, element_description: str) -> None:
         """Заполнение поля с логированием
@@ -63,42 +123,112 @@ class BasePage:
             element_description: Описание поля
         """
         self.log.info(
-            f"Заполняю поле: {element_description}",
-            text=text[:10] + "..." if len(text) > 10 else text,
+            "Заполняю поле: %s", element_description, text=self._mask(text), action_phase="start"
         )
 
-        locator.fill(text, timeout=self.timeout)
-        self.log.info(f"Поле заполнено: {element_description}")
+        with self._measure("fill", element_description):
+            with self._timeout() as timeout:
+                locator.fill(text, timeout=timeout)
+        self.log.info("Поле заполнено: %s", element_description, action_phase="done")
 
-    def get_current_url(self) -> str:
-        """
-        Получить текущий URL с логированием
-
-        :return: URL страницы
-        """
-        url = self.page.url
-        self.log.debug("Текущий URL", url=url)
-        return url
-
-    def wait_for_url(self, url_pattern: str, timeout: Optional[float] = None) -> None:
+    def wait_for_url(self, url_pattern: str, timeout: Union[float, str, None] = None) -> None:
         """
         Ожидание перехода на URL по паттерну
 
         :param url_pattern: Паттерн URL для ожидания (может быть частью URL)
-        :param timeout: Кастомный таймаут (если None, используется self.timeout)
+        :param timeout: Таймаут в мс или ключ политики TIMEOUTS
+            (если None, используется self.timeout)
         """
-        timeout = self.timeout if timeout is None else timeout
-        self.log.info("Ожидание URL", pattern=url_pattern)
+        self.log.info("Ожидание URL", pattern=url_pattern, action_phase="start")
 
         try:
-            self.page.wait_for_url(url_pattern, timeout=timeout)
-            self.log.info("URL обнаружен", pattern=url_pattern, current_url=self.page.url)
+            with self._measure("wait_for_url", url_pattern), self._timeout(timeout) as timeout:
+                self.page.wait_for_url(url_pattern, timeout=timeout)
+            self.log.info(
+                "URL обнаружен",
+                pattern=url_pattern,
+                current_url=self.page.url,
+                action_phase="done",
+            )
         except Exception as e:
             self.log.error(
                 "URL не обнаружен", pattern=url_pattern, current_url=self.page.url, error=str(e)
             )
             raise
 
+    def count(self, name: str) -> int:
+        """
+        Число элементов по имени из реестра (кэшируется до следующего действия)
+
+        :param name: Имя элемента, например "course_cards"
+        """
+        cached = self._cached_count(name)
+        if cached is not None:
+            return cached
+        return self._store_count(name, getattr(self, name).count())
+
+    def exists(self, name: str) -> bool:
+        """Есть ли на странице хотя бы один элемент с таким именем"""
+        return self.count(name) > 0
+
+    def probe(self, conditions: Mapping[str, Union[str, Condition]]) -> ProbeResult:
+        """Проверить состояние нескольких элементов одним запросом в браузер
+
+        Args:
+            conditions: Имя элемента из реестра страницы -> условие:
+                "attached", "visible", "text" (непустой текст) или "count>=N"
+        """
+        data = self.page.evaluate(PROBE_SCRIPT, self._probe_arg(conditions, 0, 0))
+        result = ProbeResult.from_js(data)
+        self.log.debug("Проверка элементов", ok=result.ok, failed=result.failed)
+        return result
+
+    def wait_all(
+        self,
+        conditions: Mapping[str, Union[str, Condition]],
+        timeout: Union[float, str, None] = None,
+        interval: float = 100,
+    ) -> ProbeResult:
+        """Дождаться выполнения всех условий (опрос идет внутри страницы)
+
+        Все условия проверяются вместе на каждом такте опроса, поэтому ожидание
+        стоит один запрос в браузер (плюс по одному на каждую полную навигацию).
+        По таймауту исключение не бросается: результат содержит последнее состояние.
+
+        Args:
+            conditions: Условия, как в probe()
+            timeout: Сколько ждать, мс, или ключ политики TIMEOUTS
+                (если None, используется self.timeout)
+            interval: Период опроса, мс
+        """
+        key = timeout if isinstance(timeout, str) else None
+        deadline = time.perf_counter() + self._timeout_ms(timeout) / 1000
+        with self._measure("wait_all", ", ".join(conditions)):
+            while True:
+                remaining = max(0.0, (deadline - time.perf_counter()) * 1000)
+                arg = self._probe_arg(conditions, remaining, interval)
+                try:
+                    data = self.page.evaluate(PROBE_SCRIPT, arg)
+                    break
+                except PlaywrightError as e:
+                    if remaining <= 0:
+                        raise
+                    # Полная навигация уничтожила контекст - ждем новый документ
+                    self.log.debug("Опрос элементов прерван навигацией", error=str(e))
+                    self.page.wait_for_load_state("domcontentloaded", timeout=remaining)
+
+        result = ProbeResult.from_js(data)
+        if key is not None and result.ok:
+            TIMEOUTS.observe(key, result.elapsed_ms, self.base_url)
+        self.log.info(
+            "Ожидание элементов завершено",
+            ok=result.ok,
+            failed=result.failed,
+            polls=result.polls,
+            elapsed_ms=round(result.elapsed_ms),
+        )
+        return result
+
     def is_element_visible(self, locator: Locator, element_description: str) -> bool:
         """
         Проверка видимости элемента
@@ -109,13 +239,20 @@ class BasePage:
         """
         try:
             is_visible = locator.is_visible(timeout=5000)
-            self.log.debug(f"Видимость элемента '{element_description}'", is_visible=is_visible)
+            self.log.debug("Видимость элемента '%s'", element_description, is_visible=is_visible)
             return is_visible
         except Exception as e:
-            self.log.debug(f"Элемент '{element_description}' не найден", error=str(e))
+            self.log.debug("Элемент '%s' не найден", element_description, error=str(e))
             return False
 
     def take_screenshot(self, name: str) -> None:
+        """Скриншот страницы: в pytest - через фоновый писатель артефактов теста"""
+        writer = get_artifact_writer()
+        if writer is not None:
+            path = writer.capture(self.page, name)
+            self.log.info("Скриншот поставлен в очередь записи", path=str(path))
+            return
+
         screenshot_path = f"screenshots/{name}.png"
         os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
         self.page.screenshot(path=screenshot_path)
@@ -3,33 +3,36 @@ import allure
 from playwright.sync_api import Locator
 from typing import Optional
 from .base_page import BasePage
+from .core import CatalogElements
 
 logger = structlog.get_logger(__name__)
 
 
-class CatalogPage(BasePage):
+class CatalogPage(CatalogElements, BasePage):
     """Page Object для главной страницы каталога Stepik (/catalog)"""
 
-    @property
-    def search_input(self) -> Locator:
-        """Поле поиска на главной странице"""
-        return self.page.get_by_placeholder("Название курса, автор или предмет")
-
     @property
     def search_button(self) -> Optional[Locator]:
         """Кнопка поиска (если есть)"""
-
-        buttons = self.page.get_by_role("button", name="Искать")
-        if buttons.count() > 0:
-            return buttons.first
+        if self.exists("search_buttons"):
+            button: Locator = self.search_buttons.first
+            return button
         return None
 
+    def open(self) -> "CatalogPage":
+        """Открыть главную страницу каталога"""
+        self.navigate(self.catalog_url)
+        with self._timeout("catalog.search_input") as timeout:
+            self.search_input.wait_for(state="visible", timeout=timeout)
+        return self
+
     def is_loaded(self) -> bool:
         """Проверка, что главная страница загрузилась"""
 
         self.log.info("Проверка загрузки главной страницы")
 
-        is_search_visible = self.is_element_visible(self.search_input, "Поисковая старока")
+        # Одна проверка в браузере вместо отдельного запроса на каждый элемент
+        is_search_visible = self.wait_all({"search_input": "visible"}, timeout="catalog.loaded").ok
         is_catalog_url = "/catalog" in self.get_current_url()
 
         self.log.info(
@@ -53,11 +56,11 @@ class CatalogPage(BasePage):
         self.fill(self.search_input, query, "Поисковая строка")
         self.search_input.press("Enter")
 
-        self.wait_for_url(f"**/catalog/search*", timeout=30000)
-        self.wait_for_url(f"**q={query}*", timeout=15000)
+        self.wait_for_url("**/catalog/search*", timeout="catalog.results_url")
+        self.wait_for_url(f"**q={query}*", timeout="catalog.query_url")
 
         self.log.info("Поиск выполнен", query=query, current_url=self.get_current_url())
 
         from .search_page import SearchPage
 
-        return SearchPage(self.page)
+        return SearchPage(self.page, self.explicit_timeout, self.base_url)
@@ -0,0 +1,200 @@
+"""Общая часть sync (``pages``) и async (``pages.aio``) page objects.
+
+Здесь живет все, что не требует ожидания браузера: состояние страницы,
+логгер, разбор URL и построение локаторов. Действия (клики, ожидания)
+реализованы отдельно в каждом API, но пишут в общий логгер одни и те же
+события.
+"""
+
+import structlog
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Mapping, Optional, Union
+from urllib.parse import urlsplit
+from utils.metrics import ACTION_METRICS
+from utils.timeline import TIMELINE
+from .elements import ELEMENT_STATS, Element, element_registry
+from .probe import Condition, build_probe_arg
+from .timeouts import TIMEOUTS
+from .locators import SITE, CatalogLocators, LoginLocators, SearchLocators, catalog_url, login_url
+
+logger = structlog.get_logger("pages")
+
+
+@lru_cache(maxsize=None)
+def _class_logger(page_class: str) -> Any:
+    """Логгер, привязанный к классу страницы (один на класс, а не на экземпляр)"""
+    return logger.bind(page=page_class)
+
+
+class PageCore:
+    """Состояние и логирование page object, общие для sync и async API"""
+
+    def __init__(
+        self, page: Any, timeout: Optional[float] = None, base_url: Optional[str] = None
+    ) -> None:
+        """Инициализация страницы
+
+        Args:
+            page: Экземпляр страницы Playwright (sync или async)
+            timeout (float, optional): Таймаут ожидания по умолчанию.
+                Defaults to таймаут "page.action" из политики TIMEOUTS
+            base_url (str, optional): Адрес сайта. Defaults to SITE.base_url
+        """
+        self.page = page
+        self.explicit_timeout = timeout
+        self.base_url = (base_url or SITE.base_url).rstrip("/")
+        self.log = _class_logger(type(self).__name__)
+        self._element_counts: Dict[str, int] = {}
+        self.log.debug("Инициализирована страница", page_url=self.page.url, timeout=self.timeout)
+
+    @property
+    def timeout(self) -> float:
+        """Таймаут действий: заданный явно или выученный политикой TIMEOUTS"""
+        if self.explicit_timeout is not None:
+            return self.explicit_timeout
+        return TIMEOUTS.timeout("page.action", self.base_url)
+
+    @property
+    def _navigation_timeout(self) -> Union[float, str]:
+        return "page.navigation" if self.explicit_timeout is None else self.explicit_timeout
+
+    @contextmanager
+    def _timeout(self, timeout: Union[float, str, None] = None) -> Iterator[float]:
+        """Таймаут ожидания в мс: число, именованный ключ политики TIMEOUTS или None
+
+        None - таймаут страницы: заданный явно или ключ "page.action". Для ключа
+        длительность успешного ожидания записывается в историю политики.
+        """
+        if timeout is None:
+            timeout = "page.action" if self.explicit_timeout is None else self.explicit_timeout
+        if isinstance(timeout, str):
+            with TIMEOUTS.wait(timeout, self.base_url) as timeout_ms:
+                yield timeout_ms
+        else:
+            yield timeout
+
+    def _timeout_ms(self, timeout: Union[float, str, None] = None) -> float:
+        """Таймаут в мс без записи в историю (ожидание само решает, удалось ли оно)"""
+        if timeout is None:
+            return self.timeout
+        if isinstance(timeout, str):
+            return TIMEOUTS.timeout(timeout, self.base_url)
+        return timeout
+
+    @property
+    def catalog_url(self) -> str:
+        return catalog_url(self.base_url)
+
+    @property
+    def login_url(self) -> str:
+        return login_url(self.base_url)
+
+    def get_current_url(self) -> str:
+        """
+        Получить текущий URL с логированием
+
+        :return: URL страницы
+        """
+        url: str = self.page.url
+        self.log.debug("Текущий URL", url=url)
+        return url
+
+    @staticmethod
+    def _url_path(url: str) -> str:
+        """Путь URL без запроса и фрагмента: метка метрики навигации
+
+        С полным URL гистограммы дробились бы по каждому поисковому запросу.
+        """
+        return urlsplit(url).path or "/"
+
+    @contextmanager
+    def _measure(self, action: str, element: str = "") -> Iterator[None]:
+        """Замерить длительность действия или ожидания (в том числе неудачного)
+
+        Работает и вокруг ``await``: время считается до выхода из блока.
+
+        Args:
+            action: Имя действия ("click", "wait_for_url", ...)
+            element: Описание элемента или паттерн, по которому ждем
+        """
+        page_class = type(self).__name__
+        started = time.perf_counter()
+        ok = False
+        try:
+            with TIMELINE.span(
+                f"{page_class}.{action}", "action", element=element, url=self.page.url
+            ):
+                yield
+            ok = True
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            ACTION_METRICS.record(page_class, action, element, duration_ms, ok)
+            # Действие или ожидание могло изменить DOM
+            self.refresh_elements()
+
+    @classmethod
+    def elements(cls) -> Dict[str, Element]:
+        """Реестр элементов страницы: имя атрибута -> Element"""
+        return element_registry(cls)
+
+    def refresh_elements(self) -> None:
+        """Сбросить закэшированные count() (после навигации, действий или вручную)"""
+        self._element_counts.clear()
+
+    def _probe_arg(
+        self, conditions: Mapping[str, Union[str, Condition]], timeout: float, interval: float
+    ) -> dict:
+        """Аргумент скрипта probe по условиям для элементов из реестра страницы"""
+        registry = self.elements()
+        unknown = [name for name in conditions if name not in registry]
+        if unknown:
+            raise ValueError(f"{type(self).__name__}: неизвестные элементы {unknown}")
+        specs = {name: registry[name].spec for name in conditions}
+        return build_probe_arg(specs, conditions, timeout, interval)
+
+    def _cached_count(self, name: str) -> Optional[int]:
+        """Число элементов из кэша или None, если нужно спросить браузер"""
+        count = self._element_counts.get(name)
+        if count is not None:
+            ELEMENT_STATS.hit()
+        return count
+
+    def _store_count(self, name: str, count: int) -> int:
+        ELEMENT_STATS.miss()
+        self._element_counts[name] = count
+        return count
+
+    @staticmethod
+    def _mask(text: str, visible: int = 10) -> str:
+        """Обрезать значение для логов"""
+        return text[:visible] + "..." if len(text) > visible else text
+
+
+class LoginElements:
+    """Элементы страницы авторизации"""
+
+    email_field = Element(LoginLocators.EMAIL_FIELD, "Поле email")
+    password_field = Element(LoginLocators.PASSWORD_FIELD, "Поле пароля")
+    submit_button = Element(LoginLocators.SUBMIT_BUTTON, "Кнопка 'Войти'")
+    avatar = Element(LoginLocators.AVATAR, "Иконка профиля")
+
+    @staticmethod
+    def is_authorized_url(url: str) -> bool:
+        """Мы на каталоге и не на форме входа"""
+        return "/catalog" in url and "auth=login" not in url
+
+
+class CatalogElements:
+    """Элементы главной страницы каталога"""
+
+    search_input = Element(CatalogLocators.SEARCH_INPUT, "Поле поиска")
+    search_buttons = Element(CatalogLocators.SEARCH_BUTTON, "Кнопка поиска")
+
+
+class SearchElements:
+    """Элементы страницы результатов поиска"""
+
+    free_filter_button = Element(SearchLocators.FREE_FILTER_BUTTON, "Фильтр 'Бесплатно'")
+    course_cards = Element(SearchLocators.COURSE_CARD, "Карточки курсов")
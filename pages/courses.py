@@ -0,0 +1,152 @@
+"""Пакетное извлечение карточек курсов со страницы результатов поиска.
+
+Один вызов ``EXTRACT_COURSES_SCRIPT`` возвращает до ``batchSize`` карточек,
+начиная с ``start``. Если новых карточек на странице нет, скрипт нажимает
+"Показать еще" и ждет подгрузки. У страницы пагинации (есть ссылка на
+следующую или предыдущую страницу) он сразу сообщает ссылку на следующую -
+по ней переходит уже Python-код; ждать подгрузки после прокрутки имеет смысл
+только у ленты без пагинации (бесконечная прокрутка).
+"""
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import AsyncIterable, Iterable, Mapping, Optional
+
+# Аргумент: {selector, start, batchSize, waitMs}
+EXTRACT_COURSES_SCRIPT = """
+async ({ selector, start, batchSize, waitMs }) => {
+    const text = (root, query) => {
+        const el = root.querySelector(query);
+        return el ? el.textContent.replace(/\\s+/g, ' ').trim() : '';
+    };
+    const cards = () => document.querySelectorAll(selector);
+    const waitForMore = (known) => new Promise((resolve) => {
+        const deadline = performance.now() + waitMs;
+        const tick = () => {
+            if (cards().length > known || performance.now() > deadline) return resolve();
+            setTimeout(tick, 100);
+        };
+        tick();
+    });
+
+    const nextLink = () =>
+        document.querySelector('a[rel="next"], .pagination a[aria-label*="ледующ"]');
+    const paginated = () => nextLink() !== null
+        || document.querySelector('a[rel="prev"], .pagination') !== null;
+
+    if (cards().length <= start) {
+        const more = Array.from(document.querySelectorAll('button, a'))
+            .find((el) => /показать ещ|загрузить ещ|show more/i.test(el.textContent));
+        if (more) {
+            more.click();
+            await waitForMore(start);
+        } else if (!paginated()) {
+            window.scrollTo(0, document.documentElement.scrollHeight);
+            await waitForMore(start);
+        }
+    }
+
+    const all = cards();
+    const batch = Array.from(all).slice(start, start + batchSize).map((link) => {
+        const card = link.closest('.catalog-rich-card') || link;
+        const priced = card.querySelector('[class*="price"]') !== null;
+        const price = text(card, '[class*="price"]');
+        return {
+            title: text(card, '[class*="title"]') || link.textContent.trim().split('\\n')[0],
+            url: link.href,
+            price,
+            // Без элемента цены бесплатность неизвестна
+            is_free: priced ? /бесплатн|free/i.test(price) : null,
+            author: text(card, '[class*="author"]'),
+        };
+    });
+    const next = nextLink();
+    return { cards: batch, total: all.length, next_url: next ? next.href : null };
+}
+"""
+
+
+@dataclass(frozen=True)
+class CourseCard:
+    """Данные карточки курса из результатов поиска
+
+    ``is_free`` равен None, если на карточке нет цены: такой курс не считается
+    ни бесплатным, ни платным.
+    """
+
+    position: int
+    title: str
+    url: str
+    is_free: Optional[bool]
+    price: str = ""
+    author: str = ""
+
+    @classmethod
+    def from_js(cls, position: int, data: Mapping) -> "CourseCard":
+        return cls(
+            position=position,
+            title=data["title"],
+            url=data["url"],
+            is_free=None if data["is_free"] is None else bool(data["is_free"]),
+            price=data.get("price", ""),
+            author=data.get("author", ""),
+        )
+
+
+@dataclass(frozen=True)
+class CourseCheck:
+    """Результат проверки страницы курса из ``SearchPage.open_courses``
+
+    Attributes:
+        card: Проверенная карточка
+        ok: Страница ответила без ошибки и показала непустой заголовок h1
+        status: HTTP-статус ответа (0 - ответа нет)
+        header: Текст h1
+        elapsed_ms: От начала ответа (и проверки вкладки) до готовности заголовка
+        error: Текст ошибки, если проверка не прошла
+    """
+
+    card: CourseCard
+    ok: bool
+    status: int = 0
+    header: str = ""
+    elapsed_ms: float = 0.0
+    error: str = ""
+
+
+def write_jsonl(cards: Iterable[CourseCard], path: Path, limit: Optional[int] = None) -> int:
+    """Записать карточки в JSONL по мере поступления (итератор не материализуется)
+
+    Args:
+        cards: Карточки, например ``search_page.iter_courses()``
+        path: Файл для записи
+        limit: Остановиться после стольких карточек
+
+    Returns:
+        Число записанных карточек
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for card in cards:
+            f.write(json.dumps(asdict(card), ensure_ascii=False) + "\n")
+            written += 1
+            if limit is not None and written >= limit:
+                break
+    return written
+
+
+async def write_jsonl_async(
+    cards: AsyncIterable[CourseCard], path: Path, limit: Optional[int] = None
+) -> int:
+    """То же, что write_jsonl, для асинхронного итератора (``pages.aio``)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        async for card in cards:
+            f.write(json.dumps(asdict(card), ensure_ascii=False) + "\n")
+            written += 1
+            if limit is not None and written >= limit:
+                break
+    return written
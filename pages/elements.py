@@ -0,0 +1,83 @@
+"""Декларативные элементы страниц.
+
+Элемент описывается один раз на классе::
+
+    class SearchElements:
+        course_cards = Element(SearchLocators.COURSE_CARD, "Карточки курсов")
+
+Locator строится при первом обращении и запоминается в экземпляре страницы
+(Playwright-локатор ленивый и переживает навигацию, поэтому пересоздавать его
+не нужно). Число найденных элементов - это уже запрос в браузер, поэтому
+``BasePage.count()`` кэширует его до конца следующего действия или ожидания
+(включая навигацию) либо до явного ``refresh_elements()``; сэкономленные
+запросы считает ``ELEMENT_STATS``.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+from .locators import LocatorSpec
+
+
+class Element:
+    """Дескриптор элемента страницы, построенный по LocatorSpec"""
+
+    def __init__(self, spec: LocatorSpec, description: str = "") -> None:
+        """
+        Args:
+            spec: Описание локатора из pages/locators.py
+            description: Человекочитаемое описание для логов
+        """
+        self.spec = spec
+        self.description = description
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        if not self.description:
+            self.description = name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        # Дескриптор без __set__: после записи в __dict__ следующие обращения
+        # к атрибуту идут мимо него и ничего не стоят
+        locator = self.spec.resolve(instance.page)
+        instance.__dict__[self.name] = locator
+        return locator
+
+
+def element_registry(page_class: type) -> Dict[str, Element]:
+    """Все элементы класса страницы с учетом миксинов и наследования"""
+    registry: Dict[str, Element] = {}
+    for klass in reversed(page_class.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, Element):
+                registry[name] = value
+    return registry
+
+
+class ElementCacheStats:
+    """Попадания и промахи кэша count() в текущем тесте"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def take(self) -> Dict[str, int]:
+        """Вернуть счетчики и обнулить их (вызывается на границах тестов)"""
+        with self._lock:
+            values = {"hits": self.hits, "misses": self.misses}
+            self.hits = self.misses = 0
+        return values
+
+
+ELEMENT_STATS = ElementCacheStats()
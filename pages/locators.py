@@ -0,0 +1,93 @@
+"""Общие определения адресов и локаторов для sync и async page objects.
+
+Создание локатора в Playwright синхронное в обоих API, поэтому одна и та же
+спецификация разрешается и для ``playwright.sync_api.Page``, и для
+``playwright.async_api.Page``. Классы в ``pages`` и ``pages.aio`` берут
+локаторы только отсюда, чтобы определения не расходились.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+DEFAULT_BASE_URL = "https://stepik.org"
+CATALOG_URL = f"{DEFAULT_BASE_URL}/catalog"
+LOGIN_URL = f"{CATALOG_URL}?auth=login"
+
+
+@dataclass
+class SiteConfig:
+    """Адрес тестируемого сайта (по умолчанию боевой Stepik)
+
+    Меняется через ``--base-url`` в pytest или явно для нагрузочного прогона
+    на стенде; page object может получить и свой ``base_url``.
+    """
+
+    base_url: str = DEFAULT_BASE_URL
+
+
+SITE = SiteConfig()
+
+
+def configure_site(base_url: str) -> None:
+    """Задать адрес сайта для всех page objects, созданных без base_url"""
+    SITE.base_url = base_url.rstrip("/")
+
+
+def catalog_url(base_url: Optional[str] = None) -> str:
+    return f"{(base_url or SITE.base_url).rstrip('/')}/catalog"
+
+
+def login_url(base_url: Optional[str] = None) -> str:
+    return f"{catalog_url(base_url)}?auth=login"
+
+
+@dataclass(frozen=True)
+class LocatorSpec:
+    """Декларативное описание локатора
+
+    Attributes:
+        kind: Способ поиска: "css", "role" или "placeholder"
+        value: CSS-селектор, ARIA-роль или текст плейсхолдера
+        name: Доступное имя элемента (только для kind="role")
+    """
+
+    kind: str
+    value: str
+    name: Optional[str] = None
+
+    def resolve(self, page: Any) -> Any:
+        """Построить Locator для sync или async страницы"""
+        if self.kind == "role":
+            return page.get_by_role(self.value, name=self.name)
+        if self.kind == "placeholder":
+            return page.get_by_placeholder(self.value)
+        return page.locator(self.value)
+
+
+def css(selector: str) -> LocatorSpec:
+    return LocatorSpec("css", selector)
+
+
+def role(aria_role: str, name: str) -> LocatorSpec:
+    return LocatorSpec("role", aria_role, name)
+
+
+def placeholder(text: str) -> LocatorSpec:
+    return LocatorSpec("placeholder", text)
+
+
+class LoginLocators:
+    EMAIL_FIELD = role("textbox", "E-mail")
+    PASSWORD_FIELD = role("textbox", "Пароль")
+    SUBMIT_BUTTON = role("button", "Войти")
+    AVATAR = css('img.navbar__profile-img[alt="User avatar"]')
+
+
+class CatalogLocators:
+    SEARCH_INPUT = placeholder("Название курса, автор или предмет")
+    SEARCH_BUTTON = role("button", "Искать")
+
+
+class SearchLocators:
+    FREE_FILTER_BUTTON = role("button", "Бесплатно")
+    COURSE_CARD = css("a.catalog-rich-card__link-wrapper")
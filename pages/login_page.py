@@ -1,34 +1,25 @@
 import structlog
 import allure
+from typing import Union
 from .base_page import BasePage
-from playwright.sync_api import Locator
-
+from .core import LoginElements
+from .locators import LoginLocators
 
 logger = structlog.get_logger(__name__)
 
+AVATAR_SELECTOR = LoginLocators.AVATAR.value
 
-class LoginPage(BasePage):
-    """Page Object для страницы авторизации Stepik (/login)"""
-
-    @property
-    def email_field(self) -> Locator:
-        return self.page.get_by_role("textbox", name="E-mail")
 
-    @property
-    def password_field(self) -> Locator:
-        return self.page.get_by_role("textbox", name="Пароль")
-
-    @property
-    def submit_button(self) -> Locator:
-        return self.page.get_by_role("button", name="Войти")
+class LoginPage(LoginElements, BasePage):
+    """Page Object для страницы авторизации Stepik (/login)"""
 
     def open(self) -> "LoginPage":
         """Открыть страницу авторизации"""
         self.log.info("Открытие страницы авторизации")
-        login_url = "https://stepik.org/catalog?auth=login"
-        self.navigate(login_url)
+        self.navigate(self.login_url)
 
-        self.email_field.wait_for(state="visible", timeout=15000)
+        with self._timeout("login.form") as timeout:
+            self.email_field.wait_for(state="visible", timeout=timeout)
         self.log.info("Страница авторизации загружена")
         return self
 
@@ -43,7 +34,8 @@ class LoginPage(BasePage):
         return self
 
     def submit_login(self):
-        self.click(self.submit_button, "Кнопка войти")
+        # Ответ сервера и редирект ждет вызывающий код (login)
+        self.click(self.submit_button, "Кнопка войти", settle="none")
 
     @allure.step("Авторизация пользователя {email}")
     def login(self, email: str, password: str) -> None:
@@ -56,25 +48,31 @@ class LoginPage(BasePage):
         self.enter_password(password)
 
         # 2. Отправляем форму и ждем завершения запроса на сервер
-        # (playwright ждет ответа сервера, а не просто клика)
-        with self.page.expect_response("**/auth/**", timeout=10000) as response_info:
-            self.submit_login()
-
-        response = response_info.value
-        self.log.info("Получен ответ авторизации", status=response.status)
+        # (монитор ждет ответа сервера, а не просто клика)
+        since = self.network.mark()
+        self.submit_login()
+
+        with self._timeout("login.auth_response") as timeout:
+            auth = self.network.wait_for_response("*/auth/*", since=since, timeout=timeout)
+        self.log.info(
+            "Получен ответ авторизации",
+            status=auth.status,
+            duration_ms=round(auth.duration_ms or 0),
+        )
 
         # 3. Ждем редиректа на каталог (не более 10 сек)
         try:
-            self.page.wait_for_url("**/catalog*", timeout=10000)
+            with self._timeout("login.redirect") as timeout:
+                self.page.wait_for_url("**/catalog*", timeout=timeout)
         except Exception:
             self.log.info("Не дождались редайректа")
 
         # 4. Проверяем финальный URL
         current_url = self.get_current_url()
-        self.log.info(f"URL после авторизации: {current_url}")
+        self.log.info("URL после авторизации: %s", current_url)
 
         # Если мы на catalog без auth=login - успех
-        if "/catalog" in current_url and "auth=login" not in current_url:
+        if self.is_authorized_url(current_url):
             self.log.info("Авторизация успешна")
             return
 
@@ -85,6 +83,36 @@ class LoginPage(BasePage):
 
         self.log.info("Авторизация завершена", final_url=current_url)
 
+    def has_session_cookies(self) -> bool:
+        """Есть ли в контексте cookies Stepik (без обращения к странице)"""
+        return len(self.page.context.cookies(self.catalog_url)) > 0
+
+    def is_session_active(self, timeout: Union[float, str] = "login.session_check") -> bool:
+        """
+        Открыть каталог и проверить, что пользователь уже авторизован.
+
+        :param timeout: Сколько ждать иконку профиля, мс, или ключ политики TIMEOUTS
+        """
+        self.navigate(self.catalog_url)
+        try:
+            with self._timeout(timeout) as timeout_ms:
+                self.page.wait_for_selector(AVATAR_SELECTOR, state="attached", timeout=timeout_ms)
+        except Exception:
+            self.log.info("Активная сессия не обнаружена")
+            return False
+        self.log.info("Обнаружена активная сессия")
+        return True
+
+    @allure.step("Проверка или восстановление сессии {email}")
+    def ensure_logged_in(self, email: str, password: str) -> None:
+        """Авторизоваться, только если контекст не содержит действительной сессии."""
+        # Без cookies проверять сессию бессмысленно - сразу идем на форму входа
+        if self.has_session_cookies() and self.is_session_active():
+            self.log.info("Сессия восстановлена из кэша, вход не требуется")
+            return
+
+        self.login(email, password)
+
     def is_login_successful(self) -> bool:
         """
         Проверка успешной авторизации по иконке профиля с явным ожиданием.
@@ -92,26 +120,19 @@ class LoginPage(BasePage):
         self.log.info("Проверка успешной авторизации")
 
         try:
-            # 1. Явно дождаться появления элемента в DOM
-            avatar_locator = 'img.navbar__profile-img[alt="User avatar"]'
-            self.page.wait_for_selector(avatar_locator, state="attached", timeout=10000)
-            self.log.debug("Локатор иконки профиля найден в DOM")
-
-            # 2. Проверить видимость элемента
-            avatar = self.page.locator(avatar_locator)
-            is_visible = avatar.is_visible(timeout=5000)
-
-            self.log.info(f"Иконка профиля видима: {is_visible}")
-            return is_visible
+            # Появление в DOM и видимость проверяются одним опросом внутри страницы
+            result = self.wait_all({"avatar": "visible"}, timeout="login.avatar")
+            if result.states["avatar"].count > 0:
+                self.log.info("Иконка профиля видима: %s", result.ok)
+                return result.ok
+            self.log.error("Иконка профиля не появилась в DOM")
 
         except Exception as e:
-            # Если элемент не найден или не видим
-            self.log.error(f"Ошибка при проверке авторизации: {e}")
+            self.log.error("Ошибка при проверке авторизации: %s", e)
 
-            # Резервная проверка по URL
-            current_url = self.get_current_url()
-            self.log.info(f"Резервная проверка. Текущий URL: {current_url}")
+        # Резервная проверка по URL
+        current_url = self.get_current_url()
+        self.log.info("Резервная проверка. Текущий URL: %s", current_url)
 
-            # Критерий успеха: мы на /catalog и НЕ на странице логина
-            url_check = "/catalog" in current_url and "auth=login" not in current_url
-            return url_check
+        # Критерий успеха: мы на /catalog и НЕ на странице логина
+        return self.is_authorized_url(current_url)
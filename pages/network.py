@@ -0,0 +1,210 @@
+"""Учет сетевых запросов страницы вместо ``wait_for_load_state("networkidle")``.
+
+``networkidle`` ждет 500 мс без единого запроса, а на каталоге Stepik всегда
+что-то летит: аналитика, long-polling, счетчики. Монитор подписывается на
+события запросов страницы и знает, какие из них еще в полете, поэтому можно
+ждать только нужное: "пока не завершатся запросы к API каталога" или "до
+ответа, подходящего под паттерн". Длительность каждого запроса сохраняется.
+
+Монитор один на страницу Playwright (``NetworkMonitor.for_page``): его
+подключают фикстуры ``page``, чтобы в учет попали и запросы, начавшиеся до
+первого обращения page object.
+"""
+
+import bisect
+import fnmatch
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Type, TypeVar, cast
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+# Запросы к API каталога и авторизации Stepik
+API_PATTERNS = ("*/api/*",)
+
+# Аналитика и фоновые соединения, которые никогда не "успокаиваются"
+IGNORED_PATTERNS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*mc.yandex.ru*",
+    "*/longpoll*",
+    "*/ws/*",
+)
+
+# Сколько мс подряд не должно быть подходящих запросов, чтобы считать сеть спокойной
+DEFAULT_QUIET_MS = 100
+POLL_MS = 25
+
+T = TypeVar("T", bound="NetworkTracker")
+
+
+@dataclass
+class RequestTiming:
+    """Один запрос страницы
+
+    Attributes:
+        url: Адрес запроса
+        method: HTTP-метод
+        resource_type: Тип ресурса Playwright (document, xhr, fetch, ...)
+        started: time.monotonic() начала
+        finished: time.monotonic() завершения или None, пока запрос в полете
+        status: HTTP-статус ответа (0 - ответа нет)
+        failed: Запрос завершился ошибкой сети
+        seq: Порядковый номер запроса на странице (для отметок ``mark()``)
+    """
+
+    url: str
+    method: str
+    resource_type: str
+    started: float
+    finished: Optional[float] = None
+    status: int = 0
+    failed: bool = False
+    seq: int = 0
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.finished is None:
+            return None
+        return (self.finished - self.started) * 1000
+
+
+def _matches(url: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns)
+
+
+class NetworkTracker:
+    """Состояние запросов страницы, общее для sync и async мониторов"""
+
+    _monitors: "weakref.WeakKeyDictionary[Any, NetworkTracker]"
+
+    def __init__(self, page: Any, ignored: Sequence[str] = IGNORED_PATTERNS) -> None:
+        self.page = page
+        self.ignored = tuple(ignored)
+        self._timings: Dict[Any, RequestTiming] = {}
+        self._order: List[RequestTiming] = []
+        self._next_seq = 0
+        page.on("request", self._on_request)
+        page.on("response", self._on_response)
+        page.on("requestfinished", self._on_finished)
+        page.on("requestfailed", self._on_failed)
+
+    @classmethod
+    def for_page(cls: Type[T], page: Any) -> T:
+        """Монитор страницы: созданный ранее или новый"""
+        if "_monitors" not in cls.__dict__:
+            cls._monitors = weakref.WeakKeyDictionary()
+        monitor = cls._monitors.get(page)
+        if monitor is None:
+            monitor = cls._monitors[page] = cls(page)
+        # У каждого класса свой словарь мониторов, поэтому в нем только экземпляры cls
+        return cast(T, monitor)
+
+    def _on_request(self, request) -> None:
+        if _matches(request.url, self.ignored):
+            return
+        timing = RequestTiming(
+            request.url, request.method, request.resource_type, time.monotonic(), seq=self._next_seq
+        )
+        self._next_seq += 1
+        self._timings[request] = timing
+        self._order.append(timing)
+
+    def _on_response(self, response) -> None:
+        timing = self._timings.get(response.request)
+        if timing is not None:
+            timing.status = response.status
+
+    def _on_finished(self, request) -> None:
+        timing = self._timings.pop(request, None)
+        if timing is not None:
+            timing.finished = time.monotonic()
+
+    def _on_failed(self, request) -> None:
+        timing = self._timings.pop(request, None)
+        if timing is not None:
+            timing.finished = time.monotonic()
+            timing.failed = True
+
+    def mark(self) -> int:
+        """Отметка "с этого момента" для wait_for_response и timings (переживает clear())"""
+        return self._next_seq
+
+    def _since(self, since: int) -> List[RequestTiming]:
+        """Запросы, начавшиеся после отметки since (_order упорядочен по seq)"""
+        start = bisect.bisect_left(self._order, since, key=lambda t: t.seq)
+        return self._order[start:]
+
+    def pending(self, include: Sequence[str] = API_PATTERNS) -> List[RequestTiming]:
+        """Запросы в полете, подходящие под include"""
+        return [t for t in self._timings.values() if _matches(t.url, include)]
+
+    def timings(self, include: Sequence[str] = ("*",), since: int = 0) -> List[RequestTiming]:
+        """Все запросы (в том числе незавершенные) с отметки since, подходящие под include"""
+        return [t for t in self._since(since) if _matches(t.url, include)]
+
+    def _finished_match(self, pattern: str, since: int) -> Optional[RequestTiming]:
+        for timing in self._since(since):
+            if timing.finished is not None and fnmatch.fnmatchcase(timing.url, pattern):
+                return timing
+        return None
+
+    def clear(self) -> None:
+        """Забыть завершенные запросы (незавершенные остаются в учете)"""
+        self._order = [t for t in self._order if t.finished is None]
+
+
+class NetworkMonitor(NetworkTracker):
+    """Монитор запросов sync-страницы
+
+    События sync API доставляются, только пока поток находится внутри вызова
+    Playwright, поэтому ожидания опрашивают состояние через короткие
+    ``page.wait_for_timeout``.
+    """
+
+    def wait_for_idle(
+        self,
+        include: Sequence[str] = API_PATTERNS,
+        quiet_ms: float = DEFAULT_QUIET_MS,
+        timeout: float = 15000,
+    ) -> float:
+        """Ждать, пока quiet_ms подряд нет запросов в полете, подходящих под include
+
+        Returns:
+            Сколько ждали, мс
+
+        Raises:
+            PlaywrightTimeoutError: Запросы не закончились за timeout
+        """
+        started = time.monotonic()
+        deadline = started + timeout / 1000
+        quiet_since: Optional[float] = None
+        while True:
+            now = time.monotonic()
+            if self.pending(include):
+                quiet_since = None
+            elif quiet_since is None:
+                quiet_since = now
+            elif (now - quiet_since) * 1000 >= quiet_ms:
+                return (now - started) * 1000
+            if now >= deadline:
+                urls = [t.url for t in self.pending(include)]
+                raise PlaywrightTimeoutError(f"Запросы не завершились за {timeout:.0f} мс: {urls}")
+            self.page.wait_for_timeout(POLL_MS)
+
+    def wait_for_response(
+        self, pattern: str, since: int = 0, timeout: float = 15000
+    ) -> RequestTiming:
+        """Ждать завершения запроса, подходящего под pattern (начавшегося после отметки since)
+
+        Raises:
+            PlaywrightTimeoutError: Подходящий запрос не завершился за timeout
+        """
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            timing = self._finished_match(pattern, since)
+            if timing is not None:
+                return timing
+            if time.monotonic() >= deadline:
+                raise PlaywrightTimeoutError(f"Нет ответа {pattern} за {timeout:.0f} мс")
+            self.page.wait_for_timeout(POLL_MS)
@@ -0,0 +1,183 @@
+"""Проверка состояния нескольких элементов за один запрос в браузер.
+
+``BasePage.probe()`` и ``BasePage.wait_all()`` передают в страницу сразу все
+условия; скрипт находит элементы по тем же ``LocatorSpec``, что и
+Playwright-локаторы, и на каждом такте опроса проверяет все условия вместе.
+Для ``role`` и ``placeholder`` используется упрощенный аналог движка
+Playwright (неявные роли распространенных элементов, доступное имя из
+aria-label/label/текста, поиск подстроки без учета регистра) - для проверок
+загрузки этого достаточно, точные действия по-прежнему идут через Locator.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Union
+from .locators import LocatorSpec
+
+CONDITION_RE = re.compile(r"^(attached|visible|text|count\s*>=\s*(\d+))$")
+
+# Аргумент: {elements: [{key, kind, value, name, state, min}], timeout, interval}
+# timeout=0 - одна проверка без ожидания
+PROBE_SCRIPT = """
+async ({ elements, timeout, interval }) => {
+    const IMPLICIT_ROLES = {
+        button: 'button, input[type=button], input[type=submit], input[type=reset]',
+        link: 'a[href]',
+        textbox: 'textarea, input:not([type]), input[type=text], input[type=email],'
+            + ' input[type=password], input[type=tel], input[type=url]',
+        searchbox: 'input[type=search]',
+        checkbox: 'input[type=checkbox]',
+        heading: 'h1, h2, h3, h4, h5, h6',
+        img: 'img[alt]:not([alt=""])',
+    };
+    const norm = (text) => (text || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+    const accessibleName = (el) => {
+        const label = el.getAttribute('aria-label');
+        if (label) return label;
+        const labelledBy = el.getAttribute('aria-labelledby');
+        if (labelledBy) {
+            return labelledBy.split(/\\s+/)
+                .map((id) => (document.getElementById(id) || {}).textContent || '').join(' ');
+        }
+        if (el.labels && el.labels.length) {
+            return Array.from(el.labels).map((l) => l.textContent).join(' ');
+        }
+        if (el.tagName === 'INPUT' && ['button', 'submit', 'reset'].includes(el.type)) {
+            return el.value;
+        }
+        return el.textContent || el.getAttribute('placeholder') || el.getAttribute('title') || '';
+    };
+    const query = ({ kind, value, name }) => {
+        if (kind === 'css') return Array.from(document.querySelectorAll(value));
+        if (kind === 'placeholder') {
+            return Array.from(document.querySelectorAll('[placeholder]'))
+                .filter((el) => norm(el.getAttribute('placeholder')).includes(norm(value)));
+        }
+        const implicit = IMPLICIT_ROLES[value];
+        const selector = `[role="${value}"]` + (implicit ? `, ${implicit}` : '');
+        return Array.from(document.querySelectorAll(selector)).filter((el) => {
+            const explicit = el.getAttribute('role');
+            if (explicit && explicit !== value) return false;
+            return !name || norm(accessibleName(el)).includes(norm(name));
+        });
+    };
+    const isVisible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0
+            && getComputedStyle(el).visibility !== 'hidden';
+    };
+    const check = () => {
+        let ok = true;
+        const states = {};
+        for (const spec of elements) {
+            const found = query(spec);
+            const visible = found.filter(isVisible).length;
+            const hasText = found.some((el) => norm(el.innerText || el.value).length > 0);
+            let passed = found.length > 0;
+            if (spec.state === 'visible') passed = visible > 0;
+            if (spec.state === 'text') passed = hasText;
+            if (spec.state === 'count') passed = found.length >= spec.min;
+            states[spec.key] = { count: found.length, visible, has_text: hasText, ok: passed };
+            ok = ok && passed;
+        }
+        return { ok, states };
+    };
+    const started = performance.now();
+    let polls = 0;
+    while (true) {
+        const result = check();
+        polls += 1;
+        const elapsed = performance.now() - started;
+        if (result.ok || elapsed + interval > timeout) {
+            return { ...result, polls, elapsed };
+        }
+        await new Promise((resolve) => setTimeout(resolve, interval));
+    }
+}
+"""
+
+
+@dataclass(frozen=True)
+class Condition:
+    """Условие для элемента: "attached", "visible", "text" или "count>=N" """
+
+    state: str
+    min_count: int = 1
+
+    @classmethod
+    def parse(cls, spec: str) -> "Condition":
+        match = CONDITION_RE.match(spec.strip())
+        if not match:
+            raise ValueError(f"Неизвестное условие: {spec!r}")
+        if match.group(2) is not None:
+            return cls("count", int(match.group(2)))
+        return cls(match.group(1))
+
+
+@dataclass(frozen=True)
+class ElementState:
+    """Состояние элемента на момент последней проверки"""
+
+    count: int
+    visible: int
+    has_text: bool
+    ok: bool
+
+
+@dataclass
+class ProbeResult:
+    """Результат probe()/wait_all(): состояния элементов и выполнены ли все условия"""
+
+    ok: bool
+    states: Dict[str, ElementState] = field(default_factory=dict)
+    polls: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def failed(self) -> List[str]:
+        """Элементы, условия для которых не выполнены"""
+        return [key for key, state in self.states.items() if not state.ok]
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    @classmethod
+    def from_js(cls, data: Mapping) -> "ProbeResult":
+        return cls(
+            ok=bool(data["ok"]),
+            states={key: ElementState(**state) for key, state in data["states"].items()},
+            polls=int(data.get("polls", 0)),
+            elapsed_ms=float(data.get("elapsed", 0.0)),
+        )
+
+
+def build_probe_arg(
+    specs: Mapping[str, LocatorSpec],
+    conditions: Mapping[str, Union[str, Condition]],
+    timeout: float,
+    interval: float,
+) -> dict:
+    """Аргумент PROBE_SCRIPT для набора условий
+
+    Args:
+        specs: Локаторы по ключам условий
+        conditions: Условия по тем же ключам
+        timeout: Сколько ждать выполнения всех условий, мс (0 - без ожидания)
+        interval: Период опроса, мс
+    """
+    elements = []
+    for key, condition in conditions.items():
+        if isinstance(condition, str):
+            condition = Condition.parse(condition)
+        spec = specs[key]
+        elements.append(
+            {
+                "key": key,
+                "kind": spec.kind,
+                "value": spec.value,
+                "name": spec.name,
+                "state": condition.state,
+                "min": condition.min_count,
+            }
+        )
+    return {"elements": elements, "timeout": timeout, "interval": interval}
@@ -1,32 +1,83 @@
+import time
 import structlog
 import allure
-from playwright.sync_api import Locator, Page
-from typing import Optional
+from collections import deque
+from playwright.sync_api import Error as PlaywrightError, Locator, Page, Response
+from pathlib import Path
+from typing import Deque, Iterator, List, Optional, Set, Tuple, Union
 from .base_page import BasePage
+from .core import SearchElements
+from .courses import EXTRACT_COURSES_SCRIPT, CourseCard, CourseCheck, write_jsonl
+from .locators import SearchLocators
+from .timeouts import TIMEOUTS
 
 logger = structlog.get_logger(__name__)
 
+COURSE_CARD_SELECTOR = SearchLocators.COURSE_CARD.value
 
-class SearchPage(BasePage):
-    """Page object для страницы результатов поиска Stepik (/catalog/search)"""
-
-    @property
-    def free_filter_button(self) -> Locator:
-        """Кнопка фильтра 'Бесплатно' в сайдбаре"""
-        return self.page.get_by_role("button", name="Бесплатно")
 
-    @property
-    def course_cards(self) -> Locator:
-        """Все карточки курсов"""
-        return self.page.locator("a.catalog-rich-card__link-wrapper")
+class SearchPage(SearchElements, BasePage):
+    """Page object для страницы результатов поиска Stepik (/catalog/search)"""
 
     @property
     def first_course_card(self) -> Optional[Locator]:
         """Первая карточка курса (универсально)"""
-        if self.course_cards.count() > 0:
-            return self.course_cards.first
+        if self.exists("course_cards"):
+            card: Locator = self.course_cards.first
+            return card
         return None
 
+    def iter_courses(
+        self, max_items: Optional[int] = None, batch_size: int = 50, load_timeout: float = 5000
+    ) -> Iterator[CourseCard]:
+        """Лениво выдавать карточки курсов, подгружая результаты по мере чтения
+
+        Каждая партия - один запрос в браузер: скрипт читает до batch_size
+        карточек, а если новых нет - нажимает "Показать еще" или, если пагинации
+        нет, прокручивает ленту. Следующая страница пагинации открывается сразу,
+        как только текущая исчерпана.
+
+        Args:
+            max_items: Остановиться после стольких карточек (None - пока есть результаты)
+            batch_size: Сколько карточек читать за один запрос
+            load_timeout: Сколько ждать подгрузки новых карточек, мс
+        """
+        seen: Set[str] = set()
+        start = 0
+        while max_items is None or len(seen) < max_items:
+            arg = {
+                "selector": COURSE_CARD_SELECTOR,
+                "start": start,
+                "batchSize": batch_size,
+                "waitMs": load_timeout,
+            }
+            with self._measure("extract_courses"):
+                batch = self.page.evaluate(EXTRACT_COURSES_SCRIPT, arg)
+
+            if batch["cards"]:
+                start += len(batch["cards"])
+                for data in batch["cards"]:
+                    # Карточки могут повторяться на соседних страницах пагинации
+                    if data["url"] in seen:
+                        continue
+                    seen.add(data["url"])
+                    yield CourseCard.from_js(len(seen), data)
+                    if max_items is not None and len(seen) >= max_items:
+                        return
+            elif batch["next_url"]:
+                self.log.info("Переход на следующую страницу результатов", url=batch["next_url"])
+                self.navigate(batch["next_url"])
+                start = 0
+            else:
+                self.log.info("Результаты поиска закончились", total=len(seen))
+                return
+
+    def export_courses(self, path: Path, max_items: Optional[int] = None) -> int:
+        """Выгрузить карточки курсов в JSONL потоком и вернуть их число"""
+        written = write_jsonl(self.iter_courses(max_items=max_items), path)
+        self.log.info("Карточки курсов выгружены", path=str(path), count=written)
+        return written
+
     def is_loaded(self) -> bool:
         """Проверка загрузки страницы результатов поиска."""
         self.log.info("Проверка загрузки страницы результатов")
@@ -34,7 +85,9 @@ class SearchPage(BasePage):
         current_url = self.get_current_url()
         is_search_url = "/catalog/search" in current_url
 
-        is_filter_visible = self.is_element_visible(self.free_filter_button, "Фильтр 'Бесплатно'")
+        is_filter_visible = self.wait_all(
+            {"free_filter_button": "visible"}, timeout="search.loaded"
+        ).ok
 
         all_passed = is_search_url and is_filter_visible
         self.log.info(
@@ -50,8 +103,8 @@ class SearchPage(BasePage):
         """Применить фильтр 'Бесплатно' и дождаться загрузки контента."""
         self.log.info("Применение фильтра 'Бесплатно'")
 
-        # Кликаем на фильтр
-        self.click(self.free_filter_button, "Фильтр 'Бесплатно'")
+        # Кликаем на фильтр (дальше явно ждем URL и карточки)
+        self.click(self.free_filter_button, "Фильтр 'Бесплатно'", settle="none")
 
         # Ожидаем применения фильтра (динамическая загрузка)
         self._wait_for_filter_applied()
@@ -67,40 +120,47 @@ class SearchPage(BasePage):
         """Ожидание применения фильтра."""
         self.log.debug("Ожидание применения фильтра")
 
-        # Ждем обновления URL
-        self.wait_for_url("**free=true**", timeout=15000)
+        with self._measure("wait_for_filter_applied"):
+            # Ждем обновления URL
+            self.wait_for_url("**free=true**", timeout="search.filter_url")
 
-        self.page.wait_for_load_state("networkidle")
+            # Ждем только запросы к API каталога: аналитика и long-polling
+            # не дают networkidle наступить вовремя
+            with self._timeout("search.filter_api") as timeout:
+                waited = self.network.wait_for_idle(timeout=timeout)
 
-        self.log.debug("Фильтр успешно применен")
+        self.log.debug("Фильтр успешно применен", api_wait_ms=round(waited))
 
-    def _wait_for_courses_to_load(self, timeout: int = 15000) -> None:
+    def _wait_for_courses_to_load(self, timeout: Union[float, str] = "search.cards") -> None:
         """Ожидание загрузки карточек курсов после фильтрации."""
         self.log.info("Ожидание загрузки карточек курсов...")
 
-        try:
-            # Ждем появления хотя бы одной карточки
-            self.page.wait_for_selector(
-                "a.catalog-rich-card__link-wrapper",
-                state="attached",
-                timeout=timeout,
-            )
-
-            # Дополнительно: ждем, пока карточки станут видимыми
-            self.page.wait_for_selector(
-                "a.catalog-rich-card__link-wrapper",
-                state="visible",
-                timeout=5000,
-            )
-
-            # Проверяем, что карточек больше 0
-            cards_count = self.course_cards.count()
-            self.log.info(f"Карточки курсов загружены. Найдено: {cards_count}")
-
-        except Exception as e:
-            self.log.error(f"Ошибка при ожидании карточек курсов: {e}")
-            self.take_screenshot("courses_not_loaded")
-            raise
+        with self._measure("wait_for_courses_to_load"):
+            try:
+                # Ждем появления хотя бы одной карточки
+                with self._timeout(timeout) as timeout_ms:
+                    self.page.wait_for_selector(
+                        COURSE_CARD_SELECTOR,
+                        state="attached",
+                        timeout=timeout_ms,
+                    )
+
+                # Дополнительно: ждем, пока карточки станут видимыми
+                with self._timeout("search.cards_visible") as timeout_ms:
+                    self.page.wait_for_selector(
+                        COURSE_CARD_SELECTOR,
+                        state="visible",
+                        timeout=timeout_ms,
+                    )
+
+            except Exception as e:
+                self.log.error("Ошибка при ожидании карточек курсов: %s", e)
+                self.take_screenshot("courses_not_loaded")
+                raise
+
+        # Число карточек кэшируется до следующего действия (пригодится open_first_course)
+        cards_count = self.count("course_cards")
+        self.log.info("Карточки курсов загружены. Найдено: %s", cards_count)
 
     @allure.step("Открытие первой карточки курса")
     def open_first_course(self) -> Page:
@@ -108,28 +168,110 @@ class SearchPage(BasePage):
         self.log.info("Открытие первого курса")
 
         # 1. Проверяем наличие карточек перед кликом
-        cards = self.page.locator("a.catalog-rich-card__link-wrapper")
-        if cards.count() == 0:
+        if not self.exists("course_cards"):
             self.log.error("Нет доступных курсов для открытия")
             raise ValueError("На странице нет карточек курсов")
 
         # 2. Берем первую карточку и ждем её видимости
-        first_card = cards.first
-        first_card.wait_for(state="visible", timeout=10000)
+        first_card = self.course_cards.first
+        with self._timeout("search.first_card") as timeout:
+            first_card.wait_for(state="visible", timeout=timeout)
 
         # 3. Запоминаем текущий URL (для логов)
         url_before = self.get_current_url()
-        self.log.info(f"URL до клика: {url_before}")
+        self.log.info("URL до клика: %s", url_before)
 
         # 4. Кликаем с ожиданием новой вкладки (target="_blank")
         with self.page.context.expect_page() as new_page_info:
-            self.click(first_card, "Первая карточка курса")
+            self.click(first_card, "Первая карточка курса", settle="none")
 
         # 5. Получаем новую страницу и ждем загрузки
         new_page = new_page_info.value
-        new_page.wait_for_load_state("domcontentloaded", timeout=10000)
+        with self._timeout("search.course_tab") as timeout:
+            new_page.wait_for_load_state("domcontentloaded", timeout=timeout)
 
-        self.log.info(f"Курс открыт в новой вкладке: {new_page.url}")
+        self.log.info("Курс открыт в новой вкладке: %s", new_page.url)
 
         # Возвращаем новую страницу для дальнейших проверок
         return new_page
+
+    @allure.step("Проверка {n} первых курсов")
+    def open_courses(
+        self, n: int, max_parallel: int = 4, timeout: Union[float, str] = "search.course_page"
+    ) -> List[CourseCheck]:
+        """Открыть первые n курсов во вкладках параллельно и проверить их заголовки
+
+        Вкладки открываются сразу по ссылкам карточек, без клика и ожидания
+        popup. Переход ждет только начала ответа (``wait_until="commit"``),
+        поэтому до max_parallel страниц грузятся в браузере одновременно, а
+        проверяются по очереди. Проверенная вкладка сразу закрывается, и ее
+        место занимает следующий курс: открыто не больше max_parallel вкладок.
+
+        Args:
+            n: Сколько курсов проверить
+            max_parallel: Сколько вкладок держать открытыми одновременно
+            timeout: Ожидание ответа и заголовка каждой страницы, мс, или ключ
+                политики TIMEOUTS (успешные проверки пополняют его историю)
+
+        Returns:
+            Результаты по каждому курсу в порядке выдачи
+        """
+        cards: Deque[CourseCard] = deque(self.iter_courses(max_items=n))
+        if not cards:
+            raise ValueError("На странице нет карточек курсов")
+        self.log.info("Параллельная проверка курсов", count=len(cards), max_parallel=max_parallel)
+        timeout_ms = self._timeout_ms(timeout)
+
+        results: List[CourseCheck] = []
+        window: Deque[Tuple[CourseCard, Page, Optional[Response]]] = deque()
+        with self._measure("open_courses"):
+            while cards or window:
+                while cards and len(window) < max(1, max_parallel):
+                    card = cards.popleft()
+                    tab = self.page.context.new_page()
+                    try:
+                        response = tab.goto(card.url, wait_until="commit", timeout=timeout_ms)
+                    except PlaywrightError as e:
+                        results.append(CourseCheck(card, ok=False, error=str(e)))
+                        tab.close()
+                        continue
+                    window.append((card, tab, response))
+                if window:
+                    card, tab, response = window.popleft()
+                    try:
+                        results.append(self._check_course(card, tab, response, timeout_ms))
+                    finally:
+                        tab.close()
+
+        if isinstance(timeout, str):
+            for check in results:
+                if check.ok:
+                    TIMEOUTS.observe(timeout, check.elapsed_ms, self.base_url)
+        failed = [check.card.url for check in results if not check.ok]
+        self.log.info("Курсы проверены", checked=len(results), failed=failed)
+        return sorted(results, key=lambda check: check.card.position)
+
+    @staticmethod
+    def _check_course(
+        card: CourseCard, tab: Page, response: Optional[Response], timeout: float
+    ) -> CourseCheck:
+        """Дождаться заголовка h1 на вкладке курса
+
+        Время считается от начала проверки: пока вкладка ждала в очереди за
+        соседними, она грузилась параллельно, и это ожидание - не ее задержка.
+        """
+        status = response.status if response is not None else 0
+        if status >= 400:
+            return CourseCheck(card, ok=False, status=status, error=f"HTTP {status}")
+        started = time.monotonic()
+        try:
+            header = tab.locator("h1").first
+            header.wait_for(state="visible", timeout=timeout)
+            text = header.inner_text().strip()
+        except PlaywrightError as e:
+            return CourseCheck(card, ok=False, status=status, error=str(e))
+        elapsed_ms = (time.monotonic() - started) * 1000
+        ok = bool(text) and 0 < status < 400
+        return CourseCheck(
+            card, ok, status, text, elapsed_ms, "" if ok else "Пустой заголовок или ошибка"
+        )
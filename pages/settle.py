@@ -0,0 +1,102 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+from utils.session_stats import SESSION_STATS
+
+# Фиксированная пауза, которую BasePage.click делал раньше после каждого клика.
+# Относительно нее считается сэкономленное время.
+LEGACY_CLICK_PAUSE_MS = 500
+
+# Ждем, пока DOM не будет меняться quietMs подряд, но не дольше capMs
+DOM_QUIET_SCRIPT = """
+([quietMs, capMs]) => new Promise((resolve) => {
+    const started = performance.now();
+    let quietTimer = null;
+    let capTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quietMs);
+    });
+    const finish = (settled) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(capTimer);
+        resolve({ settled, elapsed: performance.now() - started });
+    };
+    observer.observe(document, {
+        subtree: true, childList: true, attributes: true, characterData: true,
+    });
+    quietTimer = setTimeout(() => finish(true), quietMs);
+    capTimer = setTimeout(() => finish(false), capMs);
+})
+"""
+
+SETTLE_KINDS = ("none", "dom-quiet", "url-change", "response")
+
+
+@dataclass(frozen=True)
+class SettleStrategy:
+    """Стратегия ожидания стабилизации страницы после действия
+
+    Задается строкой: ``"none"``, ``"dom-quiet"``, ``"url-change"``
+    или ``"response:<glob>"`` (например ``"response:**/api/courses**"``).
+    """
+
+    kind: str
+    pattern: Optional[str] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "SettleStrategy":
+        kind, _, pattern = spec.partition(":")
+        if kind not in SETTLE_KINDS:
+            raise ValueError(f"Неизвестная стратегия ожидания: {spec!r}")
+        if kind == "response" and not pattern:
+            raise ValueError("Для стратегии 'response' нужен паттерн: 'response:<glob>'")
+        return cls(kind=kind, pattern=pattern or None)
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.pattern}" if self.pattern else self.kind
+
+
+@dataclass
+class SettleConfig:
+    """Настройки ожидания по умолчанию для всех page objects"""
+
+    strategy: str = "dom-quiet"
+    quiet_ms: int = 150
+    cap_ms: int = 3000
+
+
+SETTLE_CONFIG = SettleConfig()
+
+
+def configure_settle(
+    strategy: Optional[str] = None,
+    quiet_ms: Optional[int] = None,
+    cap_ms: Optional[int] = None,
+) -> None:
+    """Переопределить настройки ожидания (вызывается из conftest по CLI-опциям)"""
+    if strategy is not None:
+        SettleStrategy.parse(strategy)
+        SETTLE_CONFIG.strategy = strategy
+    if quiet_ms is not None:
+        SETTLE_CONFIG.quiet_ms = quiet_ms
+    if cap_ms is not None:
+        SETTLE_CONFIG.cap_ms = cap_ms
+
+
+def record_settle(strategy: SettleStrategy, started: float) -> float:
+    """Записать время ожидания после клика и экономию относительно паузы 500 мс
+
+    :param strategy: Использованная стратегия
+    :param started: Момент окончания клика (time.perf_counter())
+    :return: Время ожидания в миллисекундах
+    """
+    waited_ms = (time.perf_counter() - started) * 1000
+    SESSION_STATS.add(
+        f"settle[{strategy.kind}]",
+        clicks=1,
+        waited_ms=waited_ms,
+        saved_ms=LEGACY_CLICK_PAUSE_MS - waited_ms,
+    )
+    return waited_ms
@@ -0,0 +1,256 @@
+import json
+import math
+import os
+import threading
+import time
+import structlog
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Mapping, Optional
+from urllib.parse import urlsplit
+from utils.session_stats import SESSION_STATS
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_HISTORY_PATH = Path(".e2e-cache") / "timeouts.json"
+TIMEOUT_MODES = ("adaptive", "fixed")
+
+# Локальный стенд поднимается на случайном порту: все его запуски - один сайт
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+@dataclass(frozen=True)
+class TimeoutRule:
+    """Таймаут именованного ожидания
+
+    Attributes:
+        default_ms: Таймаут, пока истории ожидания недостаточно (и в режиме "fixed")
+        floor_ms: Нижняя граница выученного таймаута
+        ceiling_ms: Верхняя граница выученного таймаута
+    """
+
+    default_ms: float
+    floor_ms: float
+    ceiling_ms: float
+
+
+# Именованные ожидания page objects. Ключ - "страница.ожидание"
+TIMEOUT_RULES: Dict[str, TimeoutRule] = {
+    "page.action": TimeoutRule(30000, 5000, 60000),
+    "page.navigation": TimeoutRule(30000, 10000, 60000),
+    "login.form": TimeoutRule(15000, 3000, 30000),
+    "login.auth_response": TimeoutRule(10000, 3000, 20000),
+    "login.redirect": TimeoutRule(10000, 3000, 20000),
+    "login.avatar": TimeoutRule(10000, 2000, 20000),
+    "login.session_check": TimeoutRule(5000, 1500, 10000),
+    "catalog.search_input": TimeoutRule(15000, 3000, 30000),
+    "catalog.loaded": TimeoutRule(5000, 1500, 10000),
+    "catalog.results_url": TimeoutRule(30000, 5000, 60000),
+    "catalog.query_url": TimeoutRule(15000, 3000, 30000),
+    "search.loaded": TimeoutRule(5000, 1500, 10000),
+    "search.filter_url": TimeoutRule(15000, 3000, 30000),
+    "search.filter_api": TimeoutRule(15000, 3000, 30000),
+    "search.cards": TimeoutRule(15000, 3000, 30000),
+    "search.cards_visible": TimeoutRule(5000, 1500, 10000),
+    "search.first_card": TimeoutRule(10000, 2000, 20000),
+    "search.course_tab": TimeoutRule(10000, 3000, 20000),
+    "search.course_page": TimeoutRule(15000, 3000, 30000),
+}
+
+
+def timeout_scope(base_url: str) -> str:
+    """Ключ истории ожиданий для сайта: схема и хост без пути
+
+    Порт учитывается только у внешних сайтов: локальный стенд на любом
+    порту (и адрес loopback) сводится к одному ключу.
+    """
+    parts = urlsplit(base_url)
+    host = parts.hostname or ""
+    if host in LOOPBACK_HOSTS:
+        return f"{parts.scheme}://localhost"
+    return f"{parts.scheme}://{parts.netloc}" if parts.netloc else base_url.rstrip("/")
+
+
+class TimeoutPolicy:
+    """Таймауты ожиданий, выученные по задержкам прошлых прогонов
+
+    Для каждого ключа хранится скользящее окно длительностей успешных
+    ожиданий отдельно по сайту (timeout_scope от base_url страницы): стенд
+    и боевой Stepik не смешиваются. Таймаут - перцентиль окна, умноженный на
+    запас, в границах правила. Пока замеров меньше min_samples, используется
+    таймаут по умолчанию. Неудачные ожидания в историю не попадают: иначе
+    таймауты росли бы от каждого падения. При ``enabled = False`` замеры не
+    записываются (нагрузка, бенчмарки, воспроизведение HAR).
+    """
+
+    def __init__(
+        self,
+        rules: Mapping[str, TimeoutRule] = TIMEOUT_RULES,
+        mode: str = "adaptive",
+        quantile: float = 95,
+        safety: float = 3.0,
+        window: int = 50,
+        min_samples: int = 5,
+    ) -> None:
+        self.rules = dict(rules)
+        self.mode = mode
+        self.quantile = quantile
+        self.safety = safety
+        self.window = window
+        self.min_samples = min_samples
+        self.enabled = True
+        self.scope = ""
+        self._history: Dict[str, Dict[str, List[float]]] = {}
+        self._samples: Dict[str, Dict[str, Deque[float]]] = {}
+        self._new: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+        self._lock = threading.Lock()
+
+    def rule(self, key: str) -> TimeoutRule:
+        try:
+            return self.rules[key]
+        except KeyError:
+            raise ValueError(f"Неизвестный ключ таймаута: {key!r}") from None
+
+    def _extend_window(
+        self, windows: Dict[str, List[float]], key: str, values: List[float]
+    ) -> None:
+        """Дописать замеры в окно ключа, оставив последние self.window"""
+        window = windows.get(key, []) + values
+        start = max(0, len(window) - self.window)
+        windows[key] = window[start:]
+
+    def _scope(self, scope: Optional[str]) -> str:
+        """Ключ истории: сайт страницы или сайт прогона, если он не задан"""
+        return self.scope if scope is None else timeout_scope(scope)
+
+    def load(self, path: Path, scope: str) -> None:
+        """Прочитать историю ожиданий; scope (base_url) - сайт прогона по умолчанию"""
+        self.scope = timeout_scope(scope)
+        history: Dict[str, Dict[str, List[float]]] = {}
+        if path.exists():
+            try:
+                history = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning("Не удалось прочитать историю таймаутов", error=str(e))
+        # Старые записи могли храниться по полному base_url (со случайным портом стенда)
+        self._history = {}
+        for site, keys in history.items():
+            current = self._history.setdefault(timeout_scope(site), {})
+            for key, values in keys.items():
+                self._extend_window(current, key, values)
+        with self._lock:
+            self._samples = {
+                site: {key: deque(values, maxlen=self.window) for key, values in keys.items()}
+                for site, keys in self._history.items()
+            }
+
+    def _learned(self, key: str, scope: Optional[str] = None) -> Optional[float]:
+        """Выученный таймаут или None, если истории недостаточно"""
+        rule = self.rule(key)
+        with self._lock:
+            values = sorted(self._samples.get(self._scope(scope), {}).get(key, ()))
+        if self.mode == "fixed" or len(values) < self.min_samples:
+            return None
+        rank = max(1, math.ceil(self.quantile / 100 * len(values)))
+        return min(rule.ceiling_ms, max(rule.floor_ms, values[rank - 1] * self.safety))
+
+    def timeout(self, key: str, scope: Optional[str] = None) -> float:
+        """Таймаут ожидания key на сайте scope (по умолчанию - сайт прогона), мс"""
+        learned = self._learned(key, scope)
+        return self.rule(key).default_ms if learned is None else learned
+
+    def observe(self, key: str, elapsed_ms: float, scope: Optional[str] = None) -> None:
+        """Добавить длительность успешного ожидания в историю сайта scope"""
+        if not self.enabled:
+            return
+        site = self._scope(scope)
+        with self._lock:
+            samples = self._samples.setdefault(site, {})
+            samples.setdefault(key, deque(maxlen=self.window)).append(elapsed_ms)
+            self._new[site][key].append(round(elapsed_ms, 1))
+
+    @contextmanager
+    def wait(self, key: str, scope: Optional[str] = None) -> Iterator[float]:
+        """Ожидание по ключу: отдает таймаут и при успехе записывает длительность
+
+        Пример::
+
+            with TIMEOUTS.wait("login.form", self.base_url) as timeout:
+                self.email_field.wait_for(state="visible", timeout=timeout)
+        """
+        default_ms = self.rule(key).default_ms
+        learned = self._learned(key, scope)
+        timeout = default_ms if learned is None else learned
+        started = time.perf_counter()
+        try:
+            yield timeout
+        except Exception:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # Насколько раньше упало ожидание по сравнению с таймаутом по умолчанию
+            SESSION_STATS.add(
+                "timeouts", waits=1, failed=1, failed_faster_ms=max(0.0, default_ms - elapsed_ms)
+            )
+            raise
+        self.observe(key, (time.perf_counter() - started) * 1000, scope)
+        SESSION_STATS.add("timeouts", waits=1, learned=int(learned is not None))
+
+    def as_dict(self) -> Dict[str, Dict[str, List[float]]]:
+        """Новые замеры процесса по сайтам (пригодны для execnet)"""
+        with self._lock:
+            return {
+                site: {key: list(values) for key, values in keys.items()}
+                for site, keys in self._new.items()
+            }
+
+    def merge(self, samples: Mapping[str, Mapping[str, List[float]]]) -> None:
+        """Добавить замеры другого процесса (воркера xdist)"""
+        for site, keys in samples.items():
+            for key, values in keys.items():
+                for value in values:
+                    self.observe(key, value, site)
+
+    def save(self, path: Path) -> None:
+        """Дописать новые замеры в окна сайтов и записать историю атомарно"""
+        new = self.as_dict()
+        if not new:
+            return
+        for site, keys in new.items():
+            current = self._history.setdefault(site, {})
+            for key, values in keys.items():
+                self._extend_window(current, key, values)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self._history, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def summary(self) -> Dict[str, float]:
+        """Текущие таймауты сайта прогона по всем ключам, мс"""
+        return {key: round(self.timeout(key)) for key in sorted(self.rules)}
+
+
+TIMEOUTS = TimeoutPolicy()
+
+
+def configure_timeouts(
+    mode: Optional[str] = None,
+    safety: Optional[float] = None,
+    quantile: Optional[float] = None,
+    history_path: Optional[Path] = None,
+    scope: str = "",
+    enabled: Optional[bool] = None,
+) -> None:
+    """Переопределить политику таймаутов (вызывается из conftest по CLI-опциям)"""
+    if enabled is not None:
+        TIMEOUTS.enabled = enabled
+    if mode is not None:
+        if mode not in TIMEOUT_MODES:
+            raise ValueError(f"Неизвестный режим таймаутов: {mode!r}")
+        TIMEOUTS.mode = mode
+    if safety is not None:
+        TIMEOUTS.safety = safety
+    if quantile is not None:
+        TIMEOUTS.quantile = quantile
+    if history_path is not None:
+        TIMEOUTS.load(history_path, scope)
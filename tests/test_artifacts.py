@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+from utils.artifacts import ArtifactWriter
+
+pytest_plugins = ["pytester"]
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Те же хуки, что в корневом conftest: писатель создается в pytest_configure,
+# снимок при падении - в makereport, вложения - в конце teardown
+CONFTEST = """
+import pytest
+from utils.artifacts import ArtifactWriter, get_artifact_writer, set_artifact_writer
+
+
+def pytest_configure(config):
+    set_artifact_writer(ArtifactWriter(out_dir=config.rootpath / "artifacts"))
+
+
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    report = (yield).get_result()
+    if report.when == "call" and report.failed:
+        get_artifact_writer().submit(b"fake png", "screenshot_on_failure")
+
+
+@pytest.hookimpl(hookwrapper=True, trylast=True)
+def pytest_runtest_setup(item):
+    get_artifact_writer().start_test(item.nodeid, 1)
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True, trylast=True)
+def pytest_runtest_teardown(item):
+    yield
+    get_artifact_writer().attach_pending()
+"""
+
+
+def test_failed_test_gets_allure_screenshot(pytester, monkeypatch):
+    monkeypatch.setenv("PYTHONPATH", str(ROOT))
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile("def test_fails():\n    assert False\n")
+    alluredir = pytester.path / "allure-results"
+
+    result = pytester.runpytest_subprocess("-p", "no:cacheprovider", f"--alluredir={alluredir}")
+
+    result.assert_outcomes(failed=1)
+    [result_file] = alluredir.glob("*-result.json")
+    attachments = json.loads(result_file.read_text())["attachments"]
+    assert [a["name"] for a in attachments] == ["screenshot_on_failure"]
+    assert attachments[0]["type"] == "image/png"
+    assert (alluredir / attachments[0]["source"]).read_bytes() == b"fake png"
+
+
+def test_identical_failures_in_two_tests_both_get_screenshots(pytester, monkeypatch):
+    monkeypatch.setenv("PYTHONPATH", str(ROOT))
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(
+        "def test_first():\n    assert False\n\n\ndef test_second():\n    assert False\n"
+    )
+    alluredir = pytester.path / "allure-results"
+
+    result = pytester.runpytest_subprocess("-p", "no:cacheprovider", f"--alluredir={alluredir}")
+
+    result.assert_outcomes(failed=2)
+    for result_file in alluredir.glob("*-result.json"):
+        [attachment] = json.loads(result_file.read_text())["attachments"]
+        assert attachment["type"] == "image/png"
+        assert (alluredir / attachment["source"]).read_bytes() == b"fake png"
+
+
+def test_duplicate_in_one_test_reuses_file(tmp_path):
+    writer = ArtifactWriter(out_dir=tmp_path)
+    writer.start_test("tests/test_a.py::test_a", 1)
+    first = writer.submit(b"same", "first")
+    second = writer.submit(b"same", "second")
+    # Повтор прикрепляется к отчету тем же файлом, а не текстом
+    assert writer._pending == [(first, "first"), (first, "second")]
+    writer.start_test("tests/test_a.py::test_b", 1)
+    other = writer.submit(b"same", "first")
+    writer.close()
+
+    assert second == first
+    assert other != first and other.parent.name == "tests_test_a.py_test_b"
+    assert first.read_bytes() == other.read_bytes() == b"same"
@@ -0,0 +1,108 @@
+import os
+import pytest
+from utils.asset_cache import IMMUTABLE_SECONDS, AssetCache, freshness
+
+BUNDLE = "https://stepik.org/static/app.js"
+STYLES = "https://stepik.org/static/app.css"
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"cache-control": "max-age=600"}, 600.0),
+        ({"cache-control": "public, max-age=31536000, immutable"}, IMMUTABLE_SECONDS),
+        ({"cache-control": "no-store, max-age=600"}, None),
+        ({"cache-control": "max-age=600", "vary": "Accept-Encoding, Origin"}, 600.0),
+        ({"cache-control": "max-age=600", "vary": "Cookie"}, None),
+        ({"cache-control": "no-cache", "etag": '"v1"'}, 0.0),
+        ({"last-modified": "Tue, 01 Sep 2026 00:00:00 GMT"}, 0.0),
+        ({"cache-control": "no-cache"}, None),
+        ({}, None),
+    ],
+)
+def test_freshness(headers, expected):
+    assert freshness(headers) == expected
+
+
+def test_store_and_lookup(tmp_path):
+    cache = AssetCache(tmp_path)
+    headers = {"cache-control": "max-age=600", "content-encoding": "gzip", "etag": '"v1"'}
+
+    assert cache.store(BUNDLE, 200, headers, b"bundle")
+    assert not cache.store(STYLES, 200, {"cache-control": "no-store"}, b"styles")
+    assert not cache.store(STYLES, 404, headers, b"missing")
+
+    entry, body = cache.lookup(BUNDLE)
+    assert body == b"bundle"
+    assert "content-encoding" not in entry["headers"]
+    assert cache.is_fresh(entry)
+    assert cache.validators(entry) == {"if-none-match": '"v1"'}
+    assert cache.lookup(STYLES) is None
+
+
+def test_refresh_extends_revalidated_entry(tmp_path):
+    cache = AssetCache(tmp_path)
+    cache.store(BUNDLE, 200, {"cache-control": "no-cache", "etag": '"v1"'}, b"bundle")
+    entry, _ = cache.lookup(BUNDLE)
+    assert not cache.is_fresh(entry)
+
+    cache.refresh(entry, {"cache-control": "max-age=600"})
+
+    entry, _ = cache.lookup(BUNDLE)
+    assert entry["fresh_for"] == 600.0
+    assert cache.is_fresh(entry)
+
+
+def test_refresh_drops_entry_that_became_uncacheable(tmp_path):
+    cache = AssetCache(tmp_path)
+    cache.store(BUNDLE, 200, {"cache-control": "no-cache", "etag": '"v1"'}, b"bundle")
+    entry, _ = cache.lookup(BUNDLE)
+
+    cache.refresh(entry, {"cache-control": "no-store"})
+
+    assert cache.lookup(BUNDLE) is None
+    assert cache.stats["dropped"] == 1
+
+
+def test_evict_least_recently_used_and_keep_shared_blobs(tmp_path):
+    cache = AssetCache(tmp_path, max_bytes=10)
+    headers = {"cache-control": "max-age=600"}
+    old = "https://stepik.org/static/old.js"
+    cache.store(old, 200, headers, b"0123456789")
+    # Два URL с одинаковым телом делят один blob
+    cache.store(BUNDLE, 200, headers, b"abcdefgh")
+    cache.store(STYLES, 200, headers, b"abcdefgh")
+    for age, url in [(300, BUNDLE), (200, old), (100, STYLES)]:
+        path = cache._entry_path(url)
+        mtime = path.stat().st_mtime - age
+        os.utime(path, (mtime, mtime))
+
+    # 18 байт > 10: удаление BUNDLE не освобождает общий blob, поэтому вытесняется и old
+    assert cache.evict() == 8
+
+    assert cache.lookup(BUNDLE) is None
+    assert cache.lookup(old) is None
+    assert cache.lookup(STYLES)[1] == b"abcdefgh"
+    assert len(list((tmp_path / "blobs").iterdir())) == 1
+
+
+def test_evict_removes_orphan_blobs(tmp_path):
+    cache = AssetCache(tmp_path, max_bytes=0)
+    cache.store(BUNDLE, 200, {"cache-control": "max-age=600"}, b"bundle")
+
+    assert cache.evict() == 0
+
+    assert cache.lookup(BUNDLE) is None
+    assert not list((tmp_path / "blobs").iterdir())
+
+
+def test_lookup_of_entry_evicted_after_read_is_a_miss(tmp_path, monkeypatch):
+    cache = AssetCache(tmp_path)
+    cache.store(BUNDLE, 200, {"cache-control": "max-age=600"}, b"bundle")
+
+    def evicted(path, *args):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", evicted)
+
+    assert cache.lookup(BUNDLE) is None
@@ -0,0 +1,38 @@
+from utils.context_pool import ContextPool
+
+
+class FakePage:
+    """Страница: запоминает выставленные таймауты"""
+
+    def __init__(self) -> None:
+        self.timeouts: dict = {}
+
+    def set_default_timeout(self, timeout: float) -> None:
+        self.timeouts["action"] = timeout
+
+    def set_default_navigation_timeout(self, timeout: float) -> None:
+        self.timeouts["navigation"] = timeout
+
+
+class FakeContext:
+    def new_page(self) -> FakePage:
+        return FakePage()
+
+
+def test_acquire_applies_current_action_and_navigation_timeouts():
+    timeouts = {"action": 5000.0, "navigation": 20000.0}
+    pool = ContextPool(
+        FakeContext,
+        size=1,
+        page_timeout=lambda: timeouts["action"],
+        navigation_timeout=lambda: timeouts["navigation"],
+    )
+    pool.prewarm()
+
+    first = pool.acquire()
+    # Политика таймаутов доучилась по ходу сессии
+    timeouts["action"] = 7000.0
+    second = pool.acquire()
+
+    assert first.page.timeouts == {"action": 5000.0, "navigation": 20000.0}
+    assert second.page.timeouts == {"action": 7000.0, "navigation": 20000.0}
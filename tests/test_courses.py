@@ -0,0 +1,144 @@
+import json
+import time
+import allure
+import pytest
+from pages.courses import EXTRACT_COURSES_SCRIPT, CourseCard, write_jsonl
+from pages.search_page import COURSE_CARD_SELECTOR, SearchPage
+from utils.stand_in import COURSES_PER_PAGE, TOTAL_COURSES, RouteFault
+
+
+def _card(position: int) -> CourseCard:
+    url = f"https://stepik.org/course/{position}/promo"
+    return CourseCard(position, f"Курс {position}", url, True)
+
+
+def test_write_jsonl_streams_until_limit(tmp_path):
+    path = tmp_path / "out" / "courses.jsonl"
+
+    written = write_jsonl((_card(i) for i in range(1, 100)), path, limit=3)
+
+    assert written == 3
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["position"] for line in lines] == [1, 2, 3]
+    assert lines[0]["title"] == "Курс 1"
+
+
+@allure.epic("Stepik UI Automation")
+@allure.feature("Выгрузка результатов поиска")
+@pytest.mark.no_auth_cache
+class TestIterCoursesOnStandIn:
+    """
+    Ленивое чтение карточек с пагинацией против локального стенда.
+    """
+
+    @allure.title("iter_courses() проходит все страницы пагинации")
+    def test_iter_courses_follows_pagination(self, page, stand_in):
+        search_page = SearchPage(page, base_url=stand_in.url)
+        search_page.navigate(f"{stand_in.url}/catalog/search?q=python")
+
+        cards = list(search_page.iter_courses(batch_size=15, load_timeout=200))
+
+        assert [card.position for card in cards] == list(range(1, TOTAL_COURSES + 1))
+        assert len({card.url for card in cards}) == TOTAL_COURSES
+        assert cards[0].url == f"{stand_in.url}/course/1/promo"
+        assert cards[0].title == "python - курс 1"
+        # На стенде платный каждый третий курс
+        assert [card.is_free for card in cards[:3]] == [True, True, False]
+        assert "page=3" in page.url
+
+    @allure.title("iter_courses() не ждет подгрузки на страницах пагинации")
+    def test_iter_courses_does_not_wait_on_paginated_pages(self, page, stand_in):
+        search_page = SearchPage(page, base_url=stand_in.url)
+        search_page.navigate(f"{stand_in.url}/catalog/search?q=python")
+        started = time.monotonic()
+
+        # load_timeout по умолчанию (5 с): ожидание на каждой странице заняло бы 15 с
+        cards = list(search_page.iter_courses())
+
+        assert len(cards) == TOTAL_COURSES
+        assert time.monotonic() - started < 3
+
+    @allure.title("Карточка без цены не считается бесплатной")
+    def test_card_without_price_has_unknown_price(self, page):
+        page.set_content(
+            '<div class="catalog-rich-card"><a class="catalog-rich-card__link-wrapper" href="/c/1">'
+            '<span class="course-card__title">Без цены</span></a></div>'
+            '<div class="catalog-rich-card"><a class="catalog-rich-card__link-wrapper" href="/c/2">'
+            '<span class="course-card__title">Бесплатный</span></a>'
+            '<span class="course-card__price">Бесплатно</span></div>'
+        )
+        arg = {"selector": COURSE_CARD_SELECTOR, "start": 0, "batchSize": 10, "waitMs": 5000}
+
+        batch = page.evaluate(EXTRACT_COURSES_SCRIPT, arg)
+
+        cards = [CourseCard.from_js(i, data) for i, data in enumerate(batch["cards"], 1)]
+        assert [card.is_free for card in cards] == [None, True]
+
+    @allure.title("iter_courses() останавливается на max_items без лишних переходов")
+    def test_iter_courses_stops_at_max_items(self, page, stand_in):
+        search_page = SearchPage(page, base_url=stand_in.url)
+        search_page.navigate(f"{stand_in.url}/catalog/search?q=python")
+
+        cards = list(search_page.iter_courses(max_items=5, load_timeout=200))
+
+        assert [card.position for card in cards] == [1, 2, 3, 4, 5]
+        assert "page=" not in page.url
+
+    @allure.title("export_courses() пишет карточки в JSONL")
+    def test_export_courses_writes_jsonl(self, page, stand_in, tmp_path):
+        search_page = SearchPage(page, base_url=stand_in.url)
+        search_page.navigate(f"{stand_in.url}/catalog/search?q=python")
+        path = tmp_path / "courses.jsonl"
+
+        written = search_page.export_courses(path, max_items=COURSES_PER_PAGE + 5)
+
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert written == len(lines) == COURSES_PER_PAGE + 5
+        assert lines[-1]["url"].endswith(f"/course/{COURSES_PER_PAGE + 5}/promo")
+
+
+@allure.epic("Stepik UI Automation")
+@allure.feature("Параллельная проверка курсов")
+@pytest.mark.no_auth_cache
+class TestOpenCoursesOnStandIn:
+    """
+    open_courses() против локального стенда: вкладки курсов открываются параллельно.
+    """
+
+    @allure.title("open_courses() проверяет первые курсы и закрывает их вкладки")
+    def test_open_courses_checks_headers(self, page, stand_in):
+        search_page = SearchPage(page, base_url=stand_in.url)
+        search_page.navigate(f"{stand_in.url}/catalog/search?q=python")
+
+        checks = search_page.open_courses(6, max_parallel=3)
+
+        assert [check.card.position for check in checks] == [1, 2, 3, 4, 5, 6]
+        assert all(check.ok for check in checks), [c.error for c in checks if not c.ok]
+        assert [check.header for check in checks[:2]] == ["Курс 1", "Курс 2"]
+        assert {check.status for check in checks} == {200}
+        assert page.context.pages == [page], "Вкладки курсов остались открытыми"
+
+    @allure.title("open_courses() отмечает курс, страница которого ответила ошибкой")
+    def test_open_courses_reports_failed_course(self, page, stand_in):
+        search_page = SearchPage(page, base_url=stand_in.url)
+        search_page.navigate(f"{stand_in.url}/catalog/search?q=python")
+        stand_in.set_fault("/course/2/promo", RouteFault(error_rate=1.0))
+        started = time.monotonic()
+        try:
+            # Таймаут по умолчанию: на ответ с ошибкой заголовок не ждем
+            checks = search_page.open_courses(3, max_parallel=2)
+        finally:
+            stand_in.set_fault("/course/2/promo", None)
+
+        assert [check.ok for check in checks] == [True, False, True]
+        assert checks[1].status == 503
+        assert checks[1].error == "HTTP 503"
+        assert time.monotonic() - started < 5
+
+    @allure.title("open_courses() без карточек на странице сообщает об ошибке")
+    def test_open_courses_without_cards_fails(self, page, stand_in):
+        search_page = SearchPage(page, base_url=stand_in.url)
+        search_page.navigate(search_page.catalog_url)
+
+        with pytest.raises(ValueError, match="нет карточек"):
+            search_page.open_courses(3)
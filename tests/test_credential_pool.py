@@ -0,0 +1,97 @@
+import multiprocessing
+import time
+import pytest
+from utils.credential_pool import MAX_LOGIN_FAILURES, Account, CredentialPool
+
+ACCOUNTS = [Account("first@example.com", "secret"), Account("second@example.com", "secret")]
+
+
+def _hold_lease(pool_dir, owner: str, results) -> None:
+    """Процесс-воркер: арендовать запись, подержать ее и сообщить интервал аренды"""
+    pool = CredentialPool(ACCOUNTS, pool_dir=pool_dir, wait_timeout=30)
+    lease = pool.lease(owner)
+    started = time.monotonic()
+    time.sleep(0.3)
+    finished = time.monotonic()
+    lease.release()
+    results.put((lease.account.login, owner, started, finished))
+
+
+def test_processes_get_exclusive_leases(tmp_path):
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_hold_lease, args=(tmp_path, f"gw{i}", results))
+        for i in range(4)
+    ]
+    for process in processes:
+        process.start()
+    leases = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join(timeout=10)
+        assert process.exitcode == 0
+
+    assert sorted(owner for _, owner, _, _ in leases) == ["gw0", "gw1", "gw2", "gw3"]
+    by_account = {}
+    for login, _, started, finished in leases:
+        by_account.setdefault(login, []).append((started, finished))
+    # Обе записи в работе, и ни одна не выдана двум процессам одновременно
+    assert set(by_account) == {account.login for account in ACCOUNTS}
+    for intervals in by_account.values():
+        intervals.sort()
+        for (_, previous_end), (next_start, _) in zip(intervals, intervals[1:]):
+            assert next_start >= previous_end
+
+
+def test_lease_waits_for_a_released_account(tmp_path):
+    pool = CredentialPool(ACCOUNTS[:1], pool_dir=tmp_path, wait_timeout=0.1)
+    lease = pool.lease("gw0")
+
+    with pytest.raises(TimeoutError):
+        pool.lease("gw1")
+    lease.release()
+
+    lease = pool.lease("gw1")
+    assert lease.account == ACCOUNTS[0]
+    lease.release()
+
+
+def test_failed_logins_demote_account(tmp_path):
+    pool = CredentialPool(ACCOUNTS, pool_dir=tmp_path, min_login_interval=0)
+    first, second = ACCOUNTS
+
+    for _ in range(MAX_LOGIN_FAILURES - 1):
+        pool.record_login(first, ok=False)
+    assert first in pool._candidates()
+
+    pool.record_login(first, ok=False)
+    assert pool._candidates() == [second]
+    lease = pool.lease("gw0")
+    assert lease.account == second
+    lease.release()
+
+    pool.record_login(first, ok=True)
+    assert first in pool._candidates()
+
+
+def test_demoted_accounts_are_used_when_no_healthy_left(tmp_path):
+    pool = CredentialPool(ACCOUNTS, pool_dir=tmp_path, min_login_interval=0)
+    for account in ACCOUNTS:
+        for _ in range(MAX_LOGIN_FAILURES):
+            pool.record_login(account, ok=False)
+
+    assert sorted(a.login for a in pool._candidates()) == sorted(a.login for a in ACCOUNTS)
+
+
+def test_failed_login_inside_lease_is_recorded(tmp_path):
+    pool = CredentialPool(ACCOUNTS[:1], pool_dir=tmp_path, min_login_interval=0)
+    lease = pool.lease("gw0")
+
+    for _ in range(MAX_LOGIN_FAILURES):
+        with pytest.raises(RuntimeError):
+            with lease.logging_in():
+                raise RuntimeError("Неверный пароль")
+    lease.release()
+
+    with pool._health() as health:
+        assert health[ACCOUNTS[0].key]["failures"] == MAX_LOGIN_FAILURES
+        assert health[ACCOUNTS[0].key]["leases"] == 1
@@ -0,0 +1,70 @@
+import asyncio
+import base64
+from types import SimpleNamespace
+from utils.har import HarReplayer, normalize_url
+
+
+def test_normalize_url_sorts_params_and_drops_volatile_ones():
+    url = "https://Stepik.org/catalog/search?q=%20Python%20%20Basics&free=1&_=123#results"
+    assert normalize_url(url) == "https://stepik.org/catalog/search?free=true&q=python+basics"
+
+
+def test_normalize_url_keeps_path_and_custom_ignored_params():
+    assert normalize_url("https://stepik.org?page=2&lang=ru", ["lang"]) == (
+        "https://stepik.org/?page=2"
+    )
+
+
+def test_fulfill_args_keeps_repeated_set_cookie_headers():
+    response = {
+        "status": 200,
+        "headers": [
+            {"name": "Set-Cookie", "value": "sessionid=abc; Path=/"},
+            {"name": "set-cookie", "value": "csrftoken=xyz; Path=/"},
+            {"name": "Content-Encoding", "value": "gzip"},
+            {"name": "Content-Type", "value": "text/html"},
+        ],
+        "content": {"text": base64.b64encode(b"ok").decode(), "encoding": "base64"},
+    }
+
+    args = HarReplayer._fulfill_args(response)
+
+    assert args["headers"] == {
+        "set-cookie": "sessionid=abc; Path=/\ncsrftoken=xyz; Path=/",
+        "content-type": "text/html",
+    }
+    assert args["body"] == b"ok"
+
+
+class FakeAsyncRoute:
+    """Маршрут async API: запоминает, чем закончился запрос"""
+
+    def __init__(self, url: str) -> None:
+        self.request = SimpleNamespace(method="GET", url=url)
+        self.outcome: tuple = ()
+
+    async def fulfill(self, **kwargs) -> None:
+        self.outcome = ("fulfill", kwargs["status"], kwargs["body"])
+
+    async def abort(self, error_code: str) -> None:
+        self.outcome = ("abort", error_code)
+
+    async def fallback(self) -> None:
+        self.outcome = ("fallback",)
+
+
+def test_async_handler_serves_recorded_responses_and_aborts_the_rest():
+    entry = {
+        "request": {"method": "GET", "url": "https://stepik.org/catalog?q=python"},
+        "response": {"status": 200, "headers": [], "content": {"text": "ok"}},
+    }
+    replayer = HarReplayer([entry])
+    hit = FakeAsyncRoute("https://stepik.org/catalog?q=Python&_=1")
+    miss = FakeAsyncRoute("https://stepik.org/api/unknown")
+
+    asyncio.run(replayer._handle_async(hit))
+    asyncio.run(replayer._handle_async(miss))
+
+    assert hit.outcome == ("fulfill", 200, b"ok")
+    assert miss.outcome == ("abort", "internetdisconnected")
+    assert (replayer.hits, replayer.misses) == (1, [miss.request.url])
@@ -0,0 +1,48 @@
+import sys
+import allure
+import pytest
+from utils.load_runner import LoadConfig, format_report, main, run_load
+
+
+@allure.epic("Stepik UI Automation")
+@allure.feature("Нагрузочный прогон")
+class TestLoadRunner:
+    """
+    Виртуальные пользователи проходят сценарии page objects против локального стенда.
+    """
+
+    @allure.title("Нагрузка с разгоном пользователей на локальном стенде")
+    @pytest.mark.load
+    @pytest.mark.asyncio
+    async def test_load_run_against_stand_in(self, stand_in, async_browser):
+        config = LoadConfig(
+            base_url=stand_in.url,
+            users=3,
+            ramp_up=1,
+            duration=5,
+            think_time=(0, 0.1),
+            window=1,
+            credentials=("load@example.com", "secret"),
+        )
+
+        report = await run_load(config, async_browser)
+        allure.attach(
+            format_report(report), name="load_report", attachment_type=allure.attachment_type.TEXT
+        )
+
+        summary = report["summary"]
+        assert summary["iterations"] > 0, "Ни один пользователь не прошел сценарий"
+        assert not summary["errors"], f"Ошибки в шагах: {summary['errors']}"
+        assert set(summary["steps"]) == {"login", "open_catalog", "search", "apply_free_filter"}
+        assert all(window["steps"] for window in report["windows"]), "Пустое окно статистики"
+
+
+@pytest.mark.parametrize("credentials", [["--login", "load@example.com"], ["--password", "secret"]])
+def test_login_requires_password(monkeypatch, capsys, credentials):
+    monkeypatch.setattr(sys, "argv", ["load_runner", "--stand-in", *credentials])
+
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 2
+    assert "--login и --password" in capsys.readouterr().err
@@ -0,0 +1,69 @@
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from pages.network import NetworkMonitor
+
+
+class FakePage:
+    """Страница, события которой тест вызывает сам"""
+
+    def __init__(self) -> None:
+        self.handlers: dict = {}
+
+    def on(self, event: str, handler) -> None:
+        self.handlers[event] = handler
+
+    def emit(self, event: str, payload) -> None:
+        self.handlers[event](payload)
+
+    def wait_for_timeout(self, timeout: float) -> None:
+        pass
+
+
+class FakeRequest:
+    """Запрос Playwright: ключ словаря запросов в полете (хэшируется по объекту)"""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.method = "GET"
+        self.resource_type = "fetch"
+
+
+def test_for_page_returns_one_monitor_per_page():
+    page = FakePage()
+
+    monitor = NetworkMonitor.for_page(page)
+
+    assert isinstance(monitor, NetworkMonitor)
+    assert NetworkMonitor.for_page(page) is monitor
+    assert NetworkMonitor.for_page(FakePage()) is not monitor
+
+
+def test_mark_survives_clear():
+    page = FakePage()
+    monitor = NetworkMonitor(page)
+    slow = FakeRequest("https://stepik.org/api/slow")
+    done = FakeRequest("https://stepik.org/api/done")
+    page.emit("request", slow)
+    page.emit("request", done)
+    page.emit("requestfinished", done)
+
+    since = monitor.mark()
+    monitor.clear()
+    fresh = FakeRequest("https://stepik.org/api/fresh")
+    page.emit("request", fresh)
+    page.emit("requestfinished", fresh)
+
+    assert [t.url for t in monitor.timings()] == [slow.url, fresh.url]
+    assert [t.url for t in monitor.timings(since=since)] == [fresh.url]
+    assert monitor.wait_for_response("*/api/*", since=since, timeout=0).url == fresh.url
+
+
+def test_wait_for_response_raises_playwright_timeout():
+    page = FakePage()
+    monitor = NetworkMonitor(page)
+    page.emit("request", FakeRequest("https://stepik.org/api/pending"))
+
+    with pytest.raises(PlaywrightTimeoutError):
+        monitor.wait_for_response("*/api/*", timeout=0)
+    with pytest.raises(PlaywrightTimeoutError):
+        monitor.wait_for_idle(timeout=0)
@@ -0,0 +1,81 @@
+import allure
+import pytest
+from pages.catalog_page import CatalogPage
+from pages.probe import Condition
+from pages.search_page import SearchPage
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("attached", Condition("attached")),
+        ("visible", Condition("visible")),
+        (" text ", Condition("text")),
+        ("count>=3", Condition("count", 3)),
+        ("count >= 20", Condition("count", 20)),
+    ],
+)
+def test_condition_parse(spec, expected):
+    assert Condition.parse(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["hidden", "count>3", "count>=", ""])
+def test_condition_parse_rejects_unknown(spec):
+    with pytest.raises(ValueError, match="Неизвестное условие"):
+        Condition.parse(spec)
+
+
+@allure.epic("Stepik UI Automation")
+@allure.feature("Пакетная проверка элементов")
+@pytest.mark.no_auth_cache
+class TestProbeOnStandIn:
+    """
+    probe() и wait_all() против локального стенда: все условия за один запрос в браузер.
+    """
+
+    @allure.title("probe() возвращает состояние каждого элемента")
+    def test_probe_reports_each_element(self, page, stand_in):
+        search_page = SearchPage(page, base_url=stand_in.url)
+        search_page.navigate(f"{stand_in.url}/catalog/search?q=python")
+
+        result = search_page.probe({"course_cards": "count>=20", "free_filter_button": "visible"})
+
+        assert result.ok, f"Условия не выполнены: {result.failed}"
+        assert result.states["course_cards"].count == 20
+        assert result.states["free_filter_button"].visible == 1
+        assert result.polls == 1
+
+    @allure.title("probe() без ожидания сообщает о невыполненных условиях")
+    def test_probe_reports_failed_conditions(self, page, stand_in):
+        catalog_page = CatalogPage(page, base_url=stand_in.url)
+        catalog_page.navigate(catalog_page.catalog_url)
+
+        result = catalog_page.probe({"search_input": "visible", "search_buttons": "count>=2"})
+
+        assert not result.ok
+        assert result.failed == ["search_buttons"]
+        assert result.states["search_buttons"].count == 1
+
+    @allure.title("wait_all() дожидается элементов после навигации")
+    def test_wait_all_survives_navigation(self, page, stand_in):
+        catalog_page = CatalogPage(page, base_url=stand_in.url)
+        catalog_page.navigate(catalog_page.catalog_url)
+        catalog_page.search_input.fill("python")
+        catalog_page.search_input.press("Enter")
+
+        search_page = SearchPage(page, base_url=stand_in.url)
+        result = search_page.wait_all({"course_cards": "count>=20"}, timeout=10000)
+
+        assert result.ok, f"Карточки не дождались: {result.states}"
+
+    @allure.title("wait_all() по таймауту возвращает последнее состояние без исключения")
+    def test_wait_all_returns_last_state_on_timeout(self, page, stand_in):
+        search_page = SearchPage(page, base_url=stand_in.url)
+        search_page.navigate(f"{stand_in.url}/catalog/search?q=python")
+
+        result = search_page.wait_all({"course_cards": "count>=21"}, timeout=300, interval=50)
+
+        assert not result.ok
+        assert result.failed == ["course_cards"]
+        assert result.states["course_cards"].count == 20
+        assert result.polls > 1
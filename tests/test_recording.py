@@ -0,0 +1,37 @@
+import asyncio
+from utils.recording import AttemptRecorder, RecordingPlan
+
+
+class FakeTracing:
+    """Trace контекста: stop(path=...) пишет файл"""
+
+    async def start(self, **kwargs) -> None:
+        pass
+
+    async def stop(self, path=None) -> None:
+        if path is not None:
+            with open(path, "wb") as f:
+                f.write(b"trace")
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.tracing = FakeTracing()
+        self.pages: list = []
+
+
+def test_each_context_of_attempt_keeps_its_own_trace(tmp_path):
+    recorder = AttemptRecorder(RecordingPlan(trace=True), tmp_path, "try2")
+    contexts = [FakeContext(), FakeContext()]
+
+    async def attempt() -> None:
+        for context in contexts:
+            await recorder.start_async(context)
+        for context in contexts:
+            await recorder.stop_async(context, keep=True)
+        await recorder.finish_async(keep=True)
+
+    asyncio.run(attempt())
+
+    assert [path.name for path in recorder.kept] == ["trace-try2.zip", "trace-try2-1.zip"]
+    assert all(path.exists() for path in recorder.kept)
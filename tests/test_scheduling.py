@@ -0,0 +1,134 @@
+import json
+import pytest
+from types import SimpleNamespace
+from xdist.remote import Producer
+from utils.durations import DEFAULT_TEST_SECONDS, DurationStore, predict_makespan
+from utils.scheduling import DurationScheduling
+
+COLLECTION = ["a", "b", "c", "d", "e"]
+DURATIONS = {"a": 1.0, "b": 5.0, "c": 3.0, "d": 10.0, "e": 2.0}
+
+
+class FakeConfig:
+    """Опции pytest, которые читает LoadScheduling"""
+
+    def __init__(self, workers: int) -> None:
+        self.options = {"tx": [f"{workers}*popen"], "maxschedchunk": None, "dist": "load"}
+
+    def getvalue(self, name: str):
+        return self.options[name]
+
+    getoption = getvalue
+
+
+class FakeNode:
+    """Воркер xdist: запоминает отправленные индексы тестов"""
+
+    def __init__(self, name: str) -> None:
+        self.gateway = SimpleNamespace(id=name)
+        self.sent: list = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices) -> None:
+        self.sent.extend(indices)
+
+    def shutdown(self) -> None:
+        self.shutting_down = True
+
+
+def _store(tmp_path, durations) -> DurationStore:
+    path = tmp_path / "durations.json"
+    path.write_text(json.dumps(durations), encoding="utf-8")
+    return DurationStore(path)
+
+
+def _schedule(tmp_path, collection=COLLECTION, workers: int = 2, prefetch: int = 2):
+    scheduler = DurationScheduling(
+        FakeConfig(workers),
+        Producer("test", enabled=False),
+        store=_store(tmp_path, DURATIONS),
+        prefetch=prefetch,
+    )
+    nodes = [FakeNode(f"gw{i}") for i in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+    for node in nodes:
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+def _names(node: FakeNode):
+    return [COLLECTION[index] for index in node.sent]
+
+
+def test_schedule_sends_longest_tests_first(tmp_path):
+    scheduler, (gw0, gw1) = _schedule(tmp_path)
+
+    # По одному тесту на воркер за круг: два самых долгих достаются разным воркерам
+    assert _names(gw0) == ["d", "c"]
+    assert _names(gw1) == ["b", "e"]
+    assert scheduler.pending == [COLLECTION.index("a")]
+    assert not gw0.shutting_down and not gw1.shutting_down
+    assert scheduler.predicted["longest_first"] <= scheduler.predicted["collection_order"]
+
+
+def test_check_schedule_refills_up_to_prefetch(tmp_path):
+    scheduler, (gw0, gw1) = _schedule(tmp_path)
+
+    scheduler.mark_test_complete(gw0, COLLECTION.index("d"))
+
+    assert _names(gw0) == ["d", "c", "a"]
+    assert scheduler.node2pending[gw0] == [COLLECTION.index("c"), COLLECTION.index("a")]
+    assert not scheduler.pending
+    assert _names(gw1) == ["b", "e"]
+
+
+def test_nodes_shut_down_when_pending_runs_out(tmp_path):
+    scheduler, (gw0, gw1) = _schedule(tmp_path)
+    scheduler.mark_test_complete(gw0, COLLECTION.index("d"))
+
+    scheduler.mark_test_complete(gw1, COLLECTION.index("b"))
+
+    assert gw1.shutting_down
+    assert not gw0.shutting_down
+    scheduler.mark_test_complete(gw0, COLLECTION.index("c"))
+    assert gw0.shutting_down
+
+
+def test_short_collection_is_sent_at_once(tmp_path):
+    scheduler, nodes = _schedule(tmp_path, collection=COLLECTION[:3], workers=2)
+
+    assert sorted(index for node in nodes for index in node.sent) == [0, 1, 2]
+    assert all(node.shutting_down for node in nodes)
+
+
+def test_store_defaults_to_median_of_known_tests(tmp_path):
+    store = _store(tmp_path, {"a": 1.0, "b": 3.0, "c": 10.0})
+
+    assert store.estimate("c") == 10.0
+    assert store.estimate("new") == 3.0
+    assert store.estimate("new", default=7.0) == 7.0
+    assert DurationStore(tmp_path / "missing.json").estimate("new") == DEFAULT_TEST_SECONDS
+
+
+def test_store_saves_ewma_of_full_test_cost(tmp_path):
+    store = _store(tmp_path, {"a": 10.0})
+    # Фазы и перезапуск одного теста складываются в его стоимость за прогон
+    store.add("a", 4.0)
+    store.add("a", 2.0)
+    store.add("new", 5.0)
+
+    store.save()
+
+    saved = DurationStore(store.path)
+    assert saved.estimate("a") == pytest.approx(8.0)
+    assert saved.estimate("new") == pytest.approx(5.0)
+
+
+def test_predict_makespan_greedy():
+    durations = [10.0, 1.0, 1.0, 1.0, 1.0, 10.0]
+
+    assert predict_makespan(durations, 2) == 14.0
+    assert predict_makespan(sorted(durations, reverse=True), 2) == 12.0
+    assert predict_makespan(durations, 0) == sum(durations)
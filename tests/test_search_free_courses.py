@@ -2,6 +2,7 @@ import allure
 import pytest
 from pages.login_page import LoginPage
 from pages.catalog_page import CatalogPage
+from pages.search_page import SearchPage
 
 
 @allure.epic("Stepik UI Automation")
@@ -12,8 +13,7 @@ class TestSearchFreeCourses:
     """
 
     @allure.title("Поиск бесплатных курсов по запросу 'python'")
-    @allure.description(
-        """
+    @allure.description("""
         Полный пользовательский сценарий:
         1. Авторизация на Stepik.org
         2. Поиск курсов по запросу 'python'
@@ -25,49 +25,64 @@ class TestSearchFreeCourses:
         - Курсы по запросу 'python' найдены
         - Фильтр 'Бесплатно' применен
         - Первый курс успешно открыт и отображается
-        """
-    )
+        """)
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.flaky(reruns=1, reruns_delay=2)
-    def test_search_free_python_courses(self, page, credentials):
-        """Основной E2E-тест для проверки поиска и фильтрации курсов"""
+    def test_search_free_python_courses(self, page, credentials, checkpoints):
+        """Основной E2E-тест для проверки поиска и фильтрации курсов
+
+        Шаги сохраняют контрольные точки: перезапуск продолжает с упавшего шага.
+        """
 
         # Инициализация Page Objects
         login_page = LoginPage(page)
         catalog_page = CatalogPage(page)
+        search_page = SearchPage(page)
 
         # 1. АВТОРИЗАЦИЯ
-        with allure.step("1. Авторизация пользователя"):
-            login_page.login(credentials["login"], credentials["password"])
-            assert login_page.is_login_successful(), "Авторизация не удалась"
-            assert catalog_page.is_loaded(), "Главная страница не загрузилась"
+        with checkpoints.step("1. Авторизация пользователя") as step:
+            if step.pending:
+                # Контекст обычно уже авторизован из кэша - полный вход только при необходимости
+                login_page.ensure_logged_in(credentials["login"], credentials["password"])
+                assert login_page.is_login_successful(), "Авторизация не удалась"
+                assert catalog_page.is_loaded(), "Главная страница не загрузилась"
 
         # 2. ПОИСК КУРСОВ
-        with allure.step("2. Поиск курсов по запросу 'python'"):
-            search_page = catalog_page.search_courses("python")
-            assert search_page.is_loaded(), "Страница результатов поиска не загрузилась"
+        with checkpoints.step("2. Поиск курсов по запросу 'python'") as step:
+            if step.pending:
+                search_page = catalog_page.search_courses("python")
+                assert search_page.is_loaded(), "Страница результатов поиска не загрузилась"
 
         # 3. ПРИМЕНЕНИЕ ФИЛЬТРА "БЕСПЛАТНО"
-        with allure.step("3. Применение фильтра 'Бесплатно'"):
-            search_page.apply_free_filter()
-            assert "free=true" in page.url, "Фильтр 'Бесплатно' не применился в URL"
+        with checkpoints.step("3. Применение фильтра 'Бесплатно'") as step:
+            if step.pending:
+                search_page.apply_free_filter()
+                assert "free=true" in page.url, "Фильтр 'Бесплатно' не применился в URL"
 
         # 4. ОТКРЫТИЕ ПЕРВОГО КУРСА (в новой вкладке)
-        with allure.step("4. Открытие первого курса"):
-            course_page = search_page.open_first_course()  # Теперь возвращает новую страницу
+        with checkpoints.step("4. Открытие первого курса") as step:
+            if step.pending:
+                # Дальше сценарий идет во вкладке курса
+                step.page = search_page.open_first_course()
+
+                # Проверяем URL новой вкладки (формат: /course/ID/promo?search=...)
+                course_url = step.page.url
+                assert (
+                    "/course/" in course_url
+                ), f"Ожидали URL с /course/, но получили: {course_url}"
+
+                allure.attach(
+                    body=f"URL курса: {course_url}",
+                    name="course_url",
+                    attachment_type=allure.attachment_type.TEXT,
+                )
 
-            # Проверяем URL новой вкладки (формат: /course/ID/promo?search=...)
+        # 5. ПРОВЕРКА СТРАНИЦЫ КУРСА (в новой вкладке)
+        with checkpoints.step("5. Проверка открытия курса") as step:
+            # После восстановления из контрольной точки курс открыт в основной вкладке
+            course_page = step.page
             course_url = course_page.url
-            assert "/course/" in course_url, f"Ожидали URL с /course/, но получили: {course_url}"
 
-            allure.attach(
-                body=f"URL курса: {course_url}",
-                name="course_url",
-                attachment_type=allure.attachment_type.TEXT,
-            )
-
-        # 5. ПРОВЕРКА СТРАНИЦЫ КУРСА (в новой вкладке)
-        with allure.step("5. Проверка открытия курса"):
             # Ждем загрузки страницы курса (важно для CI!)
             course_page.wait_for_load_state("domcontentloaded", timeout=15000)
 
@@ -87,4 +102,5 @@ class TestSearchFreeCourses:
             )
 
             # Закрываем вкладку курса (опционально, для чистоты)
-            course_page.close()
+            if course_page is not page:
+                course_page.close()
@@ -0,0 +1,54 @@
+import asyncio
+import allure
+import pytest
+from pages.aio import CatalogPage
+
+QUERIES = ["python", "sql", "java", "git"]
+
+
+async def _search_free_course_flow(page, query: str) -> str:
+    """Поиск -> фильтр 'Бесплатно' -> открытие первого курса. Возвращает заголовок курса."""
+    catalog_page = await CatalogPage(page).open()
+    search_page = await catalog_page.search_courses(query)
+    assert await search_page.is_loaded(), f"Страница результатов не загрузилась: {query}"
+
+    await search_page.apply_free_filter()
+    assert "free=true" in page.url, f"Фильтр 'Бесплатно' не применился: {query}"
+
+    course_page = await search_page.open_first_course()
+    assert "/course/" in course_page.url, f"Ожидали URL с /course/: {course_page.url}"
+
+    header_locator = course_page.locator("h1").first
+    await header_locator.wait_for(state="visible", timeout=15000)
+    header_text: str = await header_locator.inner_text()
+    await course_page.close()
+    return header_text
+
+
+@allure.epic("Stepik UI Automation")
+@allure.feature("Поиск и фильтрация курсов")
+class TestSearchFreeCoursesConcurrent:
+    """
+    Несколько независимых сценариев поиска в одном event loop и одном браузере.
+    """
+
+    @allure.title("Конкурентный поиск бесплатных курсов по нескольким запросам")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.ui
+    @pytest.mark.asyncio
+    @pytest.mark.block_resources("minimal")
+    @pytest.mark.flaky(reruns=1, reruns_delay=2)
+    async def test_search_free_courses_concurrently(self, new_async_page):
+        """Сценарии поиска для разных запросов выполняются параллельно"""
+        pages = [await new_async_page() for _ in QUERIES]
+
+        headers = await asyncio.gather(
+            *(_search_free_course_flow(page, query) for page, query in zip(pages, QUERIES))
+        )
+
+        allure.attach(
+            body="\n".join(f"{q}: {h}" for q, h in zip(QUERIES, headers)),
+            name="course_headers",
+            attachment_type=allure.attachment_type.TEXT,
+        )
+        assert all(len(header) > 0 for header in headers), "Есть курсы с пустым заголовком"
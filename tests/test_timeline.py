@@ -0,0 +1,42 @@
+import asyncio
+from utils.timeline import Timeline
+
+
+def _spans(timeline: Timeline) -> list:
+    return [event for event in timeline.events() if event["ph"] == "X"]
+
+
+def test_sync_spans_nest_on_thread_track():
+    timeline = Timeline()
+    timeline.enable("pytest")
+
+    with timeline.span("test", "test"):
+        with timeline.span("click", "action"):
+            pass
+
+    click, test = _spans(timeline)
+    assert click["tid"] == test["tid"]
+    assert test["ts"] <= click["ts"]
+    assert click["ts"] + click["dur"] <= test["ts"] + test["dur"]
+
+
+def test_concurrent_tasks_get_own_tracks():
+    timeline = Timeline()
+    timeline.enable("pytest")
+
+    async def flow(name: str) -> None:
+        with timeline.span(name, "action"):
+            await asyncio.sleep(0.01)
+
+    async def scenario() -> None:
+        await asyncio.gather(flow("first"), flow("second"))
+
+    asyncio.run(scenario())
+
+    first, second = sorted(_spans(timeline), key=lambda event: event["name"])
+    # Спаны пересекаются по времени, поэтому лежат на разных дорожках
+    assert first["ts"] < second["ts"] + second["dur"]
+    assert second["ts"] < first["ts"] + first["dur"]
+    assert first["tid"] != second["tid"]
+    names = {e["tid"]: e["args"]["name"] for e in timeline.events() if e["name"] == "thread_name"}
+    assert " / Task-" in names[first["tid"]]
@@ -0,0 +1,118 @@
+import json
+import pytest
+from pages.timeouts import TimeoutPolicy, TimeoutRule, timeout_scope
+
+RULES = {"wait": TimeoutRule(default_ms=1000, floor_ms=200, ceiling_ms=5000)}
+STEPIK = "https://stepik.org"
+
+
+def _policy(**kwargs) -> TimeoutPolicy:
+    policy = TimeoutPolicy(RULES, safety=2.0, **kwargs)
+    policy.scope = STEPIK
+    return policy
+
+
+def test_default_until_min_samples():
+    policy = _policy(min_samples=3)
+    policy.observe("wait", 100)
+    policy.observe("wait", 100)
+
+    assert policy.timeout("wait") == 1000
+    policy.observe("wait", 100)
+    assert policy.timeout("wait") == 200
+
+
+def test_percentile_rank_times_safety():
+    policy = _policy(quantile=90, min_samples=1)
+    for value in range(100, 1100, 100):
+        policy.observe("wait", value)
+
+    # Ранг ceil(0.9 * 10) = 9 -> 900 мс, с запасом 2.0
+    assert policy.timeout("wait") == 1800
+
+
+@pytest.mark.parametrize("elapsed_ms, expected", [(10, 200), (10000, 5000)])
+def test_learned_timeout_is_clamped(elapsed_ms, expected):
+    policy = _policy(min_samples=1)
+    policy.observe("wait", elapsed_ms)
+
+    assert policy.timeout("wait") == expected
+
+
+def test_fixed_mode_ignores_history():
+    policy = _policy(mode="fixed", min_samples=1)
+    policy.observe("wait", 100)
+
+    assert policy.timeout("wait") == 1000
+
+
+def test_unknown_key():
+    with pytest.raises(ValueError):
+        _policy().timeout("missing")
+
+
+@pytest.mark.parametrize(
+    "base_url, scope",
+    [
+        ("https://stepik.org/", STEPIK),
+        ("https://stepik.org/catalog", STEPIK),
+        ("http://127.0.0.1:53117", "http://localhost"),
+        ("http://localhost:8080/", "http://localhost"),
+        ("http://[::1]:9000", "http://localhost"),
+        ("https://staging.stepik.org:8443", "https://staging.stepik.org:8443"),
+    ],
+)
+def test_timeout_scope(base_url, scope):
+    assert timeout_scope(base_url) == scope
+
+
+def test_scopes_are_separate():
+    policy = _policy(min_samples=1)
+    policy.observe("wait", 100, "http://127.0.0.1:40001")
+
+    assert policy.timeout("wait") == 1000
+    assert policy.timeout("wait", "http://127.0.0.1:40002") == 200
+    assert policy.timeout("wait", "http://localhost:5000") == 200
+
+
+def test_disabled_policy_does_not_observe():
+    policy = _policy(min_samples=1)
+    policy.enabled = False
+
+    policy.observe("wait", 100)
+    with policy.wait("wait") as timeout:
+        assert timeout == 1000
+
+    assert policy.timeout("wait") == 1000
+    assert policy.as_dict() == {}
+
+
+def test_failed_wait_is_not_observed():
+    policy = _policy(min_samples=1)
+
+    with pytest.raises(RuntimeError):
+        with policy.wait("wait"):
+            raise RuntimeError("Ожидание не удалось")
+
+    assert policy.as_dict() == {}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "timeouts.json"
+    path.write_text(json.dumps({"http://127.0.0.1:40001": {"wait": [50.0, 60.0]}}))
+    policy = TimeoutPolicy(RULES, window=3)
+    policy.load(path, "http://127.0.0.1:40002")
+    policy.observe("wait", 70)
+    policy.observe("wait", 80)
+    policy.merge({STEPIK: {"wait": [300.0]}})
+
+    policy.save(path)
+
+    assert json.loads(path.read_text()) == {
+        "http://localhost": {"wait": [60.0, 70.0, 80.0]},
+        STEPIK: {"wait": [300.0]},
+    }
+    loaded = TimeoutPolicy(RULES, min_samples=1)
+    loaded.load(path, STEPIK)
+    assert loaded.timeout("wait") == 900
+    assert loaded.timeout("wait", "http://localhost:1") == 240
@@ -0,0 +1,211 @@
+import hashlib
+import io
+import os
+import queue
+import re
+import threading
+import importlib
+import allure
+import structlog
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple
+from utils.session_stats import SESSION_STATS
+
+# Pillow перекодирует PNG в JPEG/WebP на фоновом потоке
+Image: Optional[ModuleType]
+try:
+    Image = importlib.import_module("PIL.Image")
+except ImportError:
+    Image = None
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_ARTIFACT_DIR = Path("artifacts")
+
+# Размеры окна и высота документа - для обрезки длинных страниц по max_height
+PAGE_GEOMETRY_SCRIPT = "() => [window.innerWidth, document.documentElement.scrollHeight]"
+
+MIME_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+EXTENSIONS = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+
+
+@dataclass
+class _Job:
+    raw: bytes
+    path: Path
+
+
+class ArtifactWriter:
+    """Фоновая запись скриншотов-артефактов
+
+    На потоке теста выполняется только сам снимок в PNG (не выше
+    ``max_height``) и хэширование. Перекодирование в JPEG/WebP и запись на
+    диск выполняются в отдельном потоке, пока тест идет дальше и завершается;
+    к Allure снимки прикрепляются в конце теста (``attach_pending``). Без
+    Pillow JPEG кодирует браузер при снимке, а WebP заменяется на JPEG.
+    Одинаковые снимки одного теста пишутся один раз (в Allure прикрепляется
+    тот же файл), имена файлов уникальны для теста, попытки перезапуска и
+    номера снимка.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path = DEFAULT_ARTIFACT_DIR,
+        fmt: str = "png",
+        quality: int = 80,
+        max_height: int = 4000,
+    ) -> None:
+        """
+        Args:
+            out_dir: Каталог для артефактов
+            fmt: Формат файлов: "png", "jpeg" или "webp" (WebP требует Pillow)
+            quality: Качество JPEG/WebP
+            max_height: Максимальная высота снимка в пикселях
+        """
+        if fmt not in MIME_TYPES:
+            raise ValueError(f"Неподдерживаемый формат артефактов: {fmt!r}")
+        if fmt == "webp" and Image is None:
+            logger.warning("Pillow не установлен, WebP заменен на JPEG")
+            fmt = "jpeg"
+        self.out_dir = Path(out_dir)
+        self.fmt = fmt
+        self.quality = quality
+        self.max_height = max_height
+        self._test_dir = self.out_dir / "session"
+        self._prefix = "try1"
+        self._counter = 0
+        self._seen: Dict[str, Path] = {}
+        self._pending: List[Tuple[Path, str]] = []
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def start_test(self, nodeid: str, attempt: int) -> None:
+        """Переключиться на новый тест или попытку перезапуска"""
+        self._test_dir = self.out_dir / re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+        self._prefix = f"try{attempt}"
+        self._counter = 0
+        self._seen.clear()
+        self._pending.clear()
+
+    @property
+    def test_dir(self) -> Path:
+        """Каталог артефактов текущего теста"""
+        return self._test_dir
+
+    @property
+    def attempt_prefix(self) -> str:
+        """Префикс файлов текущей попытки (``try2``)"""
+        return self._prefix
+
+    def screenshot_options(self, width: int, height: int) -> dict:
+        """Аргументы page.screenshot с учетом формата и ограничения высоты"""
+        options: dict = {
+            "full_page": True,
+            "clip": {"x": 0, "y": 0, "width": width, "height": min(height, self.max_height)},
+        }
+        if self.fmt == "jpeg" and Image is None:
+            # Перекодировать нечем: JPEG сразу отдает браузер
+            options.update(type="jpeg", quality=self.quality)
+        return options
+
+    def capture(self, page, name: str, attach: bool = True) -> Path:
+        """Снять скриншот sync-страницы и отдать его на фоновую запись"""
+        width, height = page.evaluate(PAGE_GEOMETRY_SCRIPT)
+        return self.submit(page.screenshot(**self.screenshot_options(width, height)), name, attach)
+
+    def submit(self, raw: bytes, name: str, attach: bool = True) -> Path:
+        """Поставить готовый снимок в очередь записи
+
+        :return: Путь, по которому будет (или уже был) записан файл
+        """
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest in self._seen:
+            path = self._seen[digest]
+            SESSION_STATS.add("artifacts", duplicates=1)
+            if attach:
+                self._pending.append((path, name))
+            return path
+
+        self._counter += 1
+        safe_name = re.sub(r"[^\w.-]+", "_", name)
+        path = self._test_dir / f"{safe_name}-{self._prefix}-{self._counter}.{EXTENSIONS[self.fmt]}"
+        self._seen[digest] = path
+        if attach:
+            self._pending.append((path, name))
+        self._queue.put(_Job(raw, path))
+        return path
+
+    def attach_pending(self) -> None:
+        """Дождаться записи снимков теста и прикрепить их к Allure
+
+        Вызывается из потока теста, пока тест открыт в Allure (в конце teardown).
+        """
+        if not self._pending:
+            return
+        self.flush()
+        for path, name in self._pending:
+            if path.exists():
+                allure.attach.file(
+                    str(path),
+                    name=name,
+                    attachment_type=MIME_TYPES[self.fmt],
+                    extension=EXTENSIONS[self.fmt],
+                )
+        self._pending.clear()
+
+    def _encode(self, raw: bytes) -> bytes:
+        """PNG снимка в формат артефактов (на фоновом потоке)"""
+        if self.fmt == "png" or Image is None:
+            return raw
+        with Image.open(io.BytesIO(raw)) as image:
+            buffer = io.BytesIO()
+            if self.fmt == "jpeg":
+                image.convert("RGB").save(buffer, format="JPEG", quality=self.quality)
+            else:
+                image.save(buffer, format="WEBP", quality=self.quality)
+            return buffer.getvalue()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+            try:
+                data = self._encode(job.raw)
+                job.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = job.path.with_suffix(".tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, job.path)
+                SESSION_STATS.add(
+                    "artifacts", written=1, raw_bytes=len(job.raw), written_bytes=len(data)
+                )
+            except Exception as e:
+                logger.error("Не удалось записать артефакт", path=str(job.path), error=str(e))
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Дождаться записи всех поставленных в очередь снимков"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Дописать очередь и остановить фоновый поток"""
+        self._queue.put(None)
+        self._thread.join()
+
+
+_writer: Optional[ArtifactWriter] = None
+
+
+def set_artifact_writer(writer: Optional[ArtifactWriter]) -> None:
+    global _writer
+    _writer = writer
+
+
+def get_artifact_writer() -> Optional[ArtifactWriter]:
+    """Активный писатель артефактов сессии (None вне pytest)"""
+    return _writer
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import time
+import structlog
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+from utils.filelock import FileLock
+from utils.session_stats import SESSION_STATS
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_ASSET_CACHE_DIR = Path(".e2e-cache") / "assets"
+DEFAULT_MAX_MB = 200
+
+# Кэшируется только статика: бандл SPA, стили, шрифты, картинки
+CACHED_RESOURCE_TYPES = frozenset({"script", "stylesheet", "font", "image"})
+
+# Тело в кэше хранится раскодированным, эти заголовки отдавать как есть нельзя
+_SKIPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+# Vary с такими заголовками не мешает отдавать один ответ всем тестам
+_HARMLESS_VARY = frozenset({"accept-encoding", "origin"})
+
+# "immutable" - ресурс не меняется, пока не сменится URL (хэш в имени бандла)
+IMMUTABLE_SECONDS = 365 * 24 * 3600
+
+
+def freshness(headers: Mapping[str, str]) -> Optional[float]:
+    """Сколько секунд ответ свеж по Cache-Control
+
+    Returns:
+        None - ответ не кэшируется; 0 - кэшируется, но перед выдачей
+        ревалидируется (If-None-Match / If-Modified-Since)
+    """
+    directives: Dict[str, str] = {}
+    for item in headers.get("cache-control", "").split(","):
+        name, _, value = item.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    vary = {v.strip().lower() for v in headers.get("vary", "").split(",") if v.strip()}
+    if "no-store" in directives or vary - _HARMLESS_VARY:
+        return None
+    if "immutable" in directives:
+        return IMMUTABLE_SECONDS
+    max_age = directives.get("max-age", "")
+    seconds = 0.0 if "no-cache" in directives or not max_age.isdigit() else float(max_age)
+    if seconds <= 0 and not (headers.get("etag") or headers.get("last-modified")):
+        # Без срока и валидаторов ответ нельзя ни отдать, ни проверить
+        return None
+    return seconds
+
+
+class AssetCache:
+    """Постоянный кэш статики на уровне ``context.route``, общий для тестов и прогонов
+
+    Каждый новый контекст Playwright начинает с пустым HTTP-кэшем, поэтому
+    без этого кэша каждый тест заново скачивает бандл каталога, стили и
+    шрифты. Тела ответов лежат по SHA-256 содержимого (``blobs/``), записи по
+    URL (``entries/``) хранят заголовки, ETag/Last-Modified и срок свежести.
+    Свежий ответ отдается из кэша без сети, устаревший - после условного
+    запроса (304 - отдается кэш). Общий размер ограничен: ``evict()`` удаляет
+    давно не использованные записи. Записи и тела пишутся атомарно, поэтому
+    кэш безопасно делить между воркерами xdist.
+    """
+
+    def __init__(self, root: Path = DEFAULT_ASSET_CACHE_DIR, max_bytes: int = DEFAULT_MAX_MB << 20):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._entries_dir = self.root / "entries"
+        self._blobs_dir = self.root / "blobs"
+        self.stats: Counter = Counter()
+
+    @staticmethod
+    def cacheable(request) -> bool:
+        return request.method == "GET" and request.resource_type in CACHED_RESOURCE_TYPES
+
+    def _entry_path(self, url: str) -> Path:
+        return self._entries_dir / (hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def lookup(self, url: str) -> Optional[Tuple[dict, bytes]]:
+        """Запись и тело для URL или None (нет записи или тело вытеснено)"""
+        path = self._entry_path(url)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            body = (self._blobs_dir / entry["sha256"]).read_bytes()
+            if entry.get("url") != url:
+                return None
+            # mtime записи - время последнего использования для вытеснения.
+            # Запись могли вытеснить после чтения: тогда это промах
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry, body
+
+    def store(self, url: str, status: int, headers: Mapping[str, str], body: bytes) -> bool:
+        """Сохранить ответ, если его разрешено кэшировать"""
+        fresh_for = freshness(headers) if status == 200 else None
+        if fresh_for is None:
+            return False
+        sha256 = hashlib.sha256(body).hexdigest()
+        blob = self._blobs_dir / sha256
+        if not blob.exists():
+            self._write_atomic(blob, body)
+        entry = {
+            "url": url,
+            "sha256": sha256,
+            "size": len(body),
+            "headers": {k: v for k, v in headers.items() if k.lower() not in _SKIPPED_HEADERS},
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "stored_at": time.time(),
+            "fresh_for": fresh_for,
+        }
+        self._write_atomic(self._entry_path(url), json.dumps(entry).encode())
+        self.stats["stored"] += 1
+        return True
+
+    def refresh(self, entry: dict, headers: Mapping[str, str]) -> None:
+        """Продлить запись после ответа 304 или удалить, если ответ больше не кэшируется"""
+        fresh_for = freshness({**entry["headers"], **headers})
+        path = self._entry_path(entry["url"])
+        if fresh_for is None:
+            # Тело еще годно для этого запроса, но хранить его дальше нельзя
+            path.unlink(missing_ok=True)
+            self.stats["dropped"] += 1
+            return
+        entry.update(stored_at=time.time(), fresh_for=fresh_for)
+        self._write_atomic(path, json.dumps(entry).encode())
+
+    @staticmethod
+    def is_fresh(entry: dict) -> bool:
+        return bool(time.time() - entry["stored_at"] < entry["fresh_for"])
+
+    @staticmethod
+    def validators(entry: dict) -> Dict[str, str]:
+        """Заголовки условного запроса для ревалидации"""
+        headers = {}
+        if entry.get("etag"):
+            headers["if-none-match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["if-modified-since"] = entry["last_modified"]
+        return headers
+
+    def _hit(self, kind: str, entry: dict) -> dict:
+        self.stats[kind] += 1
+        self.stats["bytes_saved"] += entry["size"]
+        return {"status": 200, "headers": entry["headers"]}
+
+    def _handle(self, route) -> None:
+        request = route.request
+        if not self.cacheable(request):
+            route.fallback()
+            return
+        self.stats["requests"] += 1
+        cached = self.lookup(request.url)
+        if cached is not None:
+            entry, body = cached
+            if self.is_fresh(entry):
+                route.fulfill(body=body, **self._hit("hits", entry))
+                return
+            response = route.fetch(headers={**request.headers, **self.validators(entry)})
+            if response.status == 304:
+                self.refresh(entry, response.headers)
+                route.fulfill(body=body, **self._hit("revalidated", entry))
+                return
+        else:
+            response = route.fetch()
+        self.stats["misses"] += 1
+        body = response.body()
+        self.store(request.url, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    async def _handle_async(self, route) -> None:
+        request = route.request
+        if not self.cacheable(request):
+            await route.fallback()
+            return
+        self.stats["requests"] += 1
+        cached = self.lookup(request.url)
+        if cached is not None:
+            entry, body = cached
+            if self.is_fresh(entry):
+                await route.fulfill(body=body, **self._hit("hits", entry))
+                return
+            response = await route.fetch(headers={**request.headers, **self.validators(entry)})
+            if response.status == 304:
+                self.refresh(entry, response.headers)
+                await route.fulfill(body=body, **self._hit("revalidated", entry))
+                return
+        else:
+            response = await route.fetch()
+        self.stats["misses"] += 1
+        body = await response.body()
+        self.store(request.url, response.status, response.headers, body)
+        await route.fulfill(response=response, body=body)
+
+    def install(self, context) -> None:
+        """Подключить кэш к sync BrowserContext (до блокировки ресурсов: она срабатывает раньше)"""
+        context.route("**/*", self._handle)
+
+    def uninstall(self, context) -> None:
+        """Отключить кэш от sync BrowserContext (для переиспользуемых контекстов)"""
+        context.unroute("**/*", self._handle)
+
+    async def install_async(self, context) -> None:
+        """Подключить кэш к async BrowserContext"""
+        await context.route("**/*", self._handle_async)
+
+    def evict(self) -> int:
+        """Удалить давно не использованные записи сверх max_bytes; вернуть размер кэша в байтах"""
+        with FileLock(self.root / "evict.lock"):
+            entries: List[Tuple[float, Path, str, int]] = []
+            for path in self._entries_dir.glob("*.json"):
+                try:
+                    entry = json.loads(path.read_text(encoding="utf-8"))
+                    entries.append((path.stat().st_mtime, path, entry["sha256"], entry["size"]))
+                except (OSError, ValueError, KeyError):
+                    path.unlink(missing_ok=True)
+            refs = Counter(sha256 for _, _, sha256, _ in entries)
+            sizes = {sha256: size for _, _, sha256, size in entries}
+            total = sum(sizes.values())
+            evicted = 0
+            for _, path, sha256, size in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                evicted += 1
+                refs[sha256] -= 1
+                if refs[sha256] == 0:
+                    total -= size
+            for blob in self._blobs_dir.glob("*"):
+                if refs.get(blob.name, 0) <= 0:
+                    blob.unlink(missing_ok=True)
+        if evicted:
+            logger.info("Вытеснены записи кэша статики", entries=evicted, size_mb=total >> 20)
+        return total
+
+    def report(self) -> None:
+        """Счетчики процесса в SESSION_STATS (раздел "asset_cache")"""
+        if self.stats["requests"]:
+            SESSION_STATS.add("asset_cache", **self.stats)
@@ -0,0 +1,122 @@
+import hashlib
+import os
+import time
+import structlog
+from pathlib import Path
+from typing import Callable, Literal, Optional, TypedDict
+from playwright.sync_api import Browser, BrowserContext, Page
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_CACHE_DIR = Path(".e2e-cache") / "auth"
+
+
+class CookieParam(TypedDict, total=False):
+    """Cookie для ``context.add_cookies``
+
+    Повторяет поля параметра Playwright, который не экспортируется из
+    ``playwright.sync_api``; cookies из storage_state подходят как есть.
+    """
+
+    name: str
+    value: str
+    url: Optional[str]
+    domain: Optional[str]
+    path: Optional[str]
+    expires: Optional[float]
+    httpOnly: Optional[bool]
+    secure: Optional[bool]
+    sameSite: Optional[Literal["Lax", "None", "Strict"]]
+    partitionKey: Optional[str]
+
+
+class AuthStateCache:
+    """Дисковый кэш авторизованного storage_state (cookies + localStorage)
+
+    Файл кэша привязан к логину пользователя, поэтому разные учетные записи
+    не перетирают сессии друг друга. Запись атомарная (через временный файл),
+    чтобы параллельные воркеры xdist никогда не прочитали половину JSON.
+    """
+
+    def __init__(self, login: str, cache_dir: Path = DEFAULT_CACHE_DIR, ttl: float = 3600) -> None:
+        """
+        Args:
+            login: Логин пользователя, для которого кэшируется сессия
+            cache_dir: Каталог для файлов storage_state
+            ttl: Время жизни кэша в секундах
+        """
+        digest = hashlib.sha256(login.encode()).hexdigest()[:16]
+        self.path = Path(cache_dir) / f"storage_state_{digest}.json"
+        self.ttl = ttl
+        self.log = logger.bind(cache=str(self.path))
+
+    def age(self) -> Optional[float]:
+        """Возраст файла кэша в секундах или None, если кэша нет"""
+        try:
+            return time.time() - self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def is_fresh(self) -> bool:
+        """Кэш существует и не старше TTL"""
+        age = self.age()
+        return age is not None and age < self.ttl
+
+    def save(self, context: BrowserContext) -> Path:
+        """Сохранить storage_state контекста в кэш"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        context.storage_state(path=str(tmp_path))
+        os.replace(tmp_path, self.path)
+        self.log.info("Состояние авторизации сохранено в кэш")
+        return self.path
+
+    def invalidate(self) -> None:
+        """Удалить файл кэша"""
+        self.path.unlink(missing_ok=True)
+        self.log.info("Кэш авторизации сброшен")
+
+    def probe(self, browser: Browser, check: Callable[[Page], bool]) -> bool:
+        """Проверить, что сохраненная сессия все еще действительна
+
+        Args:
+            browser: Браузер, в котором открывается проверочный контекст
+            check: Проверка страницы из контекста с кэшированным состоянием
+        """
+        context = browser.new_context(storage_state=str(self.path))
+        try:
+            is_valid = check(context.new_page())
+        except Exception as e:
+            self.log.warning("Проверка кэша авторизации упала", error=str(e))
+            is_valid = False
+        finally:
+            context.close()
+
+        self.log.info("Проверка кэша авторизации", is_valid=is_valid)
+        return is_valid
+
+    def ensure(
+        self,
+        browser: Browser,
+        login: Callable[[Page], None],
+        check: Callable[[Page], bool],
+    ) -> Path:
+        """Вернуть путь к действительному storage_state, при необходимости авторизовавшись
+
+        Args:
+            browser: Браузер для проверки и авторизации
+            login: Полный вход в систему на переданной странице
+            check: Проверка действительности сессии
+        """
+        if self.is_fresh() and self.probe(browser, check):
+            self.log.info("Используется кэш авторизации", age=round(self.age() or 0))
+            return self.path
+
+        self.log.info("Кэш авторизации устарел или недействителен, выполняется вход")
+        context = browser.new_context()
+        try:
+            login(context.new_page())
+            self.save(context)
+        finally:
+            context.close()
+        return self.path
@@ -0,0 +1,183 @@
+import allure
+import json
+import os
+import re
+import time
+import structlog
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, cast
+from urllib.parse import urlsplit
+from playwright.sync_api import Page, StorageState
+from utils.auth_state import CookieParam
+from utils.session_stats import SESSION_STATS
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = Path(".e2e-cache") / "checkpoints"
+
+# localStorage origin текущей страницы из storage_state. Пишется один раз через
+# page.evaluate: init-скрипт остался бы в контексте (в том числе в пуле) и
+# перетирал бы localStorage при каждой следующей навигации
+_RESTORE_LOCAL_STORAGE_SCRIPT = """
+(items) => {
+    try {
+        for (const { name, value } of items) localStorage.setItem(name, value);
+    } catch (e) {}
+}
+"""
+
+
+@dataclass
+class Step:
+    """Шаг сценария внутри ``Checkpoints.step``
+
+    Attributes:
+        title: Название шага (оно же заголовок allure.step)
+        pending: False - шаг восстановлен из контрольной точки, тело выполнять не нужно
+        data: Данные шага для следующих шагов (JSON), сохраняются в контрольной точке
+        page: Текущая страница сценария; шаг, открывший новую вкладку, подменяет ее
+    """
+
+    title: str
+    pending: bool
+    page: Page
+    data: dict = field(default_factory=dict)
+
+
+class Checkpoints:
+    """Контрольные точки шагов теста для перезапуска с места падения
+
+    После каждого успешного шага сохраняются storage_state контекста, URL
+    текущей страницы и ``step.data``. В перезапуске упавшего теста пройденные
+    шаги не выполняются: перед первым невыполненным шагом контекст получает
+    сохраненное состояние, а страница открывается на URL последней точки.
+
+    Пример::
+
+        with checkpoints.step("2. Поиск курсов") as step:
+            if step.pending:
+                catalog_page.search_courses("python")
+    """
+
+    def __init__(self, nodeid: str, page: Page, store_dir: Path, resume: bool) -> None:
+        """
+        Args:
+            nodeid: Тест, которому принадлежат контрольные точки
+            page: Основная страница теста
+            store_dir: Каталог файлов контрольных точек
+            resume: Продолжать с сохраненных точек (перезапуск) или начать заново
+        """
+        self.path = Path(store_dir) / (re.sub(r"[^\w.-]+", "_", nodeid).strip("_") + ".json")
+        self.page = page
+        self.log = logger.bind(test=nodeid)
+        self.skipped: List[str] = []
+        self.seconds_saved = 0.0
+        self._steps: List[dict] = []
+        self._storage_state: Optional[StorageState] = None
+        self._saved: Dict[str, dict] = {}
+        self._replaying = False
+
+        if resume:
+            self._load()
+        else:
+            self.path.unlink(missing_ok=True)
+
+    def _load(self) -> None:
+        try:
+            saved = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.log.warning("Не удалось прочитать контрольные точки", error=str(e))
+            return
+        self._saved = {step["title"]: step for step in saved["steps"]}
+        self._storage_state = saved.get("storage_state")
+        self.log.info("Найдены контрольные точки", steps=list(self._saved))
+
+    @contextmanager
+    def step(self, title: str) -> Iterator[Step]:
+        """Шаг сценария: восстановленный из контрольной точки или выполняемый"""
+        saved = None if self._replaying else self._saved.get(title)
+        if saved is not None:
+            with allure.step(f"{title} (из контрольной точки)"):
+                self._steps.append(saved)
+                self.skipped.append(title)
+                self.seconds_saved += saved["seconds"]
+                yield Step(title, pending=False, page=self.page, data=dict(saved["data"]))
+            return
+
+        if not self._replaying:
+            # Первый невыполненный шаг: дальше все шаги выполняются по-настоящему
+            self._replaying = True
+            if self._steps:
+                self._restore(self._steps[-1])
+
+        step = Step(title, pending=True, page=self.page)
+        started = time.monotonic()
+        with allure.step(title):
+            yield step
+        self.page = step.page
+        self._save(step, time.monotonic() - started)
+
+    def _restore(self, last: dict) -> None:
+        """Вернуть контекст и страницу в состояние последней контрольной точки"""
+        self.log.info("Продолжение с контрольной точки", step=last["title"], url=last["url"])
+        context = self.page.context
+        if self._storage_state is not None:
+            context.clear_cookies()
+            # Cookie из storage_state - подмножество полей CookieParam
+            cookies = cast(List[CookieParam], self._storage_state.get("cookies", []))
+            context.add_cookies(cookies)
+        try:
+            self.page.goto(last["url"], wait_until="domcontentloaded")
+            if self._restore_local_storage():
+                # Приложение читает localStorage при загрузке страницы
+                self.page.reload(wait_until="domcontentloaded")
+        except Exception:
+            # Следующая попытка должна пройти сценарий целиком
+            self.path.unlink(missing_ok=True)
+            raise
+
+    def _restore_local_storage(self) -> bool:
+        """Записать сохраненный localStorage origin текущей страницы; False - записывать нечего"""
+        if self._storage_state is None:
+            return False
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(self.page.url))
+        for state in self._storage_state.get("origins", []):
+            if state["origin"] == origin and state["localStorage"]:
+                self.page.evaluate(_RESTORE_LOCAL_STORAGE_SCRIPT, state["localStorage"])
+                return True
+        return False
+
+    def _save(self, step: Step, seconds: float) -> None:
+        """Записать контрольную точку шага (атомарно)"""
+        self._steps.append(
+            {"title": step.title, "url": step.page.url, "data": step.data, "seconds": seconds}
+        )
+        self._storage_state = step.page.context.storage_state()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"steps": self._steps, "storage_state": self._storage_state}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
+
+    def finish(self, passed: bool) -> None:
+        """Завершить попытку: после успеха точки не нужны, сводка в статистику сессии"""
+        if passed:
+            self.path.unlink(missing_ok=True)
+        if self.skipped:
+            self.log.info(
+                "Шаги восстановлены из контрольных точек",
+                steps=self.skipped,
+                seconds_saved=round(self.seconds_saved, 1),
+            )
+            SESSION_STATS.add(
+                "checkpoints",
+                resumed_tests=1,
+                steps_skipped=len(self.skipped),
+                seconds_saved=self.seconds_saved,
+            )
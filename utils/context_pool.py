@@ -0,0 +1,209 @@
+import json
+import time
+import structlog
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional
+from urllib.parse import urlsplit
+from playwright.sync_api import BrowserContext, Page
+from utils.auth_state import CookieParam
+from utils.session_stats import SESSION_STATS
+
+logger = structlog.get_logger(__name__)
+
+_CLEAR_STORAGE_SCRIPT = """
+(items) => {
+    try {
+        localStorage.clear();
+        sessionStorage.clear();
+        for (const { name, value } of items) localStorage.setItem(name, value);
+    } catch (e) {}
+}
+"""
+
+
+@dataclass
+class PooledContext:
+    """Контекст из пула вместе с его основной страницей"""
+
+    context: BrowserContext
+    page: Page
+    uses: int = 0
+
+
+class ContextPool:
+    """Пул "теплых" BrowserContext/Page внутри одного воркера
+
+    Контексты создаются заранее (``prewarm``) и после теста не закрываются,
+    а дешево сбрасываются: cookies и storage очищаются (cookies и localStorage
+    из исходного storage_state восстанавливаются), лишние вкладки закрываются,
+    страница уходит на about:blank. localStorage других origin (iframe,
+    переходы на другие сайты) очищается через CDP; если это невозможно, контекст
+    выбывает из пула. Контекст выбывает и если не прошел проверку здоровья или
+    отработал ``max_reuse`` тестов.
+
+    Sync API Playwright привязан к своему потоку, поэтому "фоновое" пополнение
+    выполняется не в отдельном потоке, а на teardown теста и при старте сессии.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], BrowserContext],
+        size: int,
+        max_reuse: int = 20,
+        storage_state: Optional[str] = None,
+        page_timeout: Callable[[], float] = lambda: 30000,
+        navigation_timeout: Callable[[], float] = lambda: 30000,
+    ) -> None:
+        """
+        Args:
+            factory: Создание нового контекста с нужными параметрами
+            size: Сколько контекстов держать наготове
+            max_reuse: Сколько тестов может отработать один контекст
+            storage_state: storage_state, которым инициализируются контексты
+            page_timeout: Таймаут действий страницы; читается при каждой выдаче
+                контекста, поэтому выученный по ходу сессии таймаут подхватывается
+            navigation_timeout: Таймаут навигации страницы, читается так же
+        """
+        self.factory = factory
+        self.size = size
+        self.max_reuse = max_reuse
+        self.page_timeout = page_timeout
+        self.navigation_timeout = navigation_timeout
+        self._idle: Deque[PooledContext] = deque()
+        self._leased: Dict[int, PooledContext] = {}
+        self._base_cookies: List[CookieParam] = []
+        self._base_storage: Dict[str, List[dict]] = {}
+        if storage_state:
+            state = json.loads(Path(storage_state).read_text())
+            self._base_cookies = state.get("cookies", [])
+            self._base_storage = {
+                origin["origin"]: origin.get("localStorage", [])
+                for origin in state.get("origins", [])
+            }
+
+    def _create(self) -> PooledContext:
+        context = self.factory()
+        return PooledContext(context, context.new_page())
+
+    def prewarm(self) -> None:
+        """Заполнить пул до заданного размера"""
+        started = time.perf_counter()
+        while len(self._idle) + len(self._leased) < self.size:
+            self._idle.append(self._create())
+        logger.info(
+            "Пул контекстов прогрет",
+            size=len(self._idle),
+            duration_ms=round((time.perf_counter() - started) * 1000),
+        )
+
+    def acquire(self) -> PooledContext:
+        """Выдать контекст тесту: из пула (hit) или новый (miss)"""
+        started = time.perf_counter()
+        if self._idle:
+            item = self._idle.popleft()
+            outcome = "hits"
+        else:
+            item = self._create()
+            outcome = "misses"
+        item.uses += 1
+        item.page.set_default_timeout(self.page_timeout())
+        item.page.set_default_navigation_timeout(self.navigation_timeout())
+        self._leased[id(item.context)] = item
+
+        acquire_ms = (time.perf_counter() - started) * 1000
+        SESSION_STATS.add("context_pool", **{outcome: 1}, acquires=1, acquire_ms=acquire_ms)
+        logger.debug("Контекст выдан из пула", outcome=outcome, acquire_ms=round(acquire_ms, 1))
+        return item
+
+    def page_for(self, context: BrowserContext) -> Optional[Page]:
+        """Основная страница контекста, если он выдан из пула"""
+        item = self._leased.get(id(context))
+        return item.page if item else None
+
+    def release(self, context: BrowserContext) -> None:
+        """Вернуть контекст в пул после сброса или выбросить его"""
+        item = self._leased.pop(id(context))
+        if item.uses >= self.max_reuse or not self._reset(item):
+            self._evict(item)
+            self.prewarm()
+            return
+        self._idle.append(item)
+
+    def _reset(self, item: PooledContext) -> bool:
+        """Дешевый сброс состояния контекста. Возвращает результат проверки здоровья"""
+        try:
+            context, page = item.context, item.page
+            context.unroute_all(behavior="ignoreErrors")
+            for extra_page in context.pages:
+                if extra_page is not page:
+                    extra_page.close()
+
+            origin = "{0.scheme}://{0.netloc}".format(urlsplit(page.url))
+            page.evaluate(_CLEAR_STORAGE_SCRIPT, self._base_storage.get(origin, []))
+            if not self._clear_other_origins(context, page, origin):
+                return False
+
+            context.clear_cookies()
+            if self._base_cookies:
+                context.add_cookies(self._base_cookies)
+            context.clear_permissions()
+            page.goto("about:blank")
+            return self._is_healthy(item)
+        except Exception as e:
+            logger.warning("Не удалось сбросить контекст из пула", error=str(e))
+            return False
+
+    def _clear_other_origins(self, context: BrowserContext, page: Page, current: str) -> bool:
+        """Очистить localStorage остальных origin, измененный тестом
+
+        Такой storage нельзя очистить из страницы, поэтому используется CDP
+        (только Chromium). Возвращает False, если контекст нельзя вернуть в
+        исходное состояние: CDP недоступен или изменен storage origin из
+        исходного storage_state (восстановить его без перехода на origin нельзя).
+        """
+        dirty = []
+        for state in context.storage_state()["origins"]:
+            items = {(item["name"], item["value"]) for item in state["localStorage"]}
+            base = self._base_storage.get(state["origin"], [])
+            if state["origin"] != current and items != {(i["name"], i["value"]) for i in base}:
+                dirty.append(state["origin"])
+        if not dirty:
+            return True
+        try:
+            cdp = context.new_cdp_session(page)
+        except Exception as e:
+            logger.debug("CDP недоступен, storage других origin не очистить", error=str(e))
+            return False
+        try:
+            for origin in dirty:
+                cdp.send(
+                    "Storage.clearDataForOrigin",
+                    {"origin": origin, "storageTypes": "local_storage"},
+                )
+        finally:
+            cdp.detach()
+        return not any(origin in self._base_storage for origin in dirty)
+
+    @staticmethod
+    def _is_healthy(item: PooledContext) -> bool:
+        if item.page.is_closed() or item.page not in item.context.pages:
+            return False
+        result = item.page.evaluate("1 + 1")
+        return bool(result == 2)
+
+    def _evict(self, item: PooledContext) -> None:
+        SESSION_STATS.add("context_pool", evicted=1)
+        logger.debug("Контекст выброшен из пула", uses=item.uses)
+        try:
+            item.context.close()
+        except Exception as e:
+            logger.debug("Ошибка при закрытии контекста", error=str(e))
+
+    def close(self) -> None:
+        """Закрыть все контексты пула"""
+        for item in list(self._idle) + list(self._leased.values()):
+            item.context.close()
+        self._idle.clear()
+        self._leased.clear()
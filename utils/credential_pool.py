@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import time
+import structlog
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from utils.filelock import FileLock
+from utils.session_stats import SESSION_STATS
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_POOL_DIR = Path(".e2e-cache") / "credentials"
+DEFAULT_ACCOUNTS_FILE = Path(".e2e-accounts")
+
+# Учетная запись снимается с раздачи после стольких неудачных входов подряд
+MAX_LOGIN_FAILURES = 3
+
+
+@dataclass(frozen=True)
+class Account:
+    """Учетная запись Stepik"""
+
+    login: str
+    password: str
+
+    @property
+    def key(self) -> str:
+        """Имя файлов блокировки без логина в открытом виде"""
+        return hashlib.sha256(self.login.encode()).hexdigest()[:16]
+
+    def as_credentials(self) -> dict:
+        return {"login": self.login, "password": self.password}
+
+
+def _parse_accounts(lines: List[str]) -> List[Account]:
+    accounts = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        login, sep, password = line.partition(":")
+        if not sep:
+            raise ValueError(f"Ожидается login:password, получено {line.split(':')[0]!r}")
+        accounts.append(Account(login.strip(), password.strip()))
+    return accounts
+
+
+def load_accounts(path: Optional[Path] = None) -> List[Account]:
+    """Учетные записи пула
+
+    Источники по порядку: файл ``path`` (или ``STEPIK_ACCOUNTS_FILE``, или
+    ``.e2e-accounts``) со строками ``login:password``; переменная
+    ``STEPIK_ACCOUNTS`` со списком ``login:password`` через запятую. Пустой
+    список означает, что пула нет и используется пара STEPIK_LOGIN/STEPIK_PASSWORD.
+    """
+    path = path or Path(os.getenv("STEPIK_ACCOUNTS_FILE", DEFAULT_ACCOUNTS_FILE))
+    if path.exists():
+        return _parse_accounts(path.read_text(encoding="utf-8").splitlines())
+    return _parse_accounts(os.getenv("STEPIK_ACCOUNTS", "").split(","))
+
+
+class CredentialPool:
+    """Пул учетных записей с исключительной арендой между процессами
+
+    Каждая запись защищена файловой блокировкой в ``pool_dir``: воркеры xdist
+    (или тесты) получают разные учетные записи и не выбивают сессии друг
+    друга. Общий файл ``health.json`` (под своей блокировкой) хранит время
+    последнего входа для ограничения частоты входов, число неудачных входов
+    подряд и статистику аренды по каждой записи.
+    """
+
+    def __init__(
+        self,
+        accounts: List[Account],
+        pool_dir: Path = DEFAULT_POOL_DIR,
+        min_login_interval: float = 5.0,
+        wait_timeout: float = 300.0,
+    ) -> None:
+        """
+        Args:
+            accounts: Учетные записи
+            pool_dir: Каталог блокировок и health.json
+            min_login_interval: Минимальная пауза между входами под одной записью, секунды
+            wait_timeout: Сколько ждать свободную запись, секунды
+        """
+        if not accounts:
+            raise ValueError("Пул учетных записей пуст")
+        self.accounts = accounts
+        self.pool_dir = Path(pool_dir)
+        self.min_login_interval = min_login_interval
+        self.wait_timeout = wait_timeout
+        self._health_lock = FileLock(self.pool_dir / "health.lock")
+
+    @contextmanager
+    def _health(self) -> Iterator[Dict[str, dict]]:
+        """Прочитать и после изменения записать health.json под блокировкой"""
+        path = self.pool_dir / "health.json"
+        with self._health_lock:
+            try:
+                health = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                health = {}
+            yield health
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(health, indent=1, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, path)
+
+    def _candidates(self) -> List[Account]:
+        """Сначала здоровые и давно не входившие записи; больные - только если других нет"""
+        with self._health() as health:
+            stats = {account.key: health.get(account.key, {}) for account in self.accounts}
+        healthy = [a for a in self.accounts if stats[a.key].get("failures", 0) < MAX_LOGIN_FAILURES]
+        ordered = healthy or self.accounts
+        return sorted(ordered, key=lambda a: stats[a.key].get("last_login", 0.0))
+
+    def lease(self, owner: str) -> "Lease":
+        """Арендовать свободную учетную запись, дожидаясь ее не дольше wait_timeout"""
+        started = time.monotonic()
+        while True:
+            for account in self._candidates():
+                lock = FileLock(self.pool_dir / f"{account.key}.lock")
+                if lock.try_acquire():
+                    wait = time.monotonic() - started
+                    logger.info(
+                        "Учетная запись арендована",
+                        owner=owner,
+                        login=account.login[:3] + "***",
+                        wait_ms=round(wait * 1000),
+                    )
+                    return Lease(self, account, lock, owner, wait)
+            if time.monotonic() - started > self.wait_timeout:
+                raise TimeoutError(
+                    f"Нет свободной учетной записи за {self.wait_timeout:.0f} с "
+                    f"(в пуле {len(self.accounts)})"
+                )
+            time.sleep(0.2)
+
+    def wait_for_login_slot(self, account: Account) -> float:
+        """Выдержать паузу между входами под записью; вернуть время ожидания, секунды"""
+        with self._health() as health:
+            entry = health.setdefault(account.key, {})
+            now = time.time()
+            slot: float = max(now, entry.get("last_login", 0.0) + self.min_login_interval)
+            entry["last_login"] = slot
+        delay = slot - now
+        if delay > 0:
+            logger.info("Ограничение частоты входов", delay_s=round(delay, 1))
+            time.sleep(delay)
+        return delay
+
+    def record_login(self, account: Account, ok: bool) -> None:
+        with self._health() as health:
+            entry = health.setdefault(account.key, {})
+            entry["failures"] = 0 if ok else entry.get("failures", 0) + 1
+            if entry["failures"] >= MAX_LOGIN_FAILURES:
+                logger.warning("Учетная запись снята с раздачи", login=account.login[:3] + "***")
+
+    def record_lease(self, account: Account, held: float) -> None:
+        with self._health() as health:
+            entry = health.setdefault(account.key, {})
+            entry["leases"] = entry.get("leases", 0) + 1
+            entry["held_s"] = round(entry.get("held_s", 0.0) + held, 1)
+
+
+class Lease:
+    """Аренда учетной записи; освобождается через release()"""
+
+    def __init__(
+        self, pool: CredentialPool, account: Account, lock: FileLock, owner: str, wait: float
+    ) -> None:
+        self.pool = pool
+        self.account = account
+        self.owner = owner
+        self.wait = wait
+        self._lock = lock
+        self._started = time.monotonic()
+
+    @property
+    def credentials(self) -> dict:
+        return self.account.as_credentials()
+
+    @contextmanager
+    def logging_in(self) -> Iterator[None]:
+        """Вход под арендованной записью: ограничение частоты и учет неудач"""
+        throttled = self.pool.wait_for_login_slot(self.account)
+        SESSION_STATS.add("credentials", logins=1, login_throttle_ms=throttled * 1000)
+        try:
+            yield
+        except Exception:
+            self.pool.record_login(self.account, ok=False)
+            raise
+        self.pool.record_login(self.account, ok=True)
+
+    def release(self) -> None:
+        if not self._lock.locked:
+            return
+        held = time.monotonic() - self._started
+        self._lock.release()
+        self.pool.record_lease(self.account, held)
+        SESSION_STATS.add("credentials", leases=1, lease_wait_ms=self.wait * 1000, held_s=held)
@@ -0,0 +1,84 @@
+import heapq
+import json
+import os
+import statistics
+import structlog
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_DURATIONS_PATH = Path(".e2e-cache/durations.json")
+
+# Оценка для теста без истории, пока в хранилище нет ни одного замера
+DEFAULT_TEST_SECONDS = 20.0
+
+# Вес последнего прогона в скользящем среднем
+EWMA_ALPHA = 0.5
+
+
+class DurationStore:
+    """Длительности тестов из прошлых прогонов
+
+    Для теста хранится скользящее среднее полной стоимости прогона: все фазы
+    (setup, call, teardown) всех попыток, включая перезапуски
+    pytest-rerunfailures. Так нестабильный тест планируется с учетом того,
+    что он обычно выполняется дважды.
+    """
+
+    def __init__(self, path: Path = DEFAULT_DURATIONS_PATH) -> None:
+        self.path = path
+        self._durations: Dict[str, float] = {}
+        self._current: Dict[str, float] = defaultdict(float)
+        if path.exists():
+            try:
+                self._durations = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning("Не удалось прочитать длительности тестов", error=str(e))
+
+    def default_estimate(self) -> float:
+        """Оценка для нового теста: медиана известных длительностей"""
+        if not self._durations:
+            return DEFAULT_TEST_SECONDS
+        return statistics.median(self._durations.values())
+
+    def estimate(self, nodeid: str, default: Optional[float] = None) -> float:
+        """Ожидаемая длительность теста в секундах"""
+        if nodeid in self._durations:
+            return self._durations[nodeid]
+        return self.default_estimate() if default is None else default
+
+    def add(self, nodeid: str, seconds: float) -> None:
+        """Прибавить длительность фазы или попытки к текущему прогону теста"""
+        self._current[nodeid] += seconds
+
+    def current(self, nodeid: str) -> float:
+        """Полная длительность теста в текущем прогоне"""
+        return self._current.get(nodeid, 0.0)
+
+    def save(self) -> None:
+        """Обновить средние по текущему прогону и записать файл атомарно"""
+        if not self._current:
+            return
+        for nodeid, seconds in self._current.items():
+            previous = self._durations.get(nodeid)
+            self._durations[nodeid] = (
+                seconds if previous is None else EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * previous
+            )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._durations, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def predict_makespan(durations: Iterable[float], workers: int) -> float:
+    """Время прогона при жадной раздаче тестов в заданном порядке
+
+    Каждый следующий тест достается воркеру, который освободится первым, -
+    так работает динамическая раздача xdist.
+    """
+    loads: List[float] = [0.0] * max(1, workers)
+    for seconds in durations:
+        heapq.heappush(loads, heapq.heappop(loads) + seconds)
+    return max(loads)
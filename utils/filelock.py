@@ -0,0 +1,75 @@
+import importlib
+import os
+import time
+import structlog
+from pathlib import Path
+from types import ModuleType
+from typing import Optional
+
+fcntl: Optional[ModuleType]
+try:
+    fcntl = importlib.import_module("fcntl")
+except ImportError:  # Windows
+    fcntl = None
+
+logger = structlog.get_logger(__name__)
+
+
+class FileLock:
+    """Межпроцессная блокировка на файле (``fcntl.flock``)
+
+    Блокировку держит открытый дескриптор, поэтому ОС снимает ее сама, если
+    процесс-владелец упал: воркер xdist, убитый по таймауту, не оставляет
+    занятой учетную запись. Без fcntl (Windows) блокировка не работает и
+    ``acquire`` всегда успешен.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """Взять блокировку без ожидания; False, если она занята другим процессом"""
+        if self._fd is not None:
+            return True
+        if fcntl is None:
+            logger.warning("fcntl недоступен, межпроцессная блокировка отключена")
+            self._fd = -1
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def acquire(self, timeout: Optional[float] = None, interval: float = 0.05) -> bool:
+        """Ждать блокировку не дольше timeout секунд (None - бесконечно)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_acquire():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        if self._fd >= 0 and fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
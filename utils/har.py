@@ -0,0 +1,158 @@
+import base64
+import json
+import re
+import structlog
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_HAR_DIR = Path("hars")
+
+# Параметры, которые меняются от запуска к запуску и не влияют на ответ
+DEFAULT_IGNORED_PARAMS = frozenset({"_", "t", "ts", "timestamp", "cache_bust"})
+
+# Заголовки, которые нельзя отдавать как есть: тело в HAR уже раскодировано
+_SKIPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+
+
+def normalize_url(url: str, ignored_params: Iterable[str] = DEFAULT_IGNORED_PARAMS) -> str:
+    """Привести URL к каноническому виду для сопоставления с записью HAR
+
+    Сортирует параметры запроса, выкидывает нестабильные, приводит
+    поисковый запрос ``q`` к нижнему регистру без лишних пробелов,
+    а флаг ``free`` - к значению ``true``/``false``. Фрагмент отбрасывается.
+    """
+    parts = urlsplit(url)
+    ignored = set(ignored_params)
+    params: List[Tuple[str, str]] = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        if key in ignored:
+            continue
+        if key == "q":
+            value = " ".join(value.split()).lower()
+        elif key == "free":
+            value = "true" if value.lower() in _TRUE_VALUES else "false"
+        params.append((key, value))
+    query = urlencode(sorted(params))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+def har_path(har_dir: Path, nodeid: str) -> Path:
+    """Файл HAR для теста (по одному на тест, общий для всех перезапусков)"""
+    return Path(har_dir) / (re.sub(r"[^\w.-]+", "_", nodeid).strip("_") + ".har")
+
+
+class HarReplayer:
+    """Локальная подмена сети ответами из записанного HAR
+
+    Аналог ``context.route_from_har``, но запросы сопоставляются по
+    нормализованному URL (см. ``normalize_url``), поэтому порядок параметров
+    ``q=``/``free=true`` и служебные параметры не ломают воспроизведение.
+    Повторные запросы к одному URL получают записанные ответы по очереди,
+    последний ответ повторяется.
+    """
+
+    def __init__(
+        self,
+        entries: List[dict],
+        not_found: str = "abort",
+        ignored_params: Iterable[str] = DEFAULT_IGNORED_PARAMS,
+    ) -> None:
+        """
+        Args:
+            entries: Записи ``log.entries`` из HAR
+            not_found: Что делать с незаписанным запросом: "abort" или "fallback" (в сеть)
+            ignored_params: Параметры запроса, которые игнорируются при сопоставлении
+        """
+        if not_found not in ("abort", "fallback"):
+            raise ValueError(f"not_found должен быть 'abort' или 'fallback', а не {not_found!r}")
+        self.not_found = not_found
+        self.ignored_params = frozenset(ignored_params)
+        self._responses: Dict[Tuple[str, str], List[dict]] = defaultdict(list)
+        self._served: Dict[Tuple[str, str], int] = defaultdict(int)
+        for entry in entries:
+            if entry["response"].get("status", 0) <= 0:
+                # Прерванные при записи запросы воспроизводить нечем
+                continue
+            request = entry["request"]
+            self._responses[self._key(request["method"], request["url"])].append(entry["response"])
+        self.hits = 0
+        self.misses: List[str] = []
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> "HarReplayer":
+        """Загрузить HAR с диска"""
+        entries = json.loads(Path(path).read_text(encoding="utf-8"))["log"]["entries"]
+        logger.info("Загружен HAR для воспроизведения", path=str(path), entries=len(entries))
+        return cls(entries, **kwargs)
+
+    def _key(self, method: str, url: str) -> Tuple[str, str]:
+        return method.upper(), normalize_url(url, self.ignored_params)
+
+    def lookup(self, method: str, url: str) -> Optional[dict]:
+        """Следующий записанный ответ на запрос или None"""
+        key = self._key(method, url)
+        responses = self._responses.get(key)
+        if not responses:
+            return None
+        index = min(self._served[key], len(responses) - 1)
+        self._served[key] += 1
+        return responses[index]
+
+    @staticmethod
+    def _fulfill_args(response: dict) -> dict:
+        content = response.get("content", {})
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode()
+        # Повторяющиеся заголовки (Set-Cookie) склеиваются через "\n" - так fulfill
+        # принимает многозначные заголовки; иначе уцелела бы только последняя cookie
+        headers: Dict[str, str] = {}
+        for header in response.get("headers", []):
+            name, value = header["name"].lower(), header["value"]
+            if name in _SKIPPED_HEADERS:
+                continue
+            headers[name] = f"{headers[name]}\n{value}" if name in headers else value
+        return {"status": response["status"], "headers": headers, "body": body}
+
+    def _handle(self, route) -> None:
+        request = route.request
+        response = self.lookup(request.method, request.url)
+        if response is not None:
+            self.hits += 1
+            route.fulfill(**self._fulfill_args(response))
+            return
+
+        self.misses.append(request.url)
+        logger.debug("Запрос не найден в HAR", url=request.url, not_found=self.not_found)
+        if self.not_found == "fallback":
+            route.fallback()
+        else:
+            route.abort("internetdisconnected")
+
+    async def _handle_async(self, route) -> None:
+        request = route.request
+        response = self.lookup(request.method, request.url)
+        if response is not None:
+            self.hits += 1
+            await route.fulfill(**self._fulfill_args(response))
+            return
+
+        self.misses.append(request.url)
+        logger.debug("Запрос не найден в HAR", url=request.url, not_found=self.not_found)
+        if self.not_found == "fallback":
+            await route.fallback()
+        else:
+            await route.abort("internetdisconnected")
+
+    def install(self, context) -> None:
+        """Подключить воспроизведение к sync BrowserContext"""
+        context.route("**/*", self._handle)
+
+    async def install_async(self, context) -> None:
+        """Подключить воспроизведение к async BrowserContext"""
+        await context.route("**/*", self._handle_async)
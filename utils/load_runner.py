@@ -0,0 +1,314 @@
+"""Нагрузочный прогон: виртуальные пользователи поверх ``pages.aio``.
+
+Каждый виртуальный пользователь получает свой контекст браузера, при
+наличии учетных данных входит через ``LoginPage`` и затем по кругу
+выполняет сценарий каталога: открыть каталог -> поиск -> фильтр "Бесплатно".
+Пользователи стартуют равномерно в течение ``ramp_up``, между шагами делают
+паузу ``think_time``. Пропускная способность и перцентили длительности шагов
+считаются по окнам времени.
+
+Запуск против локального стенда::
+
+    python -m utils.load_runner --stand-in --users 10 --ramp-up 10 --duration 60
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+import structlog
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from playwright.async_api import Browser, async_playwright
+from pages.aio import CatalogPage, LoginPage
+from pages.timeouts import TIMEOUTS
+from utils.metrics import ACTION_METRICS, histogram
+from utils.network_blocking import ResourceBlocker, ResourceSizes, get_profile
+from utils.stand_in import StandIn, parse_faults
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class LoadConfig:
+    """Параметры нагрузочного прогона
+
+    Attributes:
+        base_url: Адрес стенда
+        users: Число виртуальных пользователей
+        ramp_up: За сколько секунд стартуют все пользователи
+        duration: Длительность прогона в секундах (от старта первого пользователя)
+        think_time: Пауза между шагами, секунды (случайная в диапазоне min..max)
+        window: Ширина окна для статистики, секунды
+        queries: Поисковые запросы (пользователи берут их по кругу)
+        credentials: (login, password) или None - сценарий без входа
+        block_profile: Профиль блокировки ресурсов
+    """
+
+    base_url: str
+    users: int = 5
+    ramp_up: float = 5.0
+    duration: float = 30.0
+    think_time: Tuple[float, float] = (0.5, 1.5)
+    window: float = 5.0
+    queries: List[str] = field(default_factory=lambda: ["python", "sql", "java", "git"])
+    credentials: Optional[Tuple[str, str]] = None
+    block_profile: str = "minimal"
+
+
+@dataclass(frozen=True)
+class StepSample:
+    """Один выполненный шаг виртуального пользователя"""
+
+    user: int
+    step: str
+    started: float
+    duration_ms: float
+    ok: bool
+
+
+def _step_stats(samples: List[StepSample]) -> Dict[str, dict]:
+    """Перцентили успешных шагов и число ошибок по имени шага"""
+    by_step: Dict[str, List[StepSample]] = defaultdict(list)
+    for sample in samples:
+        by_step[sample.step].append(sample)
+    return {
+        step: {
+            **histogram(s.duration_ms for s in step_samples if s.ok),
+            "errors": sum(1 for s in step_samples if not s.ok),
+        }
+        for step, step_samples in sorted(by_step.items())
+    }
+
+
+class LoadStats:
+    """Шаги всех пользователей и сводка по окнам времени"""
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self.started = time.monotonic()
+        self.samples: List[StepSample] = []
+        self.iterations: List[float] = []
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, user: int, step: str, started: float, ok: bool) -> None:
+        duration_ms = (time.monotonic() - started) * 1000
+        self.samples.append(StepSample(user, step, started - self.started, duration_ms, ok))
+
+    def iteration_done(self) -> None:
+        self.iterations.append(time.monotonic() - self.started)
+
+    def windows(self) -> List[dict]:
+        """Пропускная способность (итераций/с) и перцентили шагов по окнам"""
+        buckets: Dict[int, List[StepSample]] = defaultdict(list)
+        for sample in self.samples:
+            buckets[int(sample.started // self.window)].append(sample)
+        iterations: Dict[int, int] = defaultdict(int)
+        for finished in self.iterations:
+            iterations[int(finished // self.window)] += 1
+
+        return [
+            {
+                "start": index * self.window,
+                "throughput": round(iterations[index] / self.window, 2),
+                "steps": _step_stats(buckets[index]),
+            }
+            for index in sorted(set(buckets) | set(iterations))
+        ]
+
+    def summary(self) -> dict:
+        """Итог прогона: итерации, пропускная способность, перцентили шагов, ошибки"""
+        elapsed = time.monotonic() - self.started
+        return {
+            "elapsed": round(elapsed, 1),
+            "iterations": len(self.iterations),
+            "throughput": round(len(self.iterations) / elapsed, 2) if elapsed else 0.0,
+            "steps": _step_stats(self.samples),
+            "errors": dict(self.errors),
+        }
+
+
+async def _think(config: LoadConfig) -> None:
+    low, high = config.think_time
+    if high > 0:
+        await asyncio.sleep(random.uniform(low, high))
+
+
+async def virtual_user(
+    user: int,
+    browser: Browser,
+    config: LoadConfig,
+    stats: LoadStats,
+    deadline: float,
+    sizes: ResourceSizes,
+) -> None:
+    """Один виртуальный пользователь: вход и сценарий каталога по кругу до deadline"""
+    context = await browser.new_context()
+    await ResourceBlocker(get_profile(config.block_profile), sizes).install_async(context)
+    page = await context.new_page()
+    log = logger.bind(user=user)
+
+    async def step(name: str, action) -> bool:
+        started = time.monotonic()
+        try:
+            await action()
+        except Exception as e:
+            stats.record(user, name, started, ok=False)
+            stats.errors[f"{name}: {type(e).__name__}"] += 1
+            log.warning("Шаг завершился ошибкой", step=name, error=str(e))
+            return False
+        stats.record(user, name, started, ok=True)
+        return True
+
+    try:
+        if config.credentials is not None:
+            login_page = LoginPage(page, base_url=config.base_url)
+            if not await step("login", lambda: login_page.login(*config.credentials)):
+                return
+
+        iteration = 0
+        while time.monotonic() < deadline:
+            query = config.queries[(user + iteration) % len(config.queries)]
+            catalog = CatalogPage(page, base_url=config.base_url)
+            results = {}
+
+            async def search() -> None:
+                results["page"] = await catalog.search_courses(query)
+
+            ok = await step("open_catalog", catalog.open)
+            if ok:
+                await _think(config)
+                ok = await step("search", search)
+            if ok:
+                await _think(config)
+                ok = await step("apply_free_filter", lambda: results["page"].apply_free_filter())
+            if ok:
+                stats.iteration_done()
+            iteration += 1
+            await _think(config)
+    finally:
+        await context.close()
+
+
+async def run_load(config: LoadConfig, browser: Optional[Browser] = None) -> dict:
+    """Прогнать нагрузку и вернуть отчет: сводку и статистику по окнам
+
+    Args:
+        config: Параметры прогона
+        browser: Уже запущенный браузер (например, фикстура async_browser);
+            если не передан, запускается свой Chromium
+    """
+    if browser is None:
+        async with async_playwright() as playwright:
+            own_browser = await playwright.chromium.launch()
+            try:
+                return await run_load(config, own_browser)
+            finally:
+                await own_browser.close()
+
+    # Метрики действий копятся по тестам pytest; здесь тестов нет. Задержки под
+    # нагрузкой не должны попадать в историю таймаутов функциональных прогонов
+    metrics_enabled, ACTION_METRICS.enabled = ACTION_METRICS.enabled, False
+    timeouts_enabled, TIMEOUTS.enabled = TIMEOUTS.enabled, False
+    stats = LoadStats(config.window)
+    deadline = time.monotonic() + config.duration
+    sizes = ResourceSizes()
+    delay = config.ramp_up / config.users if config.users else 0.0
+    logger.info("Старт нагрузки", users=config.users, ramp_up=config.ramp_up, url=config.base_url)
+
+    async def delayed(user: int) -> None:
+        await asyncio.sleep(user * delay)
+        if time.monotonic() < deadline:
+            await virtual_user(user, browser, config, stats, deadline, sizes)
+
+    try:
+        await asyncio.gather(*(delayed(user) for user in range(config.users)))
+    finally:
+        ACTION_METRICS.enabled = metrics_enabled
+        TIMEOUTS.enabled = timeouts_enabled
+
+    summary = stats.summary()
+    logger.info(
+        "Нагрузка завершена", iterations=summary["iterations"], throughput=summary["throughput"]
+    )
+    return {"config": asdict(config), "summary": summary, "windows": stats.windows()}
+
+
+def format_report(report: dict) -> str:
+    """Текстовая таблица: пропускная способность и p50/p95 шагов по окнам"""
+    lines = []
+    for window in report["windows"]:
+        steps = ", ".join(
+            f"{step} p50={s['p50']:.0f} p95={s['p95']:.0f} err={s['errors']}"
+            for step, s in window["steps"].items()
+        )
+        lines.append(f"[{window['start']:>6.0f} с] {window['throughput']:>5.2f} итер/с | {steps}")
+    summary = report["summary"]
+    lines.append(
+        f"Итого: {summary['iterations']} итераций за {summary['elapsed']} с, "
+        f"{summary['throughput']} итер/с, ошибки: {summary['errors'] or 'нет'}"
+    )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон page objects")
+    parser.add_argument("--base-url", help="Адрес стенда (не нужен с --stand-in)")
+    parser.add_argument("--stand-in", action="store_true", help="Поднять локальный стенд")
+    parser.add_argument(
+        "--fault",
+        action="append",
+        default=[],
+        help="Искажение маршрута стенда: <glob пути>:latency=мс,jitter=мс,error=доля",
+    )
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--ramp-up", type=float, default=5.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--think-time", default="0.5-1.5", help="Пауза между шагами, с: min-max")
+    parser.add_argument("--window", type=float, default=5.0)
+    parser.add_argument("--login", help="Логин (вместе с --password включает шаг входа)")
+    parser.add_argument("--password")
+    parser.add_argument("--block-profile", default="minimal")
+    parser.add_argument("--out", type=Path, help="Куда записать отчет в JSON")
+    args = parser.parse_args()
+
+    if not args.stand_in and not args.base_url:
+        parser.error("нужен --base-url или --stand-in")
+    if bool(args.login) != bool(args.password):
+        parser.error("--login и --password задаются только вместе")
+    try:
+        faults = parse_faults(args.fault)
+    except ValueError as e:
+        parser.error(str(e))
+    low, _, high = args.think_time.partition("-")
+    logging.basicConfig(level=logging.WARNING)
+
+    stand_in = StandIn(faults=faults).start() if args.stand_in else None
+    try:
+        config = LoadConfig(
+            base_url=stand_in.url if stand_in else args.base_url,
+            users=args.users,
+            ramp_up=args.ramp_up,
+            duration=args.duration,
+            think_time=(float(low), float(high or low)),
+            window=args.window,
+            credentials=(args.login, args.password) if args.login and args.password else None,
+            block_profile=args.block_profile,
+        )
+        report = asyncio.run(run_load(config))
+    finally:
+        if stand_in is not None:
+            stand_in.stop()
+
+    print(format_report(report))
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Настройка structlog для тестов и инструментов поверх page objects.
+
+Режимы:
+
+* ``sync`` - как раньше: все процессоры и вывод выполняются в потоке теста;
+* ``queue`` - в потоке теста остается только фильтрация, метки времени и
+  уровня; подстановка аргументов (``log.info("Клик: %s", name)``) и
+  рендеринг выполняются в фоновом ``QueueListener``, который передает
+  готовые записи обработчикам корневого логгера (в том числе pytest).
+
+Логи действий page objects (``action_phase="start"/"done"``) можно
+свернуть до одной итоговой строки (``summary``) или сэмплировать
+(``sample:N`` - каждая N-я итоговая строка). Предупреждения и ошибки
+пропускаются всегда.
+"""
+
+import importlib
+import itertools
+import logging
+import logging.handlers
+import queue
+import structlog
+from types import ModuleType
+from typing import Any, List, Optional
+
+# orjson необязателен: без него JSON-логи рендерит стандартный json
+orjson: Optional[ModuleType]
+try:
+    orjson = importlib.import_module("orjson")
+except ImportError:
+    orjson = None
+
+# Корни логгеров проекта: только они уходят в очередь в режиме queue
+PROJECT_LOGGERS = ("pages", "utils", "conftest", "tests")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue: Optional["queue.Queue[logging.LogRecord]"] = None
+
+
+class ActionSampler:
+    """Процессор structlog, сворачивающий и сэмплирующий логи действий"""
+
+    def __init__(self, mode: str = "full") -> None:
+        """
+        Args:
+            mode: "full", "summary" или "sample:N"
+        """
+        self.mode = mode
+        self.every = 1
+        if mode.startswith("sample:"):
+            self.every = max(1, int(mode.split(":", 1)[1]))
+        elif mode not in ("full", "summary"):
+            raise ValueError(f"Неизвестный режим логов действий: {mode!r}")
+        self._counter = itertools.count()
+
+    def __call__(self, logger: Any, method_name: str, event_dict: dict) -> dict:
+        phase = event_dict.pop("action_phase", None)
+        if phase is None or self.mode == "full" or method_name not in ("debug", "info"):
+            return event_dict
+        if phase == "start":
+            raise structlog.DropEvent
+        if next(self._counter) % self.every:
+            raise structlog.DropEvent
+        return event_dict
+
+
+def json_renderer() -> structlog.processors.JSONRenderer:
+    """JSON-рендерер: orjson, если установлен, иначе стандартный json"""
+    if orjson is not None:
+        dumps = orjson.dumps
+
+        def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+            data: bytes = dumps(obj, default=str)
+            return data.decode()
+
+        return structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    return structlog.processors.JSONRenderer(ensure_ascii=False)
+
+
+def _renderer(name: str) -> Any:
+    if name == "json":
+        return json_renderer()
+    return structlog.dev.ConsoleRenderer(colors=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler без форматирования в вызывающем потоке"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _RootForwarder(logging.Handler):
+    """Рендерит запись в фоновом потоке и отдает обработчикам корневого логгера"""
+
+    def __init__(self, formatter: logging.Formatter) -> None:
+        super().__init__()
+        self.setFormatter(formatter)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        record.msg = self.format(record)
+        record.args = ()
+        logging.getLogger().handle(record)
+
+
+def configure_logging(mode: str = "sync", renderer: str = "default", actions: str = "full") -> None:
+    """Настроить structlog
+
+    Args:
+        mode: "sync" или "queue" (рендеринг в фоновом потоке)
+        renderer: "default" (event dict как есть), "console" или "json"
+        actions: Режим логов действий page objects: "full", "summary", "sample:N"
+    """
+    stop_logging()
+    sampler = ActionSampler(actions)
+
+    if mode == "sync":
+        tail: List[Any] = [
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+        ]
+        tail.append(
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter
+            if renderer == "default"
+            else _renderer(renderer)
+        )
+        _configure_structlog([sampler, *tail])
+        _route_project_loggers(None)
+        return
+
+    if mode != "queue":
+        raise ValueError(f"Неизвестный режим логирования: {mode!r}")
+
+    # В потоке теста - только то, что нельзя отложить (время, стек исключения)
+    _configure_structlog(
+        [
+            sampler,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ]
+    )
+    formatter = structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            _renderer("console" if renderer == "default" else renderer),
+        ]
+    )
+    global _listener, _queue
+    _queue = queue.Queue()
+    _listener = logging.handlers.QueueListener(_queue, _RootForwarder(formatter))
+    _listener.start()
+    _route_project_loggers(_QueueHandler(_queue))
+
+
+def _configure_structlog(processors: List[Any]) -> None:
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            *processors,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+
+def _route_project_loggers(handler: Optional[logging.Handler]) -> None:
+    """Направить логгеры проекта в очередь (handler) или обратно в корневой логгер"""
+    for name in PROJECT_LOGGERS:
+        project_logger = logging.getLogger(name)
+        for old in [h for h in project_logger.handlers if isinstance(h, _QueueHandler)]:
+            project_logger.removeHandler(old)
+        if handler is not None:
+            project_logger.addHandler(handler)
+        project_logger.propagate = handler is None
+
+
+def flush_logging() -> None:
+    """Дождаться, пока фоновый поток отдаст все записи обработчикам"""
+    if _queue is not None:
+        _queue.join()
+
+
+def stop_logging() -> None:
+    """Остановить фоновый поток логирования, дописав очередь"""
+    global _listener, _queue
+    if _listener is not None:
+        _listener.stop()
+        _route_project_loggers(None)
+    _listener = None
+    _queue = None
@@ -0,0 +1,188 @@
+import json
+import math
+import sys
+import threading
+import structlog
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_METRICS_PATH = Path("reports/action_metrics.json")
+BUDGET_MODES = ("off", "warn", "fail")
+
+
+@dataclass(frozen=True)
+class ActionSample:
+    """Одно измерение действия page object"""
+
+    page: str
+    action: str
+    element: str
+    duration_ms: float
+    ok: bool = True
+
+    @property
+    def key(self) -> str:
+        """Ключ гистограммы: ``Страница.действие[элемент]``"""
+        base = f"{self.page}.{self.action}"
+        return f"{base}[{self.element}]" if self.element else base
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Перцентиль по методу ближайшего ранга (значения уже отсортированы)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def histogram(durations: Iterable[float]) -> Dict[str, float]:
+    """Сводка длительностей: count, p50, p95, max, total (мс)"""
+    values = sorted(durations)
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 1),
+        "p95": round(percentile(values, 95), 1),
+        "max": round(values[-1], 1) if values else 0.0,
+        "total": round(sum(values), 1),
+    }
+
+
+def summarize(samples: Iterable[ActionSample]) -> Dict[str, Dict[str, float]]:
+    """Гистограммы по ключам действий"""
+    grouped: Dict[str, List[float]] = defaultdict(list)
+    for sample in samples:
+        grouped[sample.key].append(sample.duration_ms)
+    return {key: histogram(values) for key, values in sorted(grouped.items())}
+
+
+class ActionBudgets:
+    """Бюджеты длительности действий из ``[tool.e2e.budgets]`` в pyproject.toml
+
+    Ключ бюджета ищется от частного к общему:
+    ``SearchPage.click[Кнопка фильтра]`` -> ``SearchPage.click`` -> ``click``.
+    """
+
+    def __init__(self, budgets: Optional[Mapping[str, float]] = None, mode: str = "warn") -> None:
+        if mode not in BUDGET_MODES:
+            raise ValueError(f"Неизвестный режим бюджетов: {mode!r}")
+        self.budgets = {key: float(value) for key, value in (budgets or {}).items()}
+        self.mode = mode
+
+    @classmethod
+    def load(cls, pyproject: Path, mode: Optional[str] = None) -> "ActionBudgets":
+        """Прочитать бюджеты и режим (``[tool.e2e] budget-mode``) из pyproject.toml
+
+        Args:
+            pyproject: Путь к pyproject.toml
+            mode: Режим из командной строки; имеет приоритет над pyproject
+        """
+        section: dict = {}
+        if pyproject.exists():
+            with open(pyproject, "rb") as f:
+                section = tomllib.load(f).get("tool", {}).get("e2e", {})
+        return cls(section.get("budgets", {}), mode or section.get("budget-mode", "warn"))
+
+    def limit_for(self, sample: ActionSample) -> Optional[float]:
+        """Бюджет для измерения или None"""
+        for key in (sample.key, f"{sample.page}.{sample.action}", sample.action):
+            if key in self.budgets:
+                return self.budgets[key]
+        return None
+
+    def violations(self, samples: Iterable[ActionSample]) -> List[str]:
+        """Описания превышений бюджета (по худшему измерению каждого ключа)"""
+        if self.mode == "off" or not self.budgets:
+            return []
+        worst: Dict[str, ActionSample] = {}
+        for sample in samples:
+            if sample.key not in worst or sample.duration_ms > worst[sample.key].duration_ms:
+                worst[sample.key] = sample
+        messages = []
+        for key, sample in sorted(worst.items()):
+            limit = self.limit_for(sample)
+            if limit is not None and sample.duration_ms > limit:
+                messages.append(f"{key}: {sample.duration_ms:.0f} мс > бюджет {limit:.0f} мс")
+        return messages
+
+
+class ActionMetrics:
+    """Длительности действий текущего теста и всей сессии
+
+    Измерения пишутся из потока теста (или из его event loop в async API),
+    поэтому хватает одного буфера на процесс: тесты на воркере идут по одному.
+    Сессионные данные хранятся как списки длительностей по ключам, чтобы
+    перцентили на контроллере xdist считались по всем воркерам без потерь.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._current: List[ActionSample] = []
+        self._session: Dict[str, List[float]] = defaultdict(list)
+        self._tests: Dict[str, Dict[str, Dict[str, float]]] = {}
+        # Вне pytest (нагрузочный прогон) тестов нет, и буфер рос бы без ограничений
+        self.enabled = True
+
+    def record(self, page: str, action: str, element: str, duration_ms: float, ok: bool) -> None:
+        """Добавить измерение к текущему тесту"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._current.append(ActionSample(page, action, element, duration_ms, ok))
+
+    def start_test(self) -> None:
+        """Начать сбор измерений нового теста"""
+        with self._lock:
+            self._current = []
+
+    def finish_test(self, nodeid: str) -> List[ActionSample]:
+        """Завершить тест: перенести измерения в сессию и вернуть их"""
+        with self._lock:
+            samples, self._current = self._current, []
+            for sample in samples:
+                self._session[sample.key].append(sample.duration_ms)
+            if samples:
+                self._tests[nodeid] = summarize(samples)
+        return samples
+
+    def as_dict(self) -> dict:
+        """Сырые данные сессии (пригодны для execnet)"""
+        with self._lock:
+            return {
+                "session": {key: list(values) for key, values in self._session.items()},
+                "tests": dict(self._tests),
+            }
+
+    def merge(self, data: Mapping) -> None:
+        """Добавить данные другого процесса"""
+        with self._lock:
+            for key, values in data.get("session", {}).items():
+                self._session[key].extend(values)
+            self._tests.update(data.get("tests", {}))
+
+    def session_summary(self) -> Dict[str, Dict[str, float]]:
+        """Гистограммы действий по всей сессии"""
+        with self._lock:
+            return {key: histogram(values) for key, values in sorted(self._session.items())}
+
+    def write_json(self, path: Path) -> None:
+        """Записать сводку сессии и тестов в JSON"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            tests = dict(sorted(self._tests.items()))
+        report = {"session": self.session_summary(), "tests": tests}
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def __bool__(self) -> bool:
+        return bool(self._session)
+
+
+ACTION_METRICS = ActionMetrics()
@@ -0,0 +1,208 @@
+import json
+import os
+import structlog
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = structlog.get_logger(__name__)
+
+SIZES_PATH = Path(".e2e-cache") / "resource_sizes.json"
+
+# Хосты, которые считаются "своими" и не режутся как сторонние скрипты
+FIRST_PARTY_SUFFIXES = ("stepik.org", "stepik.net", "localhost", "127.0.0.1")
+
+ANALYTICS_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "mc.yandex.ru",
+    "mc.yandex.com",
+    "top-fwz1.mail.ru",
+    "connect.facebook.net",
+    "vk.com",
+    "hotjar.com",
+    "amplitude.com",
+    "intercom.io",
+)
+
+# Оценка размера, если ресурс ни разу не загружался без блокировки
+DEFAULT_SIZES = {
+    "image": 30_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 80_000,
+    "stylesheet": 20_000,
+}
+DEFAULT_SIZE = 5_000
+
+
+@dataclass(frozen=True)
+class BlockProfile:
+    """Набор правил блокировки сетевых запросов
+
+    Attributes:
+        name: Имя профиля для отчетов
+        resource_types: Типы ресурсов Playwright, которые блокируются целиком
+        hosts: Блокируемые хосты (аналитика, трекеры)
+        block_third_party_scripts: Резать скрипты с чужих доменов
+    """
+
+    name: str
+    resource_types: FrozenSet[str] = frozenset()
+    hosts: Tuple[str, ...] = ()
+    block_third_party_scripts: bool = False
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.resource_types or self.hosts or self.block_third_party_scripts)
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Причина блокировки запроса или None, если запрос пропускается"""
+        if resource_type in self.resource_types:
+            return resource_type
+        host = urlsplit(url).hostname or ""
+        if any(host == h or host.endswith("." + h) for h in self.hosts):
+            return "analytics"
+        if (
+            self.block_third_party_scripts
+            and resource_type == "script"
+            and not any(host == s or host.endswith("." + s) for s in FIRST_PARTY_SUFFIXES)
+        ):
+            return "third-party"
+        return None
+
+
+MEDIA_TYPES = frozenset({"image", "media", "font"})
+
+PROFILES: Dict[str, BlockProfile] = {
+    "full": BlockProfile("full"),
+    "no-media": BlockProfile("no-media", resource_types=MEDIA_TYPES),
+    "minimal": BlockProfile(
+        "minimal",
+        resource_types=MEDIA_TYPES,
+        hosts=ANALYTICS_HOSTS,
+        block_third_party_scripts=True,
+    ),
+}
+
+
+def get_profile(name: str) -> BlockProfile:
+    """Профиль блокировки по имени"""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Неизвестный профиль блокировки: {name!r}. Доступны: {', '.join(PROFILES)}"
+        ) from None
+
+
+class ResourceSizes:
+    """Известные размеры ресурсов по URL для оценки сэкономленного трафика
+
+    Размеры запоминаются из заголовка Content-Length ответов, которые
+    пропустил профиль с блокировкой (например, скрипты при профиле
+    "no-media" пригодятся профилю "minimal"), и сохраняются между запусками.
+    Профиль "full" ничего не перехватывает и размеры не собирает.
+    """
+
+    def __init__(self, path: Path = SIZES_PATH) -> None:
+        self.path = path
+        try:
+            self._sizes: Dict[str, int] = json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            self._sizes = {}
+        self._dirty = False
+
+    def learn(self, url: str, headers: Dict[str, str]) -> None:
+        length = headers.get("content-length")
+        if length and length.isdigit() and self._sizes.get(url) != int(length):
+            self._sizes[url] = int(length)
+            self._dirty = True
+
+    def estimate(self, url: str, resource_type: str) -> int:
+        return self._sizes.get(url, DEFAULT_SIZES.get(resource_type, DEFAULT_SIZE))
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self._sizes))
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class ResourceBlocker:
+    """Перехват запросов контекста по профилю блокировки со статистикой"""
+
+    profile: BlockProfile
+    sizes: ResourceSizes
+    blocked: Counter = field(default_factory=Counter)
+    bytes_saved: int = 0
+    _handler: Optional[Callable[[Any], Any]] = field(default=None, init=False, repr=False)
+
+    @property
+    def blocked_total(self) -> int:
+        return sum(self.blocked.values())
+
+    def _classify(self, request) -> Optional[str]:
+        reason = self.profile.block_reason(request.url, request.resource_type)
+        if reason is not None:
+            self.blocked[reason] += 1
+            self.bytes_saved += self.sizes.estimate(request.url, request.resource_type)
+        return reason
+
+    def _learn(self, response) -> None:
+        if response.request.resource_type in DEFAULT_SIZES:
+            self.sizes.learn(response.url, response.headers)
+
+    def install(self, context) -> None:
+        """Подключить блокировку к sync BrowserContext"""
+        if not self.profile.blocks_anything:
+            return
+        context.on("response", self._learn)
+
+        def handle(route) -> None:
+            if self._classify(route.request):
+                route.abort("blockedbyclient")
+            else:
+                route.fallback()
+
+        self._handler = handle
+        context.route("**/*", handle)
+
+    def uninstall(self, context) -> None:
+        """Отключить блокировку от sync BrowserContext (для переиспользуемых контекстов)
+
+        Снимается только свой обработчик: маршруты пула и теста остаются.
+        """
+        if self._handler is None:
+            return
+        context.remove_listener("response", self._learn)
+        context.unroute("**/*", self._handler)
+        self._handler = None
+
+    async def install_async(self, context) -> None:
+        """Подключить блокировку к async BrowserContext"""
+        if not self.profile.blocks_anything:
+            return
+        context.on("response", self._learn)
+
+        async def handle(route) -> None:
+            if self._classify(route.request):
+                await route.abort("blockedbyclient")
+            else:
+                await route.fallback()
+
+        await context.route("**/*", handle)
+
+    def summary(self) -> Dict[str, int]:
+        """Счетчики для отчета: всего заблокировано, по причинам и оценка байт"""
+        return {
+            "requests": self.blocked_total,
+            "bytes_saved": self.bytes_saved,
+            **{f"by_{reason}": count for reason, count in sorted(self.blocked.items())},
+        }
@@ -0,0 +1,174 @@
+import shutil
+import tempfile
+import time
+import structlog
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+from utils.session_stats import SESSION_STATS
+
+logger = structlog.get_logger(__name__)
+
+RECORDING_MODES = ("retry", "always", "off")
+
+
+@dataclass(frozen=True)
+class RecordingPlan:
+    """Что записывать в текущей попытке теста"""
+
+    trace: bool = False
+    video: bool = False
+
+    @property
+    def anything(self) -> bool:
+        return self.trace or self.video
+
+    @classmethod
+    def for_attempt(cls, mode: str, attempt: int, marker=None) -> "RecordingPlan":
+        """План записи попытки теста
+
+        Args:
+            mode: ``retry`` - trace и видео только в перезапуске упавшего теста,
+                ``always`` - в каждой попытке, ``off`` - никогда (маркер важнее)
+            attempt: Номер попытки (``item.execution_count`` от pytest-rerunfailures)
+            marker: Маркер ``record(video=False)``: trace с первой попытки
+        """
+        if mode not in RECORDING_MODES:
+            raise ValueError(f"Неизвестный режим записи: {mode!r}")
+        if marker is not None:
+            return cls(trace=True, video=bool(marker.kwargs.get("video", False)))
+        if mode == "always" or (mode == "retry" and attempt > 1):
+            return cls(trace=True, video=True)
+        return cls()
+
+
+class AttemptRecorder:
+    """Trace и видео одной попытки теста
+
+    Playwright пишет trace и кодирует видео, пока контекст открыт, поэтому
+    дешевле всего их не включать: первая попытка идет без записи, а
+    перезапуск упавшего теста записывается целиком. Артефакты прошедшей
+    попытки удаляются, упавшей - сохраняются в каталог теста. Один записыватель
+    обслуживает и несколько контекстов попытки (фабрика ``new_async_page``):
+    trace каждого следующего контекста получает номер в имени файла.
+    """
+
+    def __init__(self, plan: RecordingPlan, out_dir: Path, prefix: str) -> None:
+        """
+        Args:
+            plan: Что записывать
+            out_dir: Каталог артефактов теста
+            prefix: Префикс файлов попытки (``try2``)
+        """
+        self.plan = plan
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.kept: List[Path] = []
+        self.overhead_ms = 0.0
+        self._video_dir = Path(tempfile.mkdtemp(prefix="e2e-video-")) if plan.video else None
+        self._videos: list = []
+        self._contexts: Dict[int, int] = {}
+
+    def context_kwargs(self) -> dict:
+        """Аргументы new_context (каталог видео)"""
+        if self._video_dir is None:
+            return {}
+        return {"record_video_dir": str(self._video_dir)}
+
+    def _trace_path(self, context) -> Path:
+        index = self._contexts.setdefault(id(context), len(self._contexts))
+        suffix = f"-{index}" if index else ""
+        return self.out_dir / f"trace-{self.prefix}{suffix}.zip"
+
+    def start(self, context) -> None:
+        """Включить trace на sync-контексте"""
+        if self.plan.trace:
+            started = time.perf_counter()
+            context.tracing.start(screenshots=True, snapshots=True)
+            self.overhead_ms += (time.perf_counter() - started) * 1000
+
+    def stop(self, context, keep: bool) -> None:
+        """Остановить trace до закрытия контекста, запомнить видео его страниц"""
+        started = time.perf_counter()
+        if self.plan.trace:
+            if keep:
+                self.out_dir.mkdir(parents=True, exist_ok=True)
+                path = self._trace_path(context)
+                context.tracing.stop(path=str(path))
+                self.kept.append(path)
+            else:
+                context.tracing.stop()
+        self._videos.extend(page.video for page in context.pages if page.video is not None)
+        self.overhead_ms += (time.perf_counter() - started) * 1000
+
+    def finish(self, keep: bool) -> None:
+        """После закрытия контекстов: сохранить или удалить видео"""
+        for index, video in enumerate(self._videos):
+            self._finish_video(Path(video.path()), index, keep)
+        self._cleanup()
+
+    async def start_async(self, context) -> None:
+        """Включить trace на async-контексте"""
+        if self.plan.trace:
+            started = time.perf_counter()
+            await context.tracing.start(screenshots=True, snapshots=True)
+            self.overhead_ms += (time.perf_counter() - started) * 1000
+
+    async def stop_async(self, context, keep: bool) -> None:
+        """Async-вариант stop()"""
+        started = time.perf_counter()
+        if self.plan.trace:
+            if keep:
+                self.out_dir.mkdir(parents=True, exist_ok=True)
+                path = self._trace_path(context)
+                await context.tracing.stop(path=str(path))
+                self.kept.append(path)
+            else:
+                await context.tracing.stop()
+        self._videos.extend(page.video for page in context.pages if page.video is not None)
+        self.overhead_ms += (time.perf_counter() - started) * 1000
+
+    async def finish_async(self, keep: bool) -> None:
+        """Async-вариант finish()"""
+        for index, video in enumerate(self._videos):
+            self._finish_video(Path(await video.path()), index, keep)
+        self._cleanup()
+
+    def _finish_video(self, path: Path, index: int, keep: bool) -> None:
+        if not keep or not path.exists():
+            return
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        target = self.out_dir / f"video-{self.prefix}-{index}{path.suffix}"
+        shutil.move(str(path), target)
+        self.kept.append(target)
+
+    def _cleanup(self) -> None:
+        if self._video_dir is not None:
+            shutil.rmtree(self._video_dir, ignore_errors=True)
+
+    def report(self) -> None:
+        """Добавить попытку в сводку записи сессии"""
+        if not self.plan.anything:
+            SESSION_STATS.add("recording", attempts_unrecorded=1)
+            return
+        SESSION_STATS.add(
+            "recording",
+            attempts_recorded=1,
+            overhead_ms=self.overhead_ms,
+            artifacts_kept=len(self.kept),
+            bytes_kept=sum(path.stat().st_size for path in self.kept if path.exists()),
+        )
+        logger.info(
+            "Запись попытки",
+            trace=self.plan.trace,
+            video=self.plan.video,
+            kept=[str(path) for path in self.kept],
+        )
+
+
+def estimated_savings_ms(stats: Optional[dict]) -> float:
+    """Оценка сэкономленного времени: попытки без записи x средние накладные записанной"""
+    if not stats or not stats.get("attempts_recorded"):
+        return 0.0
+    per_attempt = stats.get("overhead_ms", 0.0) / stats["attempts_recorded"]
+    return float(stats.get("attempts_unrecorded", 0.0) * per_attempt)
@@ -0,0 +1,136 @@
+import pytest
+import time
+import structlog
+from typing import Any, Dict, List, Optional
+from xdist.scheduler import LoadScheduling
+from utils.durations import DurationStore, predict_makespan
+
+logger = structlog.get_logger(__name__)
+
+
+class DurationScheduling(LoadScheduling):
+    """Раздача тестов xdist от самых долгих к самым коротким
+
+    Порядок берется из ``DurationStore``. Каждому воркеру отдается не больше
+    ``prefetch`` тестов сразу (xdist нужно знать следующий тест, поэтому
+    минимум 2): так длинный сценарий не застревает в очереди занятого
+    воркера, пока остальные простаивают, а короткие тесты в конце прогона
+    добивают освободившиеся воркеры.
+    """
+
+    # Состояние LoadScheduling (xdist без аннотаций): узел -> индексы его тестов
+    node2collection: Dict[Any, List[str]]
+    node2pending: Dict[Any, List[int]]
+    pending: List[int]
+    collection: Optional[List[str]]
+
+    def __init__(self, config, log=None, store: Optional[DurationStore] = None, prefetch: int = 2):
+        super().__init__(config, log)
+        self.store = store or DurationStore()
+        self.prefetch = max(2, prefetch)
+        self.predicted: Dict[str, float] = {}
+        self.started: Optional[float] = None
+
+    def schedule(self) -> None:
+        """Первичная раздача: тесты в порядке убывания ожидаемой длительности"""
+        assert self.collection_is_completed
+
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        collection: List[str] = next(iter(self.node2collection.values()))
+        self.collection = collection
+        estimates = [self.store.estimate(nodeid) for nodeid in collection]
+        self.pending[:] = sorted(
+            range(len(collection)), key=lambda index: estimates[index], reverse=True
+        )
+        workers = len(self.nodes)
+        self.predicted = {
+            "workers": workers,
+            "collection_order": predict_makespan(estimates, workers),
+            "longest_first": predict_makespan(sorted(estimates, reverse=True), workers),
+        }
+        self.started = time.monotonic()
+        logger.info("Тесты упорядочены по длительности", **self.predicted)
+        if not collection:
+            return
+
+        # По одному тесту на воркер за круг, чтобы самые долгие разошлись по разным воркерам
+        for _ in range(self.prefetch):
+            for node in self.nodes:
+                self._send_tests(node, 1)
+
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration: float = 0) -> None:
+        """Дослать воркеру тесты, когда его очередь опустела ниже prefetch"""
+        if node.shutting_down:
+            return
+
+        if self.pending:
+            missing = self.prefetch - len(self.node2pending[node])
+            if missing > 0:
+                self._send_tests(node, missing)
+        else:
+            node.shutdown()
+
+        self.log("num items waiting for node:", len(self.pending))
+
+
+class DurationPlugin:
+    """Плагин pytest: копит длительности тестов и подключает DurationScheduling
+
+    Регистрируется только на контроллере xdist (или в прогоне без xdist):
+    там видны отчеты всех тестов со всех воркеров.
+    """
+
+    def __init__(self, store: DurationStore, schedule: bool = True) -> None:
+        self.store = store
+        self.schedule = schedule
+        self.scheduler: Optional[DurationScheduling] = None
+        self.busy: Dict[str, float] = {}
+        self.actual: Optional[float] = None
+
+    @pytest.hookimpl(optionalhook=True, tryfirst=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        """Раздача от самых долгих тестов (только для --dist load)"""
+        if not self.schedule or config.getvalue("dist") != "load":
+            return None
+        self.scheduler = DurationScheduling(config, log, store=self.store)
+        return self.scheduler
+
+    def pytest_runtest_logreport(self, report) -> None:
+        """Стоимость теста: все фазы всех попыток, включая перезапуски"""
+        self.store.add(report.nodeid, report.duration)
+        node = getattr(report, "node", None)
+        worker = node.gateway.id if node is not None else "main"
+        self.busy[worker] = self.busy.get(worker, 0.0) + report.duration
+
+    def pytest_sessionfinish(self) -> None:
+        if self.scheduler is not None and self.scheduler.started is not None:
+            self.actual = time.monotonic() - self.scheduler.started
+        self.store.save()
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if self.scheduler is None or not self.scheduler.predicted:
+            return
+        predicted = self.scheduler.predicted
+        terminalreporter.section("E2E: планирование xdist")
+        terminalreporter.write_line(
+            f"Прогноз, воркеров {predicted['workers']}: "
+            f"в порядке сбора {predicted['collection_order']:.1f} с, "
+            f"от самых долгих {predicted['longest_first']:.1f} с"
+        )
+        if self.actual is not None:
+            busy = ", ".join(
+                f"{worker}={seconds:.1f}" for worker, seconds in sorted(self.busy.items())
+            )
+            terminalreporter.write_line(f"Фактически: {self.actual:.1f} с (занятость, с: {busy})")
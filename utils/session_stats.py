@@ -0,0 +1,38 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Mapping
+
+
+class SessionStats:
+    """Суммирующие счетчики сессии, которые сводятся со всех воркеров xdist
+
+    Значения только складываются, поэтому данные воркеров можно объединять
+    на контроллере без потерь (через ``workeroutput``).
+    """
+
+    def __init__(self) -> None:
+        self._sections: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+
+    def add(self, section: str, **values: float) -> None:
+        """Прибавить значения к счетчикам раздела (можно вызывать из фоновых потоков)"""
+        with self._lock:
+            counters = self._sections[section]
+            for key, value in values.items():
+                counters[key] += value
+
+    def merge(self, data: Mapping[str, Mapping[str, float]]) -> None:
+        """Добавить счетчики, полученные от другого процесса"""
+        for section, values in data.items():
+            self.add(section, **values)
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Снимок счетчиков в виде обычных словарей (пригоден для execnet)"""
+        with self._lock:
+            return {section: dict(values) for section, values in sorted(self._sections.items())}
+
+    def __bool__(self) -> bool:
+        return bool(self._sections)
+
+
+SESSION_STATS = SessionStats()
@@ -0,0 +1,216 @@
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import structlog
+from pathlib import Path
+from typing import Dict, Optional
+from playwright.sync_api import Browser, Error as PlaywrightError, Playwright
+
+logger = structlog.get_logger(__name__)
+
+_DEVTOOLS_LINE = re.compile(r"DevTools listening on (ws://\S+)")
+
+CHROMIUM_ARGS = [
+    "--headless=new",
+    "--remote-debugging-port=0",
+    "--remote-debugging-address=127.0.0.1",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-dev-shm-usage",
+    "--mute-audio",
+]
+
+
+def process_tree_rss_mb(pid: int) -> float:
+    """RSS процесса и всех его потомков в МБ (Linux, по /proc; иначе 0)"""
+    proc = Path("/proc")
+    if not proc.exists():
+        return 0.0
+    children: Dict[int, list] = {}
+    for stat in proc.glob("[0-9]*/stat"):
+        try:
+            # Имя процесса в скобках может содержать пробелы
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            for line in (proc / str(current) / "status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total_kb += int(line.split()[1])
+                    break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+class SharedChromium:
+    """Один Chromium с CDP-эндпоинтом для всех воркеров xdist
+
+    В Python-клиенте Playwright нет ``launch_server``, поэтому контроллер
+    запускает сам бинарник Chromium из поставки Playwright с
+    ``--remote-debugging-port=0`` и читает адрес websocket из stderr.
+    Воркеры подключаются через ``connect_over_cdp``; у каждого теста
+    по-прежнему свой контекст, то есть отдельный профиль cookies и storage.
+    """
+
+    def __init__(self, executable: str, startup_timeout: float = 30.0) -> None:
+        """
+        Args:
+            executable: Путь к Chromium (``playwright.chromium.executable_path``)
+            startup_timeout: Сколько ждать адрес DevTools, секунды
+        """
+        self.executable = executable
+        self.startup_timeout = startup_timeout
+        self.endpoint: Optional[str] = None
+        self.startup_ms = 0.0
+        self._process: Optional[subprocess.Popen] = None
+        self._profile_dir: Optional[str] = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process is not None else None
+
+    def start(self) -> "SharedChromium":
+        started = time.monotonic()
+        self._profile_dir = tempfile.mkdtemp(prefix="e2e-shared-chromium-")
+        process = self._process = subprocess.Popen(
+            [
+                self.executable,
+                *CHROMIUM_ARGS,
+                f"--user-data-dir={self._profile_dir}",
+                "about:blank",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        stderr = process.stderr
+        assert stderr is not None  # stderr=PIPE
+        found = threading.Event()
+
+        def read_stderr() -> None:
+            # Chromium пишет в stderr всю сессию: читаем до конца, чтобы не переполнить pipe
+            # (поток читает свой pipe: stop() обнуляет self._process)
+            for line in stderr:
+                match = _DEVTOOLS_LINE.search(line)
+                if match and not found.is_set():
+                    self.endpoint = match.group(1)
+                    found.set()
+
+        threading.Thread(target=read_stderr, name="shared-chromium-stderr", daemon=True).start()
+        if not found.wait(self.startup_timeout):
+            self.stop()
+            raise RuntimeError("Chromium не сообщил адрес DevTools")
+        self.startup_ms = (time.monotonic() - started) * 1000
+        logger.info(
+            "Общий Chromium запущен",
+            endpoint=self.endpoint,
+            pid=self.pid,
+            startup_ms=round(self.startup_ms),
+        )
+        return self
+
+    def rss_mb(self) -> float:
+        return process_tree_rss_mb(self.pid) if self.pid is not None else 0.0
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+            logger.info("Общий Chromium остановлен")
+        if self._profile_dir is not None:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+
+class BrowserHandle:
+    """Браузер воркера: подключение к общему Chromium или свой запуск
+
+    Если общий Chromium недоступен (не запустился или упал), воркер
+    запускает свой браузер, чтобы прогон продолжился. ``ensure()``
+    переподключается, если соединение с общим браузером оборвалось.
+    """
+
+    def __init__(
+        self,
+        playwright: Playwright,
+        endpoint: Optional[str] = None,
+        retries: int = 3,
+        retry_delay: float = 0.5,
+    ) -> None:
+        self.playwright = playwright
+        self.endpoint = endpoint
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.browser: Optional[Browser] = None
+        self.mode = "local"
+        self.startup_ms = 0.0
+        self.reconnects = 0
+
+    def start(self) -> Browser:
+        started = time.monotonic()
+        self.browser = self._connect(self.endpoint) if self.endpoint else None
+        if self.browser is not None:
+            self.mode = "shared"
+        else:
+            if self.endpoint:
+                logger.warning("Общий Chromium недоступен, запускаем свой", endpoint=self.endpoint)
+                self.mode = "fallback"
+            self.browser = self.playwright.chromium.launch()
+        self.startup_ms = (time.monotonic() - started) * 1000
+        logger.info("Браузер воркера готов", mode=self.mode, startup_ms=round(self.startup_ms))
+        return self.browser
+
+    def _connect(self, endpoint: str) -> Optional[Browser]:
+        for attempt in range(1, self.retries + 1):
+            try:
+                return self.playwright.chromium.connect_over_cdp(endpoint)
+            except PlaywrightError as e:
+                logger.warning(
+                    "Не удалось подключиться к общему Chromium", attempt=attempt, error=str(e)
+                )
+                time.sleep(self.retry_delay * attempt)
+        return None
+
+    def ensure(self) -> Browser:
+        """Живой браузер: переподключение (или свой запуск), если соединение оборвалось"""
+        if self.browser is not None and self.browser.is_connected():
+            return self.browser
+        logger.warning("Соединение с браузером потеряно, переподключение", mode=self.mode)
+        self.reconnects += 1
+        return self.start()
+
+    def rss_mb(self) -> float:
+        """RSS процессов воркера: драйвер Playwright и свой Chromium, если он запущен"""
+        return process_tree_rss_mb(os.getpid())
+
+    def close(self) -> None:
+        if self.browser is None:
+            return
+        # Для общего Chromium close() только отключает воркер, браузер останавливает контроллер
+        self.browser.close()
+        self.browser = None
+
+    def stats(self) -> dict:
+        return {
+            self.mode: 1,
+            "startup_ms": self.startup_ms,
+            "reconnects": self.reconnects,
+            "worker_rss_mb": self.rss_mb(),
+        }
@@ -0,0 +1,401 @@
+"""Локальный стенд каталога Stepik для нагрузочных и офлайн-прогонов.
+
+Отдает минимальные страницы с той же разметкой, на которую опираются
+локаторы из ``pages/locators.py``: каталог с поиском, форму входа
+(``/catalog?auth=login``), результаты поиска с фильтром "Бесплатно" и
+карточками курсов и страницу курса (``/course/<id>/promo``). Вход принимает
+любые учетные данные.
+
+Для маршрутов можно задать задержку, разброс и долю ошибок (``RouteFault``),
+чтобы настраивать стратегии ожидания на воспроизводимо "медленном" сайте.
+
+Запуск вручную::
+
+    python -m utils.stand_in --port 8080 --fault "/catalog/search:latency=300,jitter=100,error=0.05"
+"""
+
+import argparse
+import fnmatch
+import html
+import json
+import random
+import threading
+import time
+import structlog
+from collections import defaultdict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+logger = structlog.get_logger(__name__)
+
+SESSION_COOKIE = "sessionid"
+COURSES_PER_PAGE = 20
+TOTAL_COURSES = 60
+STAND_IN_CREDENTIALS = {"login": "stand-in@example.com", "password": "stand-in"}
+
+# Имена параметров в строке искажения -> поля RouteFault
+_FAULT_KEYS = {"latency": "latency_ms", "jitter": "jitter_ms", "error": "error_rate"}
+
+_PAGE = """<!doctype html>
+<html lang="ru"><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<nav>{avatar}</nav>
+<main>{body}</main>
+<script>{script}</script>
+</body></html>
+"""
+
+_AVATAR = '<img class="navbar__profile-img" alt="User avatar" src="/static/avatar.svg">'
+
+_SEARCH_FORM = """
+<input type="text" placeholder="Название курса, автор или предмет" id="search">
+<button type="button" id="search-button">Искать</button>
+"""
+
+_SEARCH_SCRIPT = """
+const go = () => {
+    const q = document.getElementById('search').value;
+    location.href = '/catalog/search?' + new URLSearchParams({ q });
+};
+document.getElementById('search').addEventListener('keydown', (e) => {
+    if (e.key === 'Enter') go();
+});
+document.getElementById('search-button').addEventListener('click', go);
+"""
+
+_LOGIN_FORM = """
+<form id="login">
+  <input type="email" aria-label="E-mail" name="email">
+  <input type="password" aria-label="Пароль" name="password">
+  <button type="submit">Войти</button>
+</form>
+"""
+
+_LOGIN_SCRIPT = """
+document.getElementById('login').addEventListener('submit', async (e) => {
+    e.preventDefault();
+    const data = new FormData(e.target);
+    const response = await fetch('/api/auth/login', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(Object.fromEntries(data)),
+    });
+    if (response.ok) location.href = '/catalog';
+});
+"""
+
+_FILTER_SCRIPT = """
+document.getElementById('free-filter').addEventListener('click', () => {
+    const params = new URLSearchParams(location.search);
+    params.set('free', 'true');
+    location.href = '/catalog/search?' + params;
+});
+"""
+
+_CARD = """
+<div class="catalog-rich-card">
+  <a class="catalog-rich-card__link-wrapper" href="/course/{id}/promo" target="_blank">
+    <span class="course-card__title">{title}</span>
+  </a>
+  <span class="course-card__author">{author}</span>
+  <span class="course-card__price">{price}</span>
+</div>
+"""
+
+
+@dataclass(frozen=True)
+class RouteFault:
+    """Искажения ответа маршрута
+
+    Attributes:
+        latency_ms: Задержка перед ответом
+        jitter_ms: Случайная добавка к задержке, 0..jitter_ms
+        error_rate: Доля запросов, на которые отдается ошибка (0..1)
+        error_status: HTTP-статус ошибки
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+    @classmethod
+    def parse(cls, spec: str) -> "RouteFault":
+        """``"latency=300,jitter=100,error=0.05,status=500"`` -> RouteFault"""
+        values: dict = {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            key, sep, value = part.partition("=")
+            if not sep or key not in (*_FAULT_KEYS, "status"):
+                raise ValueError(f"Неизвестный параметр искажения: {part!r}")
+            if key == "status":
+                values["error_status"] = int(value)
+            else:
+                values[_FAULT_KEYS[key]] = float(value)
+        fault = cls(**values)
+        if not 0 <= fault.error_rate <= 1:
+            raise ValueError(f"Доля ошибок должна быть в диапазоне 0..1: {spec!r}")
+        return fault
+
+    def delay(self, rng: random.Random) -> float:
+        """Задержка ответа в секундах"""
+        jitter = rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000
+
+
+def parse_faults(specs: Iterable[str]) -> List[Tuple[str, RouteFault]]:
+    """``["/catalog/search:latency=300", "*:jitter=50"]`` -> [(glob, RouteFault)]"""
+    faults = []
+    for spec in specs:
+        route, sep, params = spec.partition(":")
+        if not sep or not route:
+            raise ValueError(f"Ожидается <маршрут>:<параметры>, получено {spec!r}")
+        faults.append((route, RouteFault.parse(params)))
+    return faults
+
+
+class _StandInServer(ThreadingHTTPServer):
+    """HTTP-сервер стенда с искажениями маршрутов и счетчиками запросов"""
+
+    daemon_threads = True
+
+    def __init__(self, address, faults: List[Tuple[str, RouteFault]], seed: Optional[int]) -> None:
+        super().__init__(address, StandInHandler)
+        self.faults = faults
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def fault_for(self, path: str) -> Optional[RouteFault]:
+        """Первое подходящее по glob искажение маршрута"""
+        for route, fault in self.faults:
+            if fnmatch.fnmatchcase(path, route):
+                return fault
+        return None
+
+    def decide(self, path: str) -> Tuple[float, Optional[int]]:
+        """Задержка (с) и статус ошибки (или None) для очередного запроса"""
+        fault = self.fault_for(path)
+        with self.lock:
+            self.requests[path] += 1
+            if fault is None:
+                return 0.0, None
+            delay = fault.delay(self.rng)
+            failed = self.rng.random() < fault.error_rate
+            if failed:
+                self.errors[path] += 1
+        return delay, fault.error_status if failed else None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов стенда"""
+
+    server_version = "StepikStandIn/1.0"
+    server: _StandInServer
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("Запрос к стенду", line=format % args)
+
+    @property
+    def authorized(self) -> bool:
+        return f"{SESSION_COOKIE}=" in self.headers.get("Cookie", "")
+
+    def _inject_fault(self) -> bool:
+        """Выдержать задержку маршрута; True, если вместо ответа отдана ошибка"""
+        delay, error_status = self.server.decide(urlsplit(self.path).path)
+        if delay:
+            time.sleep(delay)
+        if error_status is None:
+            return False
+        self._send(error_status, b"Injected failure", "text/plain")
+        return True
+
+    def do_GET(self) -> None:
+        if self._inject_fault():
+            return
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path in ("/", "/catalog") and query.get("auth") == ["login"]:
+            self._send_page("Вход", _LOGIN_FORM, _LOGIN_SCRIPT)
+        elif url.path in ("/", "/catalog"):
+            self._send_page("Каталог", _SEARCH_FORM, _SEARCH_SCRIPT)
+        elif url.path == "/catalog/search":
+            self._send_search(query)
+        elif url.path.startswith("/course/"):
+            course_id = html.escape(url.path.split("/")[2])
+            self._send_page(f"Курс {course_id}", f"<h1>Курс {course_id}</h1>", "")
+        elif url.path == "/static/avatar.svg":
+            svg = b'<svg xmlns="http://www.w3.org/2000/svg" width="32" height="32"></svg>'
+            self._send(200, svg, "image/svg+xml")
+        else:
+            self._send(404, b"Not found", "text/plain")
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if self._inject_fault():
+            return
+        if urlsplit(self.path).path != "/api/auth/login":
+            self._send(404, b"Not found", "text/plain")
+            return
+        body = json.dumps({"ok": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", f"{SESSION_COOKIE}=stand-in; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_search(self, query: dict) -> None:
+        q = query.get("q", [""])[0]
+        free_only = query.get("free") == ["true"]
+        page = int(query.get("page", ["1"])[0])
+        first = (page - 1) * COURSES_PER_PAGE + 1
+        cards = []
+        for course_id in range(first, min(first + COURSES_PER_PAGE, TOTAL_COURSES + 1)):
+            is_free = free_only or course_id % 3 != 0
+            cards.append(
+                _CARD.format(
+                    id=course_id,
+                    title=html.escape(f"{q} - курс {course_id}"),
+                    author=f"Автор {course_id % 7}",
+                    price="Бесплатно" if is_free else f"{course_id * 100} ₽",
+                )
+            )
+        links = []
+        for rel, target, label in (("prev", page - 1, "Назад"), ("next", page + 1, "Далее")):
+            if 1 <= target and (target - 1) * COURSES_PER_PAGE < TOTAL_COURSES:
+                params = {"q": q, "page": target}
+                if free_only:
+                    params["free"] = "true"
+                links.append(
+                    f'<a rel="{rel}" href="/catalog/search?{urlencode(params)}">{label}</a>'
+                )
+        pagination = f'<nav class="pagination">{"".join(links)}</nav>' if links else ""
+        body = (
+            '<button type="button" id="free-filter">Бесплатно</button>'
+            + "".join(cards)
+            + pagination
+        )
+        self._send_page(f"Поиск: {html.escape(q)}", body, _FILTER_SCRIPT)
+
+    def _send_page(self, title: str, body: str, script: str) -> None:
+        content = _PAGE.format(
+            title=title, avatar=_AVATAR if self.authorized else "", body=body, script=script
+        )
+        self._send(200, content.encode(), "text/html; charset=utf-8")
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandIn:
+    """HTTP-стенд в фоновом потоке
+
+    Пример::
+
+        with StandIn() as stand_in:
+            configure_site(stand_in.url)
+
+        with StandIn(faults=parse_faults(["/catalog/search:latency=300,jitter=100"])):
+            ...
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Iterable[Tuple[str, RouteFault]] = (),
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            host: Адрес для прослушивания
+            port: Порт (0 - любой свободный)
+            faults: Искажения маршрутов: (glob пути, RouteFault), побеждает первое совпадение
+            seed: Зерно генератора задержек и ошибок (для воспроизводимых прогонов)
+        """
+        self.host = host
+        self.port = port
+        self.faults: List[Tuple[str, RouteFault]] = list(faults)
+        self.seed = seed
+        self._server: Optional[_StandInServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def set_fault(self, route: str, fault: Optional[RouteFault]) -> None:
+        """Задать (или снять, если fault=None) искажение маршрута на ходу"""
+        faults = [(r, f) for r, f in self.faults if r != route]
+        if fault is not None:
+            faults.insert(0, (route, fault))
+        self.faults = faults
+        if self._server is not None:
+            self._server.faults = faults
+
+    def stats(self) -> dict:
+        """Число запросов и внедренных ошибок по путям"""
+        if self._server is None:
+            return {"requests": {}, "errors": {}}
+        with self._server.lock:
+            return {"requests": dict(self._server.requests), "errors": dict(self._server.errors)}
+
+    def start(self) -> "StandIn":
+        self._server = _StandInServer((self.host, self.port), self.faults, self.seed)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="stand-in", daemon=True
+        )
+        self._thread.start()
+        logger.info("Стенд запущен", url=self.url, faults=[route for route, _ in self.faults])
+        return self
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        logger.info("Стенд остановлен", url=self.url)
+
+    def __enter__(self) -> "StandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Локальный стенд каталога Stepik")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--fault",
+        action="append",
+        default=[],
+        help="Искажение маршрута: <glob пути>:latency=мс,jitter=мс,error=доля,status=код",
+    )
+    parser.add_argument("--seed", type=int, help="Зерно генератора задержек и ошибок")
+    args = parser.parse_args()
+    try:
+        faults = parse_faults(args.fault)
+    except ValueError as e:
+        parser.error(str(e))
+    stand_in = StandIn(args.host, args.port, faults=faults, seed=args.seed).start()
+    print(f"Стенд: {stand_in.url}/catalog (Ctrl+C - остановить)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stand_in.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Таймлайн прогона в формате Chrome trace events (открывается в Perfetto / chrome://tracing).
+
+Спаны: сессия и воркер, тест и его фазы, фикстуры, шаги ``allure.step`` и
+действия page objects (через ``PageCore._measure``). Время - по системным
+часам в микросекундах, поэтому события разных воркеров xdist ложатся на одну
+ось; каждый воркер - отдельный процесс (pid) в таймлайне. Задачи asyncio
+(конкурентные сценарии ``pages.aio``) получают каждая свою дорожку (tid):
+их спаны пересекаются по времени и на одной дорожке не вкладывались бы.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import allure_commons
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Hashable, Iterator, List, Optional
+
+
+def _now_us() -> int:
+    return time.time_ns() // 1000
+
+
+class Timeline:
+    """Сборщик событий таймлайна процесса
+
+    Пока таймлайн не включен (``enable``), ``span`` ничего не записывает:
+    в обычном прогоне цена - одна проверка флага.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.pid = 0
+        self._events: List[dict] = []
+        self._lock = threading.Lock()
+        self._threads: Dict[Hashable, int] = {}
+        self._open: Dict[str, dict] = {}
+
+    def enable(self, process_name: str, pid: int = 0) -> None:
+        """Начать сбор событий процесса с именем process_name (pid - строка в таймлайне)"""
+        self.enabled = True
+        self.pid = pid
+        self._meta("process_name", {"name": process_name})
+        self._meta("process_sort_index", {"sort_index": pid})
+
+    def _meta(self, name: str, args: dict, tid: int = 0) -> None:
+        with self._lock:
+            self._events.append(
+                {"name": name, "ph": "M", "pid": self.pid, "tid": tid, "args": args}
+            )
+
+    def _tid(self) -> int:
+        """Дорожка потока или, внутри event loop, текущей задачи asyncio"""
+        name = threading.current_thread().name
+        key: Hashable = threading.get_ident()
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            key = (key, task.get_name())
+            name = f"{name} / {task.get_name()}"
+        tid = self._threads.get(key)
+        if tid is None:
+            tid = self._threads[key] = len(self._threads) + 1
+            self._meta("thread_name", {"name": name}, tid)
+        return tid
+
+    def complete(self, name: str, cat: str, start_us: int, args: Optional[dict] = None) -> None:
+        """Записать законченный спан, начавшийся в start_us"""
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": start_us,
+            "dur": max(0, _now_us() - start_us),
+            "pid": self.pid,
+            "tid": self._tid(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, name: str, cat: str, **args) -> Iterator[None]:
+        """Спан вокруг блока кода (ошибка внутри блока попадает в args)"""
+        if not self.enabled:
+            yield
+            return
+        started = _now_us()
+        try:
+            yield
+        except BaseException as e:
+            args["error"] = type(e).__name__
+            raise
+        finally:
+            self.complete(name, cat, started, args)
+
+    def begin(self, key: str, name: str, cat: str, **args) -> None:
+        """Открыть спан, который закроется в другом хуке (end)"""
+        if self.enabled:
+            self._open[key] = {"name": name, "cat": cat, "start": _now_us(), "args": args}
+
+    def end(self, key: str, **args) -> None:
+        opened = self._open.pop(key, None)
+        if opened is not None:
+            self.complete(
+                opened["name"], opened["cat"], opened["start"], {**opened["args"], **args}
+            )
+
+    def events(self) -> List[dict]:
+        """События процесса (пригодны для execnet)"""
+        with self._lock:
+            return list(self._events)
+
+    def merge(self, events: List[dict]) -> None:
+        """Добавить события другого процесса (воркера xdist)"""
+        with self._lock:
+            self._events.extend(events)
+
+    def write(self, path: Path) -> None:
+        """Записать таймлайн в JSON (атомарно)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        events = sorted(self.events(), key=lambda event: event.get("ts", 0))
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+
+
+TIMELINE = Timeline()
+
+
+class AllureStepSpans:
+    """Плагин allure_commons: спан на каждый ``allure.step`` (и шаги page objects)"""
+
+    def __init__(self, timeline: Timeline) -> None:
+        self.timeline = timeline
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self.timeline.begin(uuid, title, "step")
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.timeline.end(uuid, error=exc_type.__name__)
+        else:
+            self.timeline.end(uuid)